@@ -1,15 +1,149 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-import csv
-import threading
-import re
+from itertools import islice
 import os
+import threading
+
+from mc_extractor.cache import DEFAULT_CACHE_PATH
+from mc_extractor.extractor import Extraction, STATUSES, read_mc_file
+from mc_extractor.events import EventBus, FRAME_MS
+from mc_extractor.results import ResultStore, RESULT_COLUMNS
+from mc_extractor.rescan import load_previous, select_for_rescan, result_from_row
+from mc_extractor.sources import RangeSource
+
+# Seconds the window waits on quit for the lookups in flight to finish
+CLOSE_TIMEOUT = 15
+
+class VirtualResultsTable:
+    """Results view over a ResultStore that only keeps the visible rows in Tk.
+    
+    The Treeview holds one item per visible line; scrolling and new results
+    rewrite those items from `store.page()` instead of inserting every row.
+    While the view is scrolled to the end it follows new results.
+    """
+    
+    def __init__(self, parent, store):
+        self.store = store
+        self.offset = 0
+        self.visible = 10
+        self.follow = True
+        self.shown = []
+        self.status_filter = tk.StringVar(value="All")
+        
+        # Configure grid weights for expansion
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(1, weight=1)
+        
+        filter_frame = ttk.Frame(parent)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        ttk.Label(filter_frame, text="Show:").pack(side=tk.LEFT, padx=(0, 5))
+        status_box = ttk.Combobox(filter_frame, textvariable=self.status_filter, width=15,
+                                  state='readonly', values=("All",) + STATUSES)
+        status_box.pack(side=tk.LEFT)
+        status_box.bind("<<ComboboxSelected>>", self.on_filter)
+        self.count_var = tk.StringVar(value="0 rows")
+        ttk.Label(filter_frame, textvariable=self.count_var).pack(side=tk.RIGHT)
+        
+        self.tree = ttk.Treeview(parent, columns=RESULT_COLUMNS, show="headings", height=10)
+        
+        # Setup columns
+        columns = [
+            ("MC Number", 100),
+            ("Company Name", 200),
+            ("Address", 250),
+            ("Email", 200),
+            ("Phone", 150),
+            ("Status", 100)
+        ]
+        
+        for col, width in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, minwidth=50)
+        
+        # The scrollbar tracks positions in the store, not in the Treeview
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        
+        # Grid layout with proper expansion
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+    
+    def current_status(self):
+        status = self.status_filter.get()
+        return None if status == "All" else status
+    
+    def total(self):
+        return self.store.count(self.current_status())
+    
+    def on_filter(self, event=None):
+        self.offset = 0
+        self.follow = True
+        self.refresh()
+    
+    def on_resize(self, event):
+        # Work out how many lines fit below the heading row
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+    
+    def yview(self, action, value, unit=None):
+        if action == "moveto":
+            self.set_offset(int(float(value) * self.total()))
+        else:
+            self.scroll(int(value), unit)
+    
+    def scroll(self, amount, unit):
+        step = self.visible if unit == "pages" else 1
+        self.set_offset(self.offset + amount * step)
+        return "break"
+    
+    def set_offset(self, offset):
+        total = self.total()
+        self.offset = max(0, min(offset, total - self.visible))
+        self.follow = self.offset >= total - self.visible
+        self.refresh()
+    
+    def clear(self):
+        self.store.clear()
+        self.offset = 0
+        self.follow = True
+        self.refresh()
+    
+    def refresh(self):
+        """Re-render the visible page from the store"""
+        total = self.total()
+        if self.follow:
+            self.offset = max(0, total - self.visible)
+        self.offset = max(0, min(self.offset, total - 1))
+        
+        rows = []
+        for mc, company_name, address, email, phone, status in self.store.page(
+                self.offset, self.visible, self.current_status()):
+            # Create display-friendly address for GUI (replace newlines with commas)
+            rows.append((mc, company_name, address.replace("\n", ", "), email, phone, status))
+        
+        # Reuse the existing items and only touch the lines that changed
+        items = self.tree.get_children()
+        for i, values in enumerate(rows):
+            if i >= len(items):
+                self.tree.insert("", tk.END, values=values)
+            elif i >= len(self.shown) or self.shown[i] != values:
+                self.tree.item(items[i], values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        self.shown = rows
+        
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_var.set(f"{total} rows")
 
 class SmartMCNumberExtractorApp:
     def __init__(self, root):
@@ -24,19 +158,34 @@ class SmartMCNumberExtractorApp:
         self.csv_file = tk.StringVar(value="mc_records.csv")
         self.bulk_file = tk.StringVar(value="")
         self.running = False
-        self.driver = None
-        self.stop_requested = False
+        self.extraction = None
+        self.run_thread = None
+        self.engine = tk.StringVar(value="http+browser")
+        self.workers = tk.IntVar(value=4)
+        self.use_cache = tk.BooleanVar(value=True)
+        self.cache_ttl_days = tk.DoubleVar(value=7)
+        self.cache_file = tk.StringVar(value=DEFAULT_CACHE_PATH)
+        self.resume = tk.BooleanVar(value=False)
+        self.lean_browser = tk.BooleanVar(value=True)
+        self.use_database = tk.BooleanVar(value=False)
         self.mc_list = []
+        self.bulk_source = None
         self.use_bulk = tk.BooleanVar(value=False)
         
-        # Status counters
-        self.success_count = 0
-        self.partial_count = 0
-        self.manual_count = 0
-        self.failed_count = 0
+        # Re-scan mode: statuses to look up again and an optional age in days
+        self.rescan_statuses = {status: tk.BooleanVar(value=status in ("Partial Success", "Manual Check"))
+                                for status in ("Partial Success", "Manual Check", "Failed")}
+        self.rescan_age_days = tk.StringVar(value="")
+        
+        # Every result of the current run; the table only renders a page of it
+        self.results = ResultStore()
+        
+        # Events posted by the extraction thread, applied on the Tk thread
+        self.bus = EventBus(coalesce=("status", "progress", "counters"))
         
         # Create GUI elements
         self.create_widgets()
+        self.root.after(FRAME_MS, self.pump_events)
         
     def create_widgets(self):
         # Create main container
@@ -55,12 +204,19 @@ class SmartMCNumberExtractorApp:
         bulk_frame = ttk.Frame(self.notebook, padding="10")
         self.notebook.add(bulk_frame, text="Bulk Upload")
         
+        # Re-scan Tab
+        rescan_frame = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(rescan_frame, text="Re-scan")
+        
         # Create widgets for range mode
         self.create_range_widgets(range_frame)
         
         # Create widgets for bulk upload
         self.create_bulk_widgets(bulk_frame)
         
+        # Create widgets for re-scan mode
+        self.create_rescan_widgets(rescan_frame)
+        
         # Create common widgets
         self.create_common_widgets(main_container)
         
@@ -97,6 +253,29 @@ class SmartMCNumberExtractorApp:
         self.preview_text = scrolledtext.ScrolledText(preview_frame, height=8, state='disabled')
         self.preview_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+    def create_rescan_widgets(self, parent):
+        # Statuses to look up again
+        status_frame = ttk.Frame(parent)
+        status_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(status_frame, text="Re-scan records with status:").pack(side=tk.LEFT, padx=(0, 5))
+        for status, var in self.rescan_statuses.items():
+            ttk.Checkbutton(status_frame, text=status, variable=var).pack(side=tk.LEFT, padx=5)
+        
+        # Records looked up before this many days ago are re-scanned as well
+        age_frame = ttk.Frame(parent)
+        age_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(age_frame, text="Or looked up more than").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Entry(age_frame, textvariable=self.rescan_age_days, width=6).pack(side=tk.LEFT)
+        ttk.Label(age_frame, text="days ago").pack(side=tk.LEFT, padx=5)
+        
+        # Instructions
+        instructions = tk.Label(parent, text="Reads the Output CSV File below and appends only the rows that changed. "
+                                             "Records are looked up fresh; the lookup cache is not read.",
+                               font=("Arial", 9), fg="gray")
+        instructions.pack(pady=5)
+        
     def create_common_widgets(self, parent):
         # Create a frame for common elements
         common_frame = ttk.Frame(parent)
@@ -111,6 +290,34 @@ class SmartMCNumberExtractorApp:
         entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         ttk.Button(csv_frame, text="Browse", command=self.browse_csv_file).pack(side=tk.LEFT)
         
+        # SQLite copy next to the CSV, keyed by MC number and queryable by status/state
+        ttk.Checkbutton(csv_frame, text="Also save to SQLite", variable=self.use_database).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Fetch engine: plain HTTP (with Chrome fallback) or Chrome only
+        engine_frame = ttk.Frame(common_frame)
+        engine_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(engine_frame, text="Engine:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(engine_frame, textvariable=self.engine, width=15, state='readonly',
+                     values=("http+browser", "http", "browser")).pack(side=tk.LEFT)
+        
+        # Number of parallel workers (each browser worker runs its own Chrome session)
+        ttk.Label(engine_frame, text="Workers:").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Spinbox(engine_frame, from_=1, to=16, textvariable=self.workers, width=5).pack(side=tk.LEFT)
+        
+        # Local lookup cache so overlapping ranges are not re-scraped
+        ttk.Checkbutton(engine_frame, text="Use lookup cache", variable=self.use_cache).pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Label(engine_frame, text="TTL (days):").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Spinbox(engine_frame, from_=0, to=365, textvariable=self.cache_ttl_days, width=5).pack(side=tk.LEFT)
+        ttk.Label(engine_frame, text="File:").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Entry(engine_frame, textvariable=self.cache_file, width=22).pack(side=tk.LEFT)
+        
+        # Chrome skips images, stylesheets and fonts; only the page text is read
+        ttk.Checkbutton(engine_frame, text="Lean browser", variable=self.lean_browser).pack(side=tk.LEFT, padx=(15, 5))
+        
+        self.cache_var = tk.StringVar(value="Cache: 0 hits / 0 misses")
+        ttk.Label(engine_frame, textvariable=self.cache_var).pack(side=tk.RIGHT)
+        
         # ========== STATUS COUNTERS ==========
         counters_frame = ttk.Frame(common_frame)
         counters_frame.pack(fill=tk.X, pady=(10, 5))
@@ -121,12 +328,14 @@ class SmartMCNumberExtractorApp:
         style.configure("Partial.TLabel", background="#fff3cd", foreground="#856404", font=("Arial", 10, "bold"))
         style.configure("Manual.TLabel", background="#cce5ff", foreground="#004085", font=("Arial", 10, "bold"))
         style.configure("Failed.TLabel", background="#f8d7da", foreground="#721c24", font=("Arial", 10, "bold"))
+        style.configure("Error.TLabel", background="#e2e3e5", foreground="#383d41", font=("Arial", 10, "bold"))
         
         # Create counter variables
         self.success_var = tk.StringVar(value="Success: 0")
         self.partial_var = tk.StringVar(value="Partial: 0")
         self.manual_var = tk.StringVar(value="Manual: 0")
         self.failed_var = tk.StringVar(value="Failed: 0")
+        self.error_var = tk.StringVar(value="Errors: 0")
         
         # Success counter
         success_label = ttk.Label(counters_frame, textvariable=self.success_var, 
@@ -146,7 +355,12 @@ class SmartMCNumberExtractorApp:
         # Failed counter
         failed_label = ttk.Label(counters_frame, textvariable=self.failed_var, 
                                 style="Failed.TLabel", padding=5, anchor="center")
-        failed_label.pack(side=tk.LEFT, padx=(2, 0), fill=tk.X, expand=True)
+        failed_label.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        
+        # Lookups that still failed after retries (not saved; a resume retries them)
+        error_label = ttk.Label(counters_frame, textvariable=self.error_var, 
+                               style="Error.TLabel", padding=5, anchor="center")
+        error_label.pack(side=tk.LEFT, padx=(2, 0), fill=tk.X, expand=True)
         # ========== END STATUS COUNTERS ==========
         
         # Progress bar
@@ -164,6 +378,7 @@ class SmartMCNumberExtractorApp:
         
         ttk.Button(button_frame, text="Start Extraction", command=self.start_extraction).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Stop", command=self.stop_extraction).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_frame, text="Resume previous run", variable=self.resume).pack(side=tk.LEFT, padx=5)
         
         # Results table
         self.create_results_table(common_frame)
@@ -173,36 +388,7 @@ class SmartMCNumberExtractorApp:
         tree_frame = ttk.LabelFrame(parent, text="Results")
         tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        # Configure grid weights for expansion
-        tree_frame.columnconfigure(0, weight=1)
-        tree_frame.rowconfigure(0, weight=1)
-        
-        self.tree = ttk.Treeview(tree_frame, 
-                                 columns=("MC Number", "Company Name", "Address", "Email", "Phone", "Status"), 
-                                 show="headings", 
-                                 height=10)
-        
-        # Setup columns
-        columns = [
-            ("MC Number", 100),
-            ("Company Name", 200),
-            ("Address", 250),
-            ("Email", 200),
-            ("Phone", 150),
-            ("Status", 100)
-        ]
-        
-        for col, width in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=width, minwidth=50)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Grid layout with proper expansion
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.table = VirtualResultsTable(tree_frame, self.results)
         
     def browse_csv_file(self):
         filename = filedialog.asksaveasfilename(
@@ -227,12 +413,12 @@ class SmartMCNumberExtractorApp:
             self.preview_text.delete(1.0, tk.END)
             
             with open(filename, 'r') as file:
-                lines = file.readlines()
-                for line in lines[:50]:  # Show first 50 lines
+                for line in islice(file, 50):  # Show first 50 lines
                     self.preview_text.insert(tk.END, line)
-                
-                if len(lines) > 50:
-                    self.preview_text.insert(tk.END, f"\n... and {len(lines)-50} more lines ...")
+            
+            # Count the numbers without loading the file; the run reuses this source
+            self.bulk_source = read_mc_file(filename)
+            self.preview_text.insert(tk.END, f"\n... {len(self.bulk_source)} unique MC numbers in the file ...")
             
             self.preview_text.config(state='disabled')
         except Exception as e:
@@ -258,11 +444,7 @@ class SmartMCNumberExtractorApp:
             
         try:
             # Reset counters
-            self.success_count = 0
-            self.partial_count = 0
-            self.manual_count = 0
-            self.failed_count = 0
-            self.update_counters()
+            self.update_counters(dict.fromkeys(STATUSES, 0))
             
             # Get current tab from notebook
             current_tab = self.notebook.select()
@@ -276,461 +458,145 @@ class SmartMCNumberExtractorApp:
                     messagebox.showerror("Error", "Start MC number must be less than or equal to End MC number")
                     return
                     
-                self.mc_list = list(range(start, end + 1))
+                self.mc_list = RangeSource(start, end)
+                previous = None
+            elif tab_text == "Re-scan":
+                statuses = [status for status, var in self.rescan_statuses.items() if var.get()]
+                age_days = self.rescan_age_days.get().strip()
+                if not statuses and not age_days:
+                    messagebox.showerror("Error", "Choose statuses to re-scan or a minimum age")
+                    return
+                    
+                previous = load_previous(self.csv_file.get())
+                if not previous:
+                    messagebox.showerror("Error", f"No previous results found in {self.csv_file.get()}")
+                    return
+                older_than = float(age_days) * 86400 if age_days else None
+                self.mc_list = select_for_rescan(previous, statuses, older_than)
             else:  # Bulk Upload mode
+                previous = None
                 bulk_file = self.bulk_file.get()
                 if not bulk_file:
                     messagebox.showerror("Error", "Please select a bulk MC numbers file")
                     return
                     
                 try:
-                    with open(bulk_file, 'r') as file:
-                        self.mc_list = []
-                        for line in file:
-                            # Clean and validate MC numbers
-                            mc = line.strip()
-                            if mc and mc.isdigit():
-                                self.mc_list.append(int(mc))
-                        
-                        if not self.mc_list:
-                            messagebox.showerror("Error", "No valid MC numbers found in the file")
-                            return
+                    if self.bulk_source is None or self.bulk_source.path != bulk_file:
+                        self.bulk_source = read_mc_file(bulk_file)
+                    self.mc_list = self.bulk_source
+                    if not self.mc_list:
+                        messagebox.showerror("Error", "No valid MC numbers found in the file")
+                        return
                 except Exception as e:
                     messagebox.showerror("Error", f"Could not read bulk file: {str(e)}")
                     return
             
-            # Prepare CSV file
-            with open(self.csv_file.get(), mode='w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(["MC Number", "Company Name", "Address", "Email", "Phone", "Status"])
-                
-            # Clear previous results
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-                
-            # Reset stop flag
-            self.stop_requested = False
+            # The extraction core does the lookups, CSV output and resume journal;
+            # this window only renders the events it posts
+            self.extraction = Extraction(
+                self.mc_list,
+                self.csv_file.get(),
+                engine=self.engine.get(),
+                workers=self.workers.get(),
+                use_cache=self.use_cache.get(),
+                cache_ttl=self.cache_ttl_days.get() * 86400,
+                cache_path=self.cache_file.get().strip() or DEFAULT_CACHE_PATH,
+                resume=self.resume.get(),
+                lean_browser=self.lean_browser.get(),
+                previous=previous,
+                database_path=os.path.splitext(self.csv_file.get())[0] + ".sqlite3" if self.use_database.get() else None,
+                events=self.bus
+            )
+            
+            # Clear previous results; a re-scan shows the saved rows and updates them in place
+            self.table.clear()
+            if previous:
+                for mc, record in previous.items():
+                    if record.row is not None:
+                        self.results.add(mc, result_from_row(record.row), record.status)
+                self.table.refresh()
                 
             # Start extraction in a separate thread
             self.running = True
             self.status_var.set("Starting extraction...")
+            self.run_thread = threading.Thread(target=self.run_smart_extraction, args=(previous,), daemon=True)
+            self.run_thread.start()
             
-            # Configure Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-infobars")
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(30)
-            
-            threading.Thread(target=self.run_smart_extraction, daemon=True).start()
-            
-        except ValueError:
+        except (ValueError, tk.TclError):
             messagebox.showerror("Error", "Please enter valid MC numbers")
     
-    def run_smart_extraction(self):
+    def run_smart_extraction(self, previous):
         try:
-            total = len(self.mc_list)
-            current = 0
-            
-            for mc in self.mc_list:
-                if self.stop_requested:
-                    self.status_var.set("Stopped by user")
-                    break
-                    
-                self.status_var.set(f"Processing MC Number: {mc} ({current+1}/{total})")
-                self.root.update()
-                
-                # Get all information including company name and address
-                result = self.smart_process_mc_number(mc)
-                company_name = result["company_name"]
-                address = result["address"]
-                email = result["email"]
-                phone = result["phone"]
-                
-                # Enhanced status determination
-                if ("Not a CARRIER" in email or 
-                    "Not ACTIVE" in email or
-                    "Not AUTHORIZED FOR Property" in email or
-                    "Not General Freight" in email or  # NEW FILTER CONDITION
-                    "X Check Failed" in email or  # NEW FILTER CONDITION
-                    "No SMS Link Found" in email or
-                    "Address without Valid Postal Code" in email or  # UPDATED FILTER CONDITION
-                    "Canadian Address Not Allowed" in email):  # NEW FILTER CONDITION
-                    status = "Failed"
+            # Opening the output, reading the journal and counting a bulk file
+            # can take a while, so it happens here rather than on the Tk thread
+            pending = self.extraction.prepare()
+            self.bus.post("counters", dict(self.extraction.counts))
+            if not pending:
+                if previous:
+                    self.bus.post("info", "Re-scan", "No saved records match the re-scan criteria")
                 else:
-                    # Check if we have company info
-                    has_company_info = (
-                        company_name != "Company Name Not Found" and 
-                        company_name != "Not Available" and
-                        address != "Address Not Found" and
-                        address != "Not Available"
-                    )
-                    
-                    # Check contact info
-                    has_email = "@" in email and "Email Not Found" not in email
-                    has_phone = re.search(r'\d', phone) and "Phone Not Found" not in phone
-                    
-                    if has_email and has_phone:
-                        status = "Success"
-                    elif has_email or has_phone:
-                        status = "Partial Success"
-                    elif has_company_info:
-                        status = "Manual Check"
-                    else:
-                        status = "Manual Check"
-                
-                # Update counters based on status
-                if status == "Success":
-                    self.success_count += 1
-                elif status == "Partial Success":
-                    self.partial_count += 1
-                elif status == "Manual Check":
-                    self.manual_count += 1
-                elif status == "Failed":
-                    self.failed_count += 1
-                
-                # Update counters display
-                self.update_counters()
-                
-                # Create display-friendly address for GUI (replace newlines with commas)
-                display_address = address.replace("\n", ", ") if "\n" in address else address
-                
-                # Always show in GUI
-                self.tree.insert("", tk.END, values=(mc, company_name, display_address, email, phone, status))
-                self.tree.see(self.tree.get_children()[-1])
-                
-                # Save all records except "Failed" to CSV
-                if status != "Failed":
-                    with open(self.csv_file.get(), mode='a', newline='', encoding='utf-8') as file:
-                        writer = csv.writer(file)
-                        # Replace newlines with spaces for CSV to keep address in one line
-                        csv_address = address.replace('\n', ' ')
-                        writer.writerow([mc, company_name, csv_address, email, phone, status])
-                
-                current += 1
-                self.progress['value'] = (current / total) * 100
-                self.root.update()
-                
-            if not self.stop_requested:
-                self.status_var.set(f"Extraction completed! Processed {current} MC numbers")
-            
+                    self.bus.post("info", "Resume", "Every MC number in this run is already completed")
+                self.bus.post("status", "Nothing to do")
+                return
+            self.extraction.run()
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.status_var.set(f"Error: {str(e)}")
-            
+            self.bus.post("error", f"An error occurred: {str(e)}")
+            self.bus.post("status", f"Error: {str(e)}")
         finally:
+            self.extraction.close()
             self.running = False
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-    
-    def update_counters(self):
-        """Update the counter labels with current values"""
-        self.success_var.set(f"Success: {self.success_count}")
-        self.partial_var.set(f"Partial: {self.partial_count}")
-        self.manual_var.set(f"Manual: {self.manual_count}")
-        self.failed_var.set(f"Failed: {self.failed_count}")
-        self.root.update_idletasks()
-    
-    def smart_process_mc_number(self, mc_number):
-        try:
-            # Initialize all values
-            result = {
-                "company_name": "Not Available",
-                "address": "Not Available",
-                "email": "Not Available",
-                "phone": "Not Available"
-            }
-            
-            # STEP 1: Initial search
-            self.driver.get("https://safer.fmcsa.dot.gov/CompanySnapshot.aspx")
-            
-            mc_radio = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "2"))
-            )
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "2"))
-            ).click()
-            
-            text_input = WebDriverWait(self.driver, 10).until(
-                lambda d: d.find_element(By.ID, "4") if d.find_element(By.ID, "4").is_displayed() else False
-            )
-            text_input.clear()
-            text_input.send_keys(str(mc_number))
-            
-            search_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='SUBMIT'][value='Search']"))
-            )
-            search_button.click()
-
-            # STEP 2: Check for CARRIER status
-            try:
-                carrier_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "/html/body/p/table/tbody/tr[2]/td/table/tbody/tr[2]/td/center[1]/table/tbody/tr[3]/td"))
-                )
-                carrier_text = carrier_element.text.strip()
-                
-                if "CARRIER" not in carrier_text:
-                    result["email"] = "Not a CARRIER"
-                    result["phone"] = "Not a CARRIER"
-                    return result
-            except TimeoutException:
-                result["email"] = "No SMS Link Found"
-                result["phone"] = "No SMS Link Found"
-                return result
-
-            # STEP 3: Check for ACTIVE status
-            try:
-                active_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "/html/body/p/table/tbody/tr[2]/td/table/tbody/tr[2]/td/center[1]/table/tbody/tr[4]/td[1]"))
-                )
-                active_text = active_element.text.strip()
-                
-                if "ACTIVE" not in active_text:
-                    result["email"] = "Not ACTIVE"
-                    result["phone"] = "Not ACTIVE"
-                    return result
-            except TimeoutException:
-                result["email"] = "Status Check Failed"
-                result["phone"] = "Status Check Failed"
-                return result
-
-            # STEP 4: Check for AUTHORIZED FOR Property status
-            try:
-                auth_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "/html/body/p/table/tbody/tr[2]/td/table/tbody/tr[2]/td/center[1]/table/tbody/tr[8]/td"))
-                )
-                auth_text = auth_element.text.strip()
-                
-                if "AUTHORIZED FOR Property" not in auth_text:
-                    result["email"] = "Not AUTHORIZED FOR Property"
-                    result["phone"] = "Not AUTHORIZED FOR Property"
-                    return result
-            except TimeoutException:
-                result["email"] = "Authorization Check Failed"
-                result["phone"] = "Authorization Check Failed"
-                return result
-                
-            # ====== NEW FILTER: X CHECK ======
-            # STEP 5: Check for X status
-            try:
-                x_element = WebDriverWait(self.driver, 5).until(
-                    # Replace with your actual XPath for "X"
-                    EC.presence_of_element_located((By.XPATH, "/html/body/p/table/tbody/tr[2]/td/table/tbody/tr[2]/td/center[1]/table/tbody/tr[24]/td/table/tbody/tr[2]/td[1]/table/tbody/tr[2]/td[1]"))
-                )
-                x_text = x_element.text.strip()
-                
-                if "X" not in x_text:
-                    result["email"] = "Not General Freight"
-                    result["phone"] = "Not General Freight"
-                    return result
-            except TimeoutException:
-                result["email"] = "X Check Failed"
-                result["phone"] = "X Check Failed"
-                return result
-            # ====== END NEW FILTER ======
-            
-            # ====== ENHANCED ADDRESS VALIDATION ======
-            # STEP 5.5: Check for valid postal code pattern in address
-            try:
-                address_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.ID, "physicaladdressvalue"))
-                )
-                address_text = address_element.text.strip()
-                
-                # Normalize address - replace non-breaking spaces and trim
-                address_text = address_text.replace(u'\xa0', ' ').strip()
-                
-                # Extract last part (postal code area)
-                last_part = address_text.split(',')[-1].strip()
-                
-                # Check for valid patterns in the last part
-                # US ZIP pattern (5 digits or 5-4 format)
-                us_zip_pattern = r'\d{5}(-\d{4})?$'
-                # Canadian postal code pattern (A1A 1A1 or A1A1A1) - case insensitive
-                canada_pattern = r'[A-Za-z]\d[A-Za-z][\s-]?\d[A-Za-z]\d$'
-                
-                # NEW: Fail if Canadian pattern is detected
-                if re.search(canada_pattern, last_part, re.IGNORECASE):
-                    result["email"] = "Canadian Address Not Allowed"
-                    result["phone"] = "Canadian Address Not Allowed"
-                    return result
-                
-                # Original validation logic
-                if (not re.search(us_zip_pattern, last_part) and
-                    not re.search(r'\d', last_part)):
-                    result["email"] = "Address without Valid Postal Code"
-                    result["phone"] = "Address without Valid Postal Code"
-                    return result
-                    
-            except TimeoutException:
-                result["email"] = "Address Not Found"
-                result["phone"] = "Address Not Found"
-                return result
-            # ====== END ENHANCED VALIDATION ======
-
-            # STEP 6: Click SMS Results link
-            try:
-                WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.XPATH, "//a[contains(@href, 'safer_xfr')]"))
-                )
-                
-                sms_link = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, 'safer_xfr')]"))
-                )
-                sms_link.click()
-                
-                if len(self.driver.window_handles) > 1:
-                    self.driver.switch_to.window(self.driver.window_handles[1])
-                
-                WebDriverWait(self.driver, 5).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-            except TimeoutException:
-                result["email"] = "No SMS Link Found"
-                result["phone"] = "No SMS Link Found"
-                return result
-
-            # STEP 7: Try additional link
-            try:
-                additional_link = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "/html/body/div[3]/div[2]/article/div[2]/div[2]/section/a[1]"))
-                )
-                additional_link.click()
-                
-                WebDriverWait(self.driver, 3).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-            except TimeoutException:
-                pass
-
-            # STEP 8: Extract all data
-            result["company_name"] = self.extract_company_name()
-            result["address"] = self.extract_address()
-            result["email"] = self.extract_email()
-            result["phone"] = self.extract_phone()
-            
-            self.cleanup_tabs()
-            
-            return result
-                
-        except Exception as e:
-            self.driver.save_screenshot(f"error_{mc_number}.png")
-            error_msg = f"Error: {str(e)}"
-            return {
-                "company_name": error_msg,
-                "address": error_msg,
-                "email": error_msg,
-                "phone": error_msg
-            }
     
-    def extract_company_name(self):
-        try:
-            company_element = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//*[@id='regBox']/ul[1]/li[1]/span"))
-            )
-            return company_element.text.strip()
-        except TimeoutException:
-            return "Company Name Not Found"
-        except Exception:
-            return "Company Name Not Found"
-    
-    def extract_address(self):
-        try:
-            # Find the address container element
-            address_container = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//*[@id='regBox']/ul[1]/li[4]"))
-            )
-            
-            # Extract all text content including line breaks
-            address_text = address_container.text.strip()
-            
-            # Remove "Address:" prefix if it exists
-            if address_text.startswith("Address:"):
-                address_text = address_text[8:].strip()
-                
-            return address_text
-        except TimeoutException:
-            return "Address Not Found"
-        except Exception:
-            return "Address Not Found"
-    
-    def extract_email(self):
-        try:
-            email = self.find_email_fast()
-            if email:
-                return email
-            
-            email_element = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(., '@') and string-length(.) < 50]"))
-            )
-            return email_element.text.strip()
-        except TimeoutException:
-            return "Email Not Found"
-        except Exception:
-            return "Email Not Found"
-    
-    def extract_phone(self):
-        try:
-            phone_element = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//*[@id='regBox']/ul[1]/li[5]/span"))
-            )
-            phone_text = phone_element.text.strip()
-            phone_text = re.sub(r'[^\d()\- ]', '', phone_text)
-            return phone_text if phone_text else "Phone Not Found"
-        except TimeoutException:
-            return "Phone Not Found"
-        except Exception:
-            return "Phone Not Found"
-    
-    def find_email_fast(self):
-        try:
-            for xpath in [
-                "//a[contains(@href, 'mailto:')]",
-                "//div[contains(@class, 'email')]",
-                "//span[contains(@class, 'email')]",
-                "//td[contains(., '@')]"
-            ]:
-                try:
-                    element = self.driver.find_element(By.XPATH, xpath)
-                    if "@" in element.text:
-                        return element.text.strip()
-                except NoSuchElementException:
-                    continue
-        except:
-            pass
-        return None
+    def pump_events(self):
+        """Apply the events posted since the last frame, then reschedule"""
+        new_results = False
+        for kind, args in self.bus.drain():
+            if kind == "result":
+                self.results.add(*args)
+                new_results = True
+            elif kind == "status":
+                self.status_var.set(args[0])
+            elif kind == "progress":
+                current, total = args
+                self.progress['value'] = (current / total) * 100
+            elif kind == "counters":
+                self.update_counters(*args)
+            elif kind == "error":
+                messagebox.showerror("Error", args[0])
+            elif kind == "info":
+                messagebox.showinfo(*args)
+        
+        # Re-render the visible page once per frame rather than once per row
+        if new_results:
+            self.table.refresh()
+        self.root.after(FRAME_MS, self.pump_events)
     
-    def cleanup_tabs(self):
-        try:
-            while len(self.driver.window_handles) > 1:
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-                self.driver.close()
-            if len(self.driver.window_handles) > 0:
-                self.driver.switch_to.window(self.driver.window_handles[0])
-        except:
-            pass
+    def update_counters(self, counts, cache_stats=None):
+        """Update the counter labels with current values"""
+        self.success_var.set(f"Success: {counts['Success']}")
+        self.partial_var.set(f"Partial: {counts['Partial Success']}")
+        self.manual_var.set(f"Manual: {counts['Manual Check']}")
+        self.failed_var.set(f"Failed: {counts['Failed']}")
+        self.error_var.set(f"Errors: {counts['Error']}")
+        if cache_stats:
+            self.cache_var.set(f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                               f"({cache_stats['hit_rate']:.0%})")
     
     def stop_extraction(self):
         if self.running:
-            self.stop_requested = True
+            self.extraction.stop()
             self.status_var.set("Stopping... Please wait")
     
     def on_closing(self):
         if self.running:
             if messagebox.askokcancel("Quit", "Extraction is still running. Are you sure you want to quit?"):
-                self.stop_requested = True
-                if self.driver:
-                    self.driver.quit()
+                # The run thread closes the output, journal and database once the
+                # lookups in flight are written; closing them here would race it
+                self.status_var.set("Stopping...")
+                self.root.update_idletasks()
+                self.extraction.stop()
+                self.run_thread.join(CLOSE_TIMEOUT)
                 self.root.destroy()
         else:
-            if self.driver:
-                self.driver.quit()
             self.root.destroy()
 
 if __name__ == "__main__":
@@ -1,23 +1,21 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox, filedialog, Canvas
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-import csv
-import re
-import time
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
+import logging
 import os
 import random
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from PIL import Image, ImageTk
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from mc_extractor.dashboard import DASHBOARD_MS, DashboardStats
+from mc_extractor.events import EventBus, FRAME_MS
+from mc_extractor.harvest import RegisterHarvest
+from mc_extractor.logs import LOG_LINES, LOGGER_NAME, LogEvents, RingBufferHandler, add_file_handler
+from mc_extractor.register_http import HttpRegisterScraper
+from mc_extractor.tracing import Tracer
+
 class HeadlessScraperApp:
     def __init__(self, root):
         self.root = root
@@ -28,13 +26,31 @@ class HeadlessScraperApp:
         
         # Variables
         self.is_running = False
-        self.driver = None
+        self.scraper = None
         self.csv_filename = "extracted_numbers.csv"
-        self.status_updates = []
-        self.data_points = []
+        self.use_browser = tk.BooleanVar(value=False)
+        self.harvest_range = tk.BooleanVar(value=False)
+        self.harvest_from = tk.StringVar(value=(date.today() - timedelta(days=7)).isoformat())
+        self.harvest_to = tk.StringVar(value=date.today().isoformat())
+        
+        # Events posted by the scraper thread, applied on the Tk thread
+        self.bus = EventBus(coalesce=("status", "progress", "stats"))
+        
+        # Log lines go to a rotating file and a bounded buffer the log pane drains each frame
+        self.logger = logging.getLogger(LOGGER_NAME)
+        add_file_handler("mc_finder.log", logger=self.logger)
+        self.log_buffer = RingBufferHandler(LOG_LINES)
+        self.logger.addHandler(self.log_buffer)
+        
+        # Running counters for the live dashboard, replaced at each start
+        self.tracer = Tracer()
+        self.dashboard = DashboardStats(tracer=self.tracer)
+        self.dashboard_shown = None
         
         # Create GUI elements
         self.create_widgets()
+        self.root.after(FRAME_MS, self.pump_events)
+        self.root.after(DASHBOARD_MS, self.refresh_dashboard)
         
         # Configure grid weights
         self.root.grid_rowconfigure(1, weight=1)
@@ -133,6 +149,32 @@ class HeadlessScraperApp:
         )
         self.open_button.pack(side="left", padx=5)
         
+        # The register forms are submitted over HTTP unless Chrome is asked for
+        tk.Checkbutton(
+            control_frame, 
+            text="Use browser (Chrome) instead of direct HTTP", 
+            variable=self.use_browser,
+            font=("Arial", 9),
+            bg="#f0f2f5"
+        ).pack(anchor="w")
+        
+        # Date range mode: every publication in the range, only numbers not seen by earlier runs
+        harvest_frame = tk.Frame(control_frame, bg="#f0f2f5")
+        harvest_frame.pack(fill="x")
+        
+        tk.Checkbutton(
+            harvest_frame, 
+            text="Harvest date range (new numbers only)", 
+            variable=self.harvest_range,
+            font=("Arial", 9),
+            bg="#f0f2f5"
+        ).pack(side="left")
+        
+        tk.Label(harvest_frame, text="From:", font=("Arial", 9), bg="#f0f2f5").pack(side="left", padx=(10, 2))
+        tk.Entry(harvest_frame, textvariable=self.harvest_from, width=11).pack(side="left")
+        tk.Label(harvest_frame, text="To:", font=("Arial", 9), bg="#f0f2f5").pack(side="left", padx=(10, 2))
+        tk.Entry(harvest_frame, textvariable=self.harvest_to, width=11).pack(side="left")
+        
         # Progress
         progress_frame = tk.Frame(control_frame, bg="#f0f2f5")
         progress_frame.pack(fill="x", pady=10)
@@ -236,10 +278,10 @@ class HeadlessScraperApp:
         self.log_area.pack(fill="both", expand=True)
         self.log_area.configure(state='disabled')
         
-        # Visualization Frame
+        # Live Dashboard Frame
         viz_frame = tk.LabelFrame(
             right_frame, 
-            text="Data Visualization", 
+            text="Live Dashboard", 
             font=("Arial", 10, "bold"),
             bg="#f0f2f5",
             padx=15,
@@ -247,12 +289,33 @@ class HeadlessScraperApp:
         )
         viz_frame.pack(fill="both", expand=True, pady=(10, 0))
         
-        # Create a placeholder for the visualization
-        self.viz_canvas = Canvas(viz_frame, bg="white", height=150)
-        self.viz_canvas.pack(fill="both", expand=True)
-        
-        # Draw initial placeholder
-        self.draw_placeholder()
+        # One figure for the whole session; refresh_dashboard() updates its artists in place
+        self.figure = Figure(figsize=(5, 2), dpi=80)
+        self.rate_axes = self.figure.add_subplot(121)
+        self.rate_axes.set_title('Records/sec', fontsize=10)
+        self.rate_axes.set_xlim(0, self.dashboard.rates.maxlen)
+        self.rate_axes.set_xticks([])
+        self.rate_line, = self.rate_axes.plot([], [], color='#2ecc71')
+        
+        self.digit_axes = self.figure.add_subplot(122)
+        self.digit_axes.set_title('First Digit Distribution', fontsize=10)
+        self.digit_axes.set_xticks(range(1, 10))
+        self.digit_bars = self.digit_axes.bar(range(1, 10), [0] * 9, color='#3498db')
+        self.figure.tight_layout()
+        
+        self.chart = FigureCanvasTkAgg(self.figure, master=viz_frame)
+        self.chart.get_tk_widget().pack(fill="both", expand=True)
+        
+        # Counts by status and step latency, as text under the chart
+        self.dashboard_label = tk.Label(
+            viz_frame, 
+            text="", 
+            font=("Consolas", 8), 
+            bg="#f0f2f5",
+            justify="left",
+            anchor="w"
+        )
+        self.dashboard_label.pack(fill="x")
         
         # Status Bar
         status_bar = tk.Frame(self.root, bg="#2c3e50", height=25)
@@ -272,74 +335,103 @@ class HeadlessScraperApp:
         main_frame.columnconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=2)
         
-    def draw_placeholder(self):
-        self.viz_canvas.delete("all")
-        self.viz_canvas.create_text(
-            150, 75,
-            text="Data visualization will appear here after scraping",
-            fill="#7f8c8d",
-            font=("Arial", 10, "italic")
-        )
-        
-    def draw_data_viz(self, data):
-        self.viz_canvas.delete("all")
-        
-        if not data:
-            self.draw_placeholder()
-            return
-            
-        # Create a figure for the bar chart
-        fig = plt.Figure(figsize=(5, 2), dpi=80)
-        ax = fig.add_subplot(111)
-        
-        # Count first digits for Benford's Law visualization
-        first_digits = [int(str(num)[0]) for num in data if num]
-        digit_counts = {i: first_digits.count(i) for i in range(1, 10)}
-        
-        # Create bar chart
-        digits = list(digit_counts.keys())
-        counts = [digit_counts.get(d, 0) for d in digits]
-        
-        ax.bar(digits, counts, color='#3498db')
-        ax.set_title('First Digit Distribution', fontsize=10)
-        ax.set_xlabel('Digit')
-        ax.set_ylabel('Count')
-        ax.set_xticks(digits)
-        
-        # Embed in Tkinter
-        chart = FigureCanvasTkAgg(fig, master=self.viz_canvas)
-        chart.draw()
-        chart.get_tk_widget().pack(fill="both", expand=True)
-        
     def log_message(self, message):
-        self.log_area.configure(state='normal')
-        self.log_area.insert(tk.END, f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
-        self.log_area.configure(state='disabled')
-        self.log_area.see(tk.END)
-        self.status_updates.append(message)
-        self.root.update_idletasks()
+        self.logger.info(message)
         
     def update_status(self, message):
-        self.status_var.set(message)
-        self.status_label.config(text=message)
-        self.root.update_idletasks()
+        self.bus.post("status", message)
         
     def update_progress(self, value, max_value=None):
-        if max_value:
-            self.progress['maximum'] = max_value
-        self.progress['value'] = value
-        self.root.update_idletasks()
+        self.bus.post("progress", value, max_value)
         
     def update_stats(self, processed, found, elapsed):
-        self.rows_processed.config(text=str(processed))
-        self.numbers_found.config(text=str(found))
-        self.time_elapsed.config(text=f"{elapsed:.1f}s")
-        self.root.update_idletasks()
+        self.bus.post("stats", processed, found, elapsed)
+        
+    def pump_events(self):
+        # Apply everything posted since the last frame in one pass
+        for kind, args in self.bus.drain():
+            if kind in ("stats", "numbers"):
+                self.dashboard.post(kind, *args)
+            if kind == "status":
+                self.status_var.set(args[0])
+                self.status_label.config(text=args[0])
+            elif kind == "progress":
+                value, max_value = args
+                if max_value:
+                    self.progress['maximum'] = max_value
+                self.progress['value'] = value
+            elif kind == "stats":
+                processed, found, elapsed = args
+                self.rows_processed.config(text=str(processed))
+                self.numbers_found.config(text=str(found))
+                self.time_elapsed.config(text=f"{elapsed:.1f}s")
+            elif kind == "saved":
+                self.open_button.config(state=tk.NORMAL)
+            elif kind == "finished":
+                self.start_button.config(state=tk.NORMAL)
+                self.stop_button.config(state=tk.DISABLED)
+        
+        self.show_log_lines()
+        self.root.after(FRAME_MS, self.pump_events)
+        
+    def refresh_dashboard(self):
+        # Redrawn at a fixed rate from the running counters, not once per event
+        dashboard = self.dashboard
+        rate = dashboard.tick() if self.is_running else 0.0
+        # Step timings can change while the counters do not (e.g. the menu request before any row)
+        latencies = dashboard.latencies()
+        shown = (dashboard.processed, dashboard.found, tuple(dashboard.digits), rate, latencies)
+        if shown != self.dashboard_shown:
+            self.dashboard_shown = shown
+            
+            rates = dashboard.rates
+            self.rate_line.set_data(range(len(rates)), rates)
+            self.rate_axes.set_ylim(0, max(max(rates, default=0) * 1.2, 1))
+            self.rate_axes.set_title(f'Records/sec: {rate:,.0f}', fontsize=10)
+            
+            counts = dashboard.digits[1:]
+            for bar, count in zip(self.digit_bars, counts):
+                bar.set_height(count)
+            self.digit_axes.set_ylim(0, max(max(counts) * 1.1, 1))
+            self.chart.draw_idle()
+            
+            lines = ["   ".join(f"{label}: {count:,}" for label, count in dashboard.statuses().items())]
+            for step, stats in latencies.items():
+                lines.append(f"{step:<24} n={stats['count']:<6} mean {stats['mean_ms']:.1f} ms   "
+                             f"p95 <= {stats['p95_ms']:g} ms")
+            self.dashboard_label.config(text="\n".join(lines))
+        self.root.after(DASHBOARD_MS, self.refresh_dashboard)
+        
+    def show_log_lines(self):
+        lines, dropped = self.log_buffer.drain()
+        if not lines:
+            return
+        if dropped:
+            lines.insert(0, f"... {dropped} lines not shown (see mc_finder.log)")
+        self.log_area.configure(state='normal')
+        self.log_area.insert(tk.END, "\n".join(lines) + "\n")
+        # Keep only the last LOG_LINES lines in the widget
+        line_count = int(self.log_area.index("end-1c").split(".")[0]) - 1
+        if line_count > LOG_LINES:
+            self.log_area.delete("1.0", f"{line_count - LOG_LINES + 1}.0")
+        self.log_area.configure(state='disabled')
+        self.log_area.see(tk.END)
         
     def start_scraping_thread(self):
         if self.is_running:
             return
             
+        if self.harvest_range.get():
+            try:
+                start_date = datetime.strptime(self.harvest_from.get().strip(), "%Y-%m-%d").date()
+                end_date = datetime.strptime(self.harvest_to.get().strip(), "%Y-%m-%d").date()
+            except ValueError:
+                messagebox.showerror("Invalid Dates", "Enter the harvest dates as YYYY-MM-DD")
+                return
+            if start_date > end_date:
+                messagebox.showerror("Invalid Dates", "The From date is after the To date")
+                return
+            
         self.is_running = True
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
@@ -347,177 +439,42 @@ class HeadlessScraperApp:
         self.log_area.configure(state='normal')
         self.log_area.delete(1.0, tk.END)
         self.log_area.configure(state='disabled')
+        self.log_buffer.drain()
         self.update_progress(0)
-        self.status_updates = []
-        self.data_points = []
         
-        # Start scraping in a separate thread
+        # Fresh counters (and step timings) for the live dashboard
+        self.tracer = Tracer()
+        labels = ("New", "Already seen") if self.harvest_range.get() else ("Numbers", "No number")
+        self.dashboard = DashboardStats(labels, tracer=self.tracer)
+        
+        # Start scraping in a separate thread; its log lines go straight to the logger
+        events = LogEvents(self.bus, self.logger)
+        if self.harvest_range.get():
+            self.scraper = RegisterHarvest(start_date, end_date, self.csv_filename, events=events,
+                                           tracer=self.tracer)
+        elif self.use_browser.get():
+            # Selenium is only imported when the browser is used
+            from mc_extractor.register import RegisterScraper
+            self.scraper = RegisterScraper(self.csv_filename, events=events, tracer=self.tracer)
+        else:
+            self.scraper = HttpRegisterScraper(self.csv_filename, events=events, tracer=self.tracer)
         threading.Thread(target=self.run_scraper, daemon=True).start()
         
     def stop_scraping(self):
-        self.is_running = False
+        if self.scraper:
+            self.scraper.stop()
         self.log_message("Process stop requested...")
         self.update_status("Stopping...")
         
     def run_scraper(self):
-        start_time = time.time()
-        processed_count = 0
-        found_count = 0
-        
         try:
-            # Configure headless browser
-            self.log_message("Starting headless browser...")
-            self.update_status("Initializing browser...")
-            
-            chrome_options = Options()
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--no-sandbox")
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            
-            self.log_message("Navigating to FMCSA website...")
-            self.update_status("Loading page...")
-            self.driver.get("https://li-public.fmcsa.dot.gov/LIVIEW/pkg_html.prc_limain")
-            self.log_message("Page loaded successfully")
-            
-            # Wait for and select dropdown
-            self.log_message("Selecting 'FMCSA Register' option...")
-            self.update_status("Selecting option...")
-            dropdown = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.ID, "menu"))
-            )
-            Select(dropdown).select_by_value("FED_REG")
-            self.log_message('Selected "FMCSA Register" option')
-            
-            # Click first submit button
-            self.log_message("Clicking first submit button...")
-            self.update_status("Processing step 1/3...")
-            button1_xpath = "/html/body/font/table[1]/tbody/tr/td/div/div/table/tbody/tr/td/form/input[1]"
-            submit_button = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, button1_xpath))
-            )
-            submit_button.click()
-            self.log_message("Clicked the first submit button")
-            
-            # Wait for page load
-            time.sleep(2)
-            
-            # Click HTML Detail button
-            self.log_message('Clicking "HTML Detail" button...')
-            self.update_status("Processing step 2/3...")
-            html_detail_xpath = "/html/body/font/font/table/tbody/tr[2]/td[2]/form/input[3]"
-            html_detail_button = WebDriverWait(self.driver, 20).until(
-                EC.element_to_be_clickable((By.XPATH, html_detail_xpath))
-            )
-            html_detail_button.click()
-            self.log_message('Clicked "HTML Detail" button')
-            
-            # Wait for table to load
-            self.log_message("Waiting for data table to load...")
-            self.update_status("Processing step 3/3...")
-            table_xpath = "/html/body/font/table[8]"
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, table_xpath))
-            )
-            self.log_message("Target table loaded")
-            
-            # Get table rows
-            rows = self.driver.find_elements(By.XPATH, f"{table_xpath}/tbody/tr[position()>1]")
-            row_count = len(rows)
-            self.log_message(f"Found {row_count} rows in the table")
-            self.update_status(f"Processing {row_count} rows...")
-            
-            # Extract numbers
-            numbers = []
-            self.update_progress(0, row_count)
-            self.log_message("Extracting numbers from table...")
-            
-            for i, row in enumerate(rows, 1):
-                if not self.is_running:
-                    self.log_message("Process stopped by user")
-                    break
-                    
-                try:
-                    th_element = row.find_element(By.XPATH, "./th")
-                    raw_text = th_element.text.strip()
-                    
-                    # Extract number
-                    number_match = re.search(r'\d{5,}', raw_text)
-                    
-                    if number_match:
-                        extracted_number = number_match.group(0)
-                        numbers.append(extracted_number)
-                        self.data_points.append(extracted_number)
-                        found_count += 1
-                        self.log_message(f"Row {i}: Extracted number {extracted_number}")
-                    else:
-                        self.log_message(f"Row {i}: No number found in '{raw_text}'")
-                        
-                except Exception as e:
-                    self.log_message(f"Error processing row {i}: {str(e)}")
-                
-                processed_count = i
-                self.update_progress(i)
-                self.update_stats(processed_count, found_count, time.time() - start_time)
-                self.update_status(f"Processed {i}/{row_count} rows")
-                
-                # Throttle processing to avoid overwhelming the system
-                time.sleep(0.05)
-            
-            # Save to CSV
-            if numbers:
-                self.log_message(f"Saving {len(numbers)} numbers to CSV...")
-                self.update_status("Saving results...")
-                
-                with open(self.csv_filename, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['MC-Number'])
-                    for number in numbers:
-                        writer.writerow([number])
-                
-                self.log_message(f"Saved results to {self.csv_filename}")
-                self.open_button.config(state=tk.NORMAL)
-                self.update_status(f"Completed! {len(numbers)} numbers saved")
-                self.draw_data_viz(numbers)
-            else:
-                self.log_message("No numbers extracted - CSV file not created")
-                self.update_status("Completed! No numbers found")
-                
-        except WebDriverException as e:
-            self.log_message(f"Browser error: {str(e)}")
-            self.update_status("Error occurred - check logs")
-            if "This site can't be reached" in str(e):
-                self.log_message("Possible network error or site unavailable")
-        except Exception as e:
-            self.log_message(f"An error occurred: {str(e)}")
-            self.update_status("Error occurred - check logs")
-            # Take screenshot
-            try:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_name = f"error_screenshot_{timestamp}.png"
-                self.driver.save_screenshot(screenshot_name)
-                self.log_message(f"Screenshot saved as {screenshot_name}")
-            except:
-                self.log_message("Could not save screenshot")
+            if self.scraper.run():
+                self.bus.post("saved")
         finally:
-            # Clean up
-            self.log_message("Cleaning up...")
-            self.update_status("Closing browser...")
-            try:
-                if self.driver:
-                    self.driver.quit()
-            except:
-                pass
-            self.log_message("Browser closed")
             self.is_running = False
-            self.start_button.config(state=tk.NORMAL)
-            self.stop_button.config(state=tk.DISABLED)
+            self.bus.post("finished")
             self.update_progress(0)
             self.update_status("Ready to start new scraping")
-            self.update_stats(processed_count, found_count, time.time() - start_time)
             
     def open_csv(self):
         try:
@@ -0,0 +1 @@
+"""Offline benchmarks for the scraping core, run against a local fixture server."""
@@ -0,0 +1,237 @@
+"""Throughput, latency and memory benchmarks against the local fixture server.
+
+    python -m benchmarks.bench_extract --count 500 --engine http --workers 8
+    python -m benchmarks.bench_extract --count 200 --engine browser --workers 2 --json results.json
+
+The snapshot benchmark runs a full Extraction (pool, classification and CSV
+output, cache disabled) and times every lookup. The register benchmarks run
+HttpRegisterScraper and RegisterScraper (headless Chrome) and time the row
+loop from their progress events; the browser one is reported as skipped
+when Selenium or Chrome is missing.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from benchmarks.fixture_server import FixtureServer, VARIANTS
+from mc_extractor.extractor import Extraction
+from mc_extractor.register_http import HttpRegisterScraper
+
+
+def percentiles(samples):
+    """p50/p95/p99 of `samples` in milliseconds."""
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    if len(samples) == 1:
+        samples = samples * 2
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{p}_ms": round(cuts[p - 1] * 1000, 2) for p in (50, 95, 99)}
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class TimedBackend:
+    """Wraps a backend and records the wall time of every lookup."""
+
+    def __init__(self, backend, latencies, lock):
+        self.backend = backend
+        self.latencies = latencies
+        self.lock = lock
+
+    def lookup(self, mc_number):
+        start = time.perf_counter()
+        try:
+            return self.backend.lookup(mc_number)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.latencies.append(elapsed)
+
+    def close(self):
+        self.backend.close()
+
+
+class TimedExtraction(Extraction):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self.latency_lock = threading.Lock()
+
+    def make_backend(self):
+        return TimedBackend(super().make_backend(), self.latencies, self.latency_lock)
+
+
+class RowTimer:
+    """Event sink timing the register row loop from a scraper's events.
+
+    The loop starts at the ("progress", 0, ...) event; ("stats", processed,
+    ...) comes once per batch of rows and each gap is spread evenly over
+    the rows of its batch.
+    """
+
+    def __init__(self):
+        self.last = None
+        self.rows = 0
+        self.row_latencies = []
+        self.loop_start = None
+        self.loop_end = None
+
+    def post(self, kind, *args):
+        now = time.perf_counter()
+        if kind == "progress" and args[0] == 0:
+            self.loop_start = self.last = now
+            self.rows = 0
+        elif kind == "stats" and self.last is not None and args[0] > self.rows:
+            batch = args[0] - self.rows
+            self.row_latencies.extend([(now - self.last) / batch] * batch)
+            self.rows = args[0]
+            self.last = self.loop_end = now
+
+
+def bench_snapshot(server, start, count, engine, workers, timeout, lean_browser=True):
+    with tempfile.TemporaryDirectory() as tmp:
+        extraction = TimedExtraction(range(start, start + count), os.path.join(tmp, "mc_records.csv"),
+                                     engine=engine, workers=workers, timeout=timeout,
+                                     use_cache=False, safer_url=server.url, lean_browser=lean_browser)
+        tracemalloc.start()
+        began = time.perf_counter()
+        try:
+            extraction.prepare()
+            processed = extraction.run()
+        finally:
+            extraction.close()
+        elapsed = time.perf_counter() - began
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "benchmark": "snapshot",
+        "engine": engine,
+        "workers": workers,
+        "records": processed,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(processed / elapsed, 2) if elapsed else None,
+        **percentiles(extraction.latencies),
+        "peak_traced_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": max_rss_mb(),
+        "counts": extraction.counts,
+        "browser_pages": extraction.page_stats.summary(),
+        "breaker_trips": extraction.breaker.trips,
+        "step_timeouts": {step: round(stats["timeout"], 2)
+                          for step, stats in extraction.timeouts.summary().items()},
+        "spans": extraction.tracer.summary(),
+        "stages": extraction.pipeline.summary() if extraction.pipeline else None,
+    }
+
+
+def bench_register(server, timeout, lean_browser=True, engine="browser"):
+    timer = RowTimer()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "extracted_numbers.csv")
+        if engine == "http":
+            scraper = HttpRegisterScraper(output, timeout=timeout, events=timer, base_url=server.url)
+        else:
+            try:
+                from mc_extractor.register import RegisterScraper
+            except ImportError as e:
+                return {"benchmark": "register", "engine": engine, "skipped": f"selenium not available ({e})"}
+            scraper = RegisterScraper(output, timeout=timeout, events=timer,
+                                      url=f"{server.url}/LIVIEW/pkg_html.prc_limain", lean=lean_browser)
+        tracemalloc.start()
+        began = time.perf_counter()
+        numbers = scraper.run()
+        elapsed = time.perf_counter() - began
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    if timer.loop_start is None:
+        return {"benchmark": "register", "engine": engine, "skipped": "run failed before the row loop"}
+    rows = len(timer.row_latencies)
+    loop_seconds = (timer.loop_end or timer.loop_start) - timer.loop_start
+    return {
+        "benchmark": "register",
+        "engine": engine,
+        "rows": rows,
+        "numbers": len(numbers),
+        "seconds": round(elapsed, 3),
+        "row_loop_seconds": round(loop_seconds, 3),
+        "rows_per_sec": round(rows / loop_seconds, 2) if loop_seconds else None,
+        **percentiles(timer.row_latencies),
+        "peak_traced_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def print_report(result):
+    print(f"[{result['benchmark']}]")
+    for key, value in result.items():
+        if key != "benchmark":
+            print(f"  {key:>16}: {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=1700000, help="first MC number (default: %(default)s)")
+    parser.add_argument("--count", type=int, default=200, help="MC numbers to look up (default: %(default)s)")
+    parser.add_argument("--engine", choices=("http+browser", "http", "browser"), default="http")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=15)
+    parser.add_argument("--slow-delay", type=float, default=0.5,
+                        help=f"seconds for the slow variant, 1 in {len(VARIANTS)} MCs (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of snapshot queries answering 503")
+    parser.add_argument("--register-rows", type=int, default=2000)
+    parser.add_argument("--skip-register", action="store_true")
+    parser.add_argument("--register-engine", choices=("http", "browser", "both"), default="both",
+                        help="register fetch engine(s) to benchmark (default: %(default)s)")
+    parser.add_argument("--browser-profile", choices=("lean", "full", "both"), default="lean",
+                        help="Chrome profile for browser runs; 'both' reports the bytes saved per page")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = ("full", "lean") if args.browser_profile == "both" else (args.browser_profile,)
+    results = []
+    with FixtureServer(slow_delay=args.slow_delay, latency=args.latency, error_rate=args.error_rate,
+                       register_rows=args.register_rows) as server:
+        for profile in profiles:
+            result = bench_snapshot(server, args.start, args.count, args.engine, args.workers, args.timeout,
+                                    lean_browser=profile == "lean")
+            result["browser_profile"] = profile
+            results.append(result)
+        if not args.skip_register:
+            engines = ("http", "browser") if args.register_engine == "both" else (args.register_engine,)
+            for engine in engines:
+                results.append(bench_register(server, args.timeout, lean_browser=profiles[-1] == "lean",
+                                              engine=engine))
+
+    if len(profiles) == 2:
+        full, lean = (result["browser_pages"] for result in results[:2])
+        if full["pages"] and lean["pages"]:
+            results.append({
+                "benchmark": "lean_profile",
+                "bytes_saved_per_page": full["bytes_per_page"] - lean["bytes_per_page"],
+                "records_per_sec_full": results[0]["records_per_sec"],
+                "records_per_sec_lean": results[1]["records_per_sec"],
+            })
+
+    for result in results:
+        print_report(result)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Local HTTP server replaying SAFER, SMS and FMCSA Register pages.
+
+Pages are rendered from the recorded templates in fixtures/. The MC number
+picks the page variant (`mc % 10` indexes VARIANTS), so any range of numbers
+exercises every branch of the eligibility checks in a fixed mix:
+
+    ok           eligible carrier with a registration page
+    not_carrier  entity type is BROKER
+    not_active   USDOT status is OUT-OF-SERVICE
+    missing_x    cargo table is missing (element lookup fails)
+    canadian     physical address has a Canadian postal code
+    slow         eligible carrier whose snapshot takes `slow_delay` seconds
+
+With `error_rate` set, that share of snapshot queries answers 503 instead,
+to exercise retries and the circuit breaker.
+
+Eligible carriers without a listed email (every fourth MC) come out as
+Partial Success. The register detail page lists `register_rows` numbers.
+
+The registration page is served as /SMS/Carrier/<dot>/`registration_page`,
+which the overview page links to; any other name makes the direct
+CarrierRegistration.aspx URL answer 404, as if the site moved the page.
+Likewise the register page's form posts to /LIVIEW/`register_detail_name`.
+
+    python -m benchmarks.fixture_server --port 8765
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+VARIANTS = ("ok", "ok", "ok", "ok", "ok", "not_carrier", "not_active", "missing_x", "canadian", "slow")
+
+# Offset between an MC number and the USDOT number the fixtures give it
+DOT_OFFSET = 3000000
+
+CARGO_ROW = ('<tr><td colspan="4"><table border="0"><tr><th class="querylabel">Cargo Carried</th></tr>'
+             '<tr><td><table border="0"><tr><th>Type</th></tr>'
+             '<tr><td class="queryfield">X</td><td>General Freight</td></tr>'
+             '</table></td></tr></table></td></tr>')
+MISSING_CARGO_ROW = '<tr><td></td></tr>'
+# Stand-ins for the static assets the recorded pages reference, sized like the
+# real ones so full and lean browser profiles differ in bytes transferred
+ASSETS = {
+    ".css": ("text/css", 40 * 1024),
+    ".js": ("application/javascript", 90 * 1024),
+    ".png": ("image/png", 25 * 1024),
+    ".gif": ("image/gif", 25 * 1024),
+}
+
+EMAIL_ITEM = '<li><label>Email:</label> <span class="email">dispatch{mc}@example.com</span></li>'
+
+
+def variant_for(mc):
+    return VARIANTS[mc % len(VARIANTS)]
+
+
+def load_templates():
+    templates = {}
+    for name in os.listdir(FIXTURES_DIR):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as file:
+                templates[name[:-5]] = Template(file.read())
+    return templates
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, delayed ACKs
+    # add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, body, status=200, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        return {key: values[0] for key, values in parse_qs(body).items()}
+
+    def do_GET(self):
+        self.route("GET", {})
+
+    def do_POST(self):
+        self.route("POST", self.read_form())
+
+    def route(self, method, form):
+        fixtures = self.server.fixtures
+        url = urlsplit(self.path)
+        path = url.path
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if fixtures.latency:
+            time.sleep(fixtures.latency)
+
+        if path == "/CompanySnapshot.aspx":
+            page = fixtures.render("company_snapshot")
+        elif path == "/query.asp" and method == "POST":
+            mc = form.get("query_string", "")
+            if fixtures.error_rate and random.random() < fixtures.error_rate:
+                return self.send_page("<html><body>Service Unavailable</body></html>", status=503)
+            if not mc.isdigit():
+                return self.send_page("<html><body>Record Not Found</body></html>")
+            page = fixtures.snapshot_page(int(mc))
+        elif path == "/SMS/safer_xfr.aspx":
+            dot = int(query.get("DOT", "0"))
+            page = fixtures.render("sms_overview", dot=dot, legal_name=fixtures.legal_name(dot - DOT_OFFSET),
+                                   registration_page=fixtures.registration_page_name)
+        elif path.startswith("/SMS/Carrier/") and path.endswith(f"/{fixtures.registration_page_name}"):
+            dot = int(path.split("/")[3])
+            page = fixtures.registration_page(dot - DOT_OFFSET)
+        elif path == "/LIVIEW/pkg_html.prc_limain":
+            page = fixtures.render("li_main")
+        elif path == "/LIVIEW/pkg_menu.prc_menu":
+            page = fixtures.register_menu_page()
+        elif path == f"/LIVIEW/{fixtures.register_detail_name}":
+            page = fixtures.register_detail_page(form.get("pd_date", "01-JAN-25"))
+        elif os.path.splitext(path)[1] in ASSETS:
+            content_type, size = ASSETS[os.path.splitext(path)[1]]
+            return self.send_page(" " * size, content_type=content_type)
+        else:
+            return self.send_page("<html><body>Not Found</body></html>", status=404)
+        self.send_page(page)
+
+
+class FixtureServer:
+    """ThreadingHTTPServer on a background thread; `url` is its base URL.
+
+    Use as a context manager, or call start()/stop().
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, slow_delay=1.0, latency=0.0, error_rate=0.0,
+                 register_rows=2000, register_dates=("02-JAN-25", "03-JAN-25", "06-JAN-25"),
+                 registration_page_name="CarrierRegistration.aspx", register_detail_name="pkg_html.prc_regdetail"):
+        self.slow_delay = slow_delay
+        self.registration_page_name = registration_page_name
+        self.register_detail_name = register_detail_name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.register_rows = register_rows
+        self.register_dates = register_dates
+        self.templates = load_templates()
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def render(self, name, **values):
+        return self.templates[name].substitute(values)
+
+    def legal_name(self, mc):
+        return f"FIXTURE FREIGHT {mc} LLC"
+
+    def snapshot_page(self, mc):
+        variant = variant_for(mc)
+        if variant == "slow":
+            time.sleep(self.slow_delay)
+        dot = mc + DOT_OFFSET
+
+        if variant == "canadian":
+            street, city_line = "1200 RUE SHERBROOKE", "MONTREAL, QC H3A 1B9"
+        else:
+            street, city_line = f"{mc % 9000 + 100} INDUSTRIAL PKWY", f"DALLAS, TX  {75000 + mc % 1000:05d}"
+
+        return self.render(
+            "snapshot",
+            mc=mc,
+            dot=dot,
+            legal_name=self.legal_name(mc),
+            entity_type="BROKER" if variant == "not_carrier" else "CARRIER",
+            usdot_status="OUT-OF-SERVICE" if variant == "not_active" else "ACTIVE",
+            authority="AUTHORIZED FOR Property",
+            street=street,
+            city_line=city_line,
+            phone=f"(214) 555-{mc % 10000:04d}",
+            cargo_row=MISSING_CARGO_ROW if variant == "missing_x" else CARGO_ROW,
+            sms_href=f"/SMS/safer_xfr.aspx?DOT={dot}",
+        )
+
+    def registration_page(self, mc):
+        return self.render(
+            "sms_registration",
+            dot=mc + DOT_OFFSET,
+            legal_name=self.legal_name(mc),
+            street=f"{mc % 9000 + 100} INDUSTRIAL PKWY",
+            city_line=f"DALLAS, TX {75000 + mc % 1000:05d}",
+            phone=f"(214) 555-{mc % 10000:04d}",
+            email_item="" if mc % 4 == 0 else EMAIL_ITEM.format(mc=mc),
+        )
+
+    def register_menu_page(self):
+        options = "\n".join(f'<OPTION VALUE="{date}">{date}</OPTION>' for date in self.register_dates)
+        return self.render("li_register", date_options=options, detail_action=self.register_detail_name)
+
+    def register_numbers(self, date):
+        # A stable block of numbers per date, so consecutive dates overlap by half
+        index = self.register_dates.index(date) if date in self.register_dates else 0
+        start = 1500000 + index * self.register_rows // 2
+        return range(start, start + self.register_rows)
+
+    def register_detail_page(self, date):
+        rows = "\n".join(
+            f'<TR><TH>MC-{number}</TH><TD>FIXTURE FREIGHT {number} LLC - DALLAS, TX</TD><TD>{date}</TD></TR>'
+            for number in self.register_numbers(date)
+        )
+        return self.render("li_register_detail", date=date, rows=rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the recorded SAFER/SMS/Register fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="seconds for the slow variant")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of snapshot queries answering 503")
+    parser.add_argument("--register-rows", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    server = FixtureServer(args.host, args.port, slow_delay=args.slow_delay, latency=args.latency,
+                           error_rate=args.error_rate, register_rows=args.register_rows)
+    print(f"Serving fixtures on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
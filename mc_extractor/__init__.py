@@ -0,0 +1 @@
+"""Scraping core shared by the MC extractor GUIs."""
@@ -0,0 +1,5 @@
+import sys
+
+from mc_extractor.cli import main
+
+sys.exit(main())
@@ -0,0 +1,260 @@
+"""Fetch backends for the SAFER CompanySnapshot lookup.
+
+A backend turns an MC number into the result dict the extractor classifies
+(company_name, address, email, phone). The HTTP backend issues the snapshot
+query directly over a pooled keep-alive session; the Selenium backend in
+`mc_extractor.browser` drives Chrome and is kept as a fallback.
+"""
+import threading
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from mc_extractor.parsing import (
+    parse_html, evaluate_snapshot, find_registration_link, registration_url, extract_registration,
+    empty_registration, failure_result, error_result
+)
+from mc_extractor.timeouts import AdaptiveTimeouts
+from mc_extractor.tracing import NULL_TRACER
+
+SAFER_URL = "https://safer.fmcsa.dot.gov"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+class FetchError(Exception):
+    """The site could not be reached or answered with an error page.
+
+    `transient` marks failures worth retrying (timeouts, connection errors,
+    5xx and 429 answers); `status` is the HTTP status when there was one.
+    """
+
+    def __init__(self, message, status=None, transient=False):
+        super().__init__(message)
+        self.status = status
+        self.transient = transient
+
+
+class PageStats:
+    """Pages loaded by browser backends and the bytes they transferred, summed across workers."""
+
+    def __init__(self):
+        self.pages = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def record(self, transferred):
+        with self.lock:
+            self.pages += 1
+            self.bytes += transferred
+
+    def summary(self):
+        with self.lock:
+            return {
+                "pages": self.pages,
+                "bytes": self.bytes,
+                "bytes_per_page": self.bytes // self.pages if self.pages else 0,
+            }
+
+
+class SnapshotBackend:
+    name = "base"
+    # Span timings of every step; wrappers share the tracer of what they wrap
+    tracer = NULL_TRACER
+
+    def fetch_snapshot(self, mc_number):
+        """Load the snapshot page for mc_number and return a parsing.Snapshot."""
+        raise NotImplementedError
+
+    def fetch_registration(self, snapshot):
+        """Follow the SMS link of an eligible snapshot and extract the carrier data."""
+        raise NotImplementedError
+
+    def process(self, mc_number):
+        with self.tracer.span("snapshot"):
+            snapshot = self.fetch_snapshot(mc_number)
+        if snapshot.failure:
+            return failure_result(snapshot.failure)
+        with self.tracer.span("registration"):
+            return self.fetch_registration(snapshot)
+
+    def lookup(self, mc_number):
+        """Like process(), but errors are reported in the result instead of raised."""
+        with self.tracer.context(mc=mc_number), self.tracer.span("lookup"):
+            try:
+                return self.process(mc_number)
+            except Exception as e:
+                self.on_error(mc_number, e)
+                return error_result(e)
+
+    def on_error(self, mc_number, exc):
+        pass
+
+    def close(self):
+        pass
+
+
+class HttpSnapshotBackend(SnapshotBackend):
+    name = "http"
+
+    def __init__(self, safer_url=SAFER_URL, timeout=15, pool_size=10, timeouts=None, tracer=None):
+        self.safer_url = safer_url.rstrip("/")
+        self.timeout = timeout
+        if tracer is not None:
+            self.tracer = tracer
+
+        # `timeout` is the default and the ceiling; learned timeouts go no lower than 2s
+        self.timeouts = timeouts if timeouts is not None else AdaptiveTimeouts()
+        self.timeouts.define({step: (timeout, min(2, timeout), timeout)
+                              for step in ("snapshot", "sms_page", "registration")})
+
+        # One keep-alive session per backend; the adapter keeps a pool of
+        # connections per host so SAFER and SMS requests reuse sockets.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    def request(self, step, method, url, **kwargs):
+        """Send a request with the step's learned timeout."""
+        with self.tracer.span(f"http.{step}"):
+            return self.timeouts.timed(step, self.send, method, url, **kwargs)
+
+    def send(self, timeout, method, url, **kwargs):
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            raise FetchError(str(e), transient=True) from e
+        if response.status_code >= 400:
+            raise FetchError(f"HTTP {response.status_code} for {url}", status=response.status_code,
+                             transient=response.status_code >= 500 or response.status_code == 429)
+        return response
+
+    def fetch_snapshot(self, mc_number):
+        # Same query the CompanySnapshot.aspx form submits with the MC/MX radio selected
+        response = self.request("snapshot", "POST", f"{self.safer_url}/query.asp", data={
+            "searchtype": "ANY",
+            "query_type": "queryCarrierSnapshot",
+            "query_param": "MC_MX",
+            "query_string": str(mc_number)
+        })
+        with self.tracer.span("parse.snapshot"):
+            snapshot = evaluate_snapshot(mc_number, parse_html(response.content))
+        if snapshot.sms_url:
+            snapshot = snapshot._replace(sms_url=urljoin(response.url, snapshot.sms_url))
+        return snapshot
+
+    def fetch_registration(self, snapshot):
+        # Go straight to the registration page when the DOT number is known;
+        # if that URL fails or is not a registration page, take the overview's link
+        url = registration_url(snapshot)
+        if url:
+            try:
+                response = self.request("registration", "GET", url)
+                with self.tracer.span("parse.registration"):
+                    result = extract_registration(parse_html(response.content))
+                if not empty_registration(result):
+                    return result
+            except FetchError:
+                pass
+
+        response = self.request("sms_page", "GET", snapshot.sms_url)
+        doc = parse_html(response.content)
+
+        # Follow the additional link to the registration details if the overview has one
+        link = find_registration_link(doc)
+        if link:
+            response = self.request("registration", "GET", urljoin(response.url, link))
+            doc = parse_html(response.content)
+        with self.tracer.span("parse.registration"):
+            return extract_registration(doc)
+
+    def close(self):
+        self.session.close()
+
+
+class FallbackBackend(SnapshotBackend):
+    """Use `primary`, switching to a lazily created fallback when it cannot read a page.
+
+    Only permanent failures (e.g. 4xx answers to pages a browser may still
+    be shown) go to the fallback. Transient ones (timeouts, connection errors, 5xx and
+    429 answers) are re-raised: the site itself is struggling, so the retry
+    backoff and circuit breaker should see them rather than a browser
+    hitting it again.
+    """
+
+    def __init__(self, primary, fallback_factory):
+        self.primary = primary
+        self.fallback_factory = fallback_factory
+        self.tracer = primary.tracer
+        self.fallback = None
+        self.fallback_count = 0
+
+    @property
+    def name(self):
+        return f"{self.primary.name}+fallback"
+
+    def get_fallback(self):
+        if self.fallback is None:
+            self.fallback = self.fallback_factory()
+        self.fallback_count += 1
+        return self.fallback
+
+    def fetch_snapshot(self, mc_number):
+        try:
+            return self.primary.fetch_snapshot(mc_number)
+        except FetchError as e:
+            if e.transient:
+                raise
+            return self.get_fallback().fetch_snapshot(mc_number)
+
+    def fetch_registration(self, snapshot):
+        try:
+            return self.primary.fetch_registration(snapshot)
+        except FetchError as e:
+            if e.transient:
+                raise
+            return self.get_fallback().fetch_registration(snapshot)
+
+    def on_error(self, mc_number, exc):
+        if self.fallback is not None:
+            self.fallback.on_error(mc_number, exc)
+
+    def close(self):
+        self.primary.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+def make_backend(engine, safer_url=SAFER_URL, timeout=15, lean_browser=True, page_stats=None, timeouts=None,
+                 tracer=None, captures=None):
+    """Build a backend by name: "http", "browser" or "http+browser" (HTTP with Chrome fallback).
+
+    `lean_browser` selects the resource-blocking Chrome profile; browser page
+    loads are recorded in `page_stats` when given. Pass one AdaptiveTimeouts
+    as `timeouts` to let every worker's backend learn from the same latencies,
+    and a tracing.Tracer as `tracer` to time their steps. Browser failures
+    are saved through a captures.FailureCapture given as `captures`.
+    """
+    def http():
+        return HttpSnapshotBackend(safer_url, timeout=timeout, timeouts=timeouts, tracer=tracer)
+
+    def browser():
+        # Selenium is only imported when a browser engine is requested
+        from mc_extractor.browser import SeleniumSnapshotBackend
+        return SeleniumSnapshotBackend(safer_url, page_load_timeout=timeout * 2,
+                                       lean=lean_browser, page_stats=page_stats, timeouts=timeouts,
+                                       tracer=tracer, captures=captures)
+
+    if engine == "http":
+        return http()
+    if engine == "browser":
+        return browser()
+    if engine == "http+browser":
+        return FallbackBackend(http(), browser)
+    raise ValueError(f"Unknown engine: {engine}")
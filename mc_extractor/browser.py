@@ -0,0 +1,215 @@
+"""Selenium (Chrome) backend for the SAFER CompanySnapshot lookup."""
+from urllib.parse import urljoin
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from mc_extractor.backends import SnapshotBackend, FetchError, SAFER_URL
+from mc_extractor.parsing import (
+    parse_html, evaluate_snapshot, find_registration_link, registration_url, extract_registration,
+    empty_registration
+)
+from mc_extractor.timeouts import AdaptiveTimeouts
+
+# Requests the lean profile blocks: we only ever read the HTML document, so
+# images, stylesheets, fonts, media and analytics scripts are dead weight.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*googletagmanager.com*", "*google-analytics.com*", "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*", "*doubleclick.net*",
+]
+
+# Content settings for resource types Chrome can refuse outright (2 = block);
+# it has none for stylesheets or fonts, which BLOCKED_URL_PATTERNS covers
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.plugins": 2,
+    "profile.managed_default_content_settings.popups": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+}
+
+# Bytes transferred for the current document and its subresources. Cross-origin
+# resources without Timing-Allow-Origin report 0, so this is a lower bound.
+TRANSFERRED_BYTES_JS = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .forEach(function (entry) { total += entry.transferSize || entry.encodedBodySize || 0; });
+return total;
+"""
+
+
+# (default, floor, ceiling) in seconds for each wait of the lookup; the
+# defaults are the fixed waits the lookup used before timeouts were learned
+BROWSER_STEP_LIMITS = {
+    "form": (10, 2, 20),
+    "results": (10, 2, 30),
+    "results_ready": (10, 1, 30),
+    "registration_ready": (5, 0.5, 15),
+}
+
+
+def lean_profile(chrome_options):
+    """Switch `chrome_options` to the lean profile: blocked content types and eager page loads."""
+    chrome_options.add_experimental_option("prefs", LEAN_PREFS)
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from get() at DOMContentLoaded instead of waiting for every subresource
+    chrome_options.page_load_strategy = "eager"
+    return chrome_options
+
+
+def block_resources(driver):
+    """Block the remaining non-document requests through CDP request interception."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+
+def transferred_bytes(driver):
+    try:
+        return int(driver.execute_script(TRANSFERRED_BYTES_JS) or 0)
+    except Exception:
+        return 0
+
+
+def capture_failure(driver, captures, label, exc):
+    """Queue the current page, and a sampled screenshot, with a captures.FailureCapture."""
+    try:
+        page_source = driver.page_source
+        url = driver.current_url
+        screenshot = driver.get_screenshot_as_png() if captures.want_screenshot() else None
+    except Exception:
+        return False
+    captures.capture(label, page_source, screenshot, url=url, error=exc)
+    return True
+
+
+def chrome_options(lean=False):
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-infobars")
+    if lean:
+        lean_profile(chrome_options)
+    return chrome_options
+
+
+class SeleniumSnapshotBackend(SnapshotBackend):
+    name = "browser"
+
+    def __init__(self, safer_url=SAFER_URL, page_load_timeout=30, lean=True, page_stats=None, timeouts=None,
+                 tracer=None, captures=None):
+        self.safer_url = safer_url.rstrip("/")
+        self.captures = captures
+        if tracer is not None:
+            self.tracer = tracer
+        self.page_stats = page_stats
+        self.timeouts = timeouts if timeouts is not None else AdaptiveTimeouts()
+        self.timeouts.define(BROWSER_STEP_LIMITS)
+        self.driver = webdriver.Chrome(options=chrome_options(lean))
+        self.driver.set_page_load_timeout(page_load_timeout)
+        # With the eager strategy the text is usable once the DOM is parsed
+        self.ready_states = ("interactive", "complete") if lean else ("complete",)
+        if lean:
+            block_resources(self.driver)
+
+    def fetch_snapshot(self, mc_number):
+        # STEP 1: Initial search
+        self.get("search_page", f"{self.safer_url}/CompanySnapshot.aspx")
+
+        self.until("form", EC.presence_of_element_located((By.ID, "2")))
+        self.until("form", EC.element_to_be_clickable((By.ID, "2"))).click()
+
+        text_input = self.until(
+            "form", lambda d: d.find_element(By.ID, "4") if d.find_element(By.ID, "4").is_displayed() else False
+        )
+        text_input.clear()
+        text_input.send_keys(str(mc_number))
+
+        search_button = self.until(
+            "form", EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='SUBMIT'][value='Search']"))
+        )
+        search_button.click()
+
+        # Wait once for the result page, then run every check (steps 2-6) on a
+        # single page_source capture instead of one wire round trip per element.
+        self.until("results", EC.staleness_of(search_button))
+        self.wait_ready("results_ready")
+        with self.tracer.span("parse.snapshot"):
+            snapshot = evaluate_snapshot(mc_number, parse_html(self.driver.page_source))
+        self.record_page()
+        if snapshot.sms_url:
+            snapshot = snapshot._replace(sms_url=urljoin(self.driver.current_url, snapshot.sms_url))
+        return snapshot
+
+    def fetch_registration(self, snapshot):
+        # STEP 6-7: Load the registration page in this tab, addressed by the DOT
+        # number; without one, or if that page fails or is not a registration
+        # page, follow the SMS overview's additional link
+        url = registration_url(snapshot)
+        if url:
+            try:
+                self.get("registration", url)
+                self.wait_ready("registration_ready")
+                result = self.read_registration()
+                if not empty_registration(result):
+                    return result
+            except FetchError:
+                pass
+
+        self.get("sms_page", snapshot.sms_url)
+        self.wait_ready("registration_ready")
+        link = find_registration_link(parse_html(self.driver.page_source))
+        if link:
+            self.get("registration", urljoin(self.driver.current_url, link))
+            self.wait_ready("registration_ready")
+        return self.read_registration()
+
+    def read_registration(self):
+        # STEP 8: Extract all data from one capture of the registration page
+        with self.tracer.span("parse.registration"):
+            result = extract_registration(parse_html(self.driver.page_source))
+        self.record_page()
+        return result
+
+    def get(self, step, url):
+        # Page load timeouts and network errors are reported as transient fetch errors
+        with self.tracer.span(f"browser.{step}"):
+            try:
+                self.driver.get(url)
+            except WebDriverException as e:
+                raise FetchError(f"Could not load {url}: {e.msg}", transient=True) from e
+
+    def until(self, step, condition):
+        """WebDriverWait on `condition` with the step's learned timeout."""
+        with self.tracer.span(f"wait.{step}"):
+            try:
+                return self.timeouts.timed(
+                    step, lambda timeout: WebDriverWait(self.driver, timeout).until(condition)
+                )
+            except TimeoutException as e:
+                raise FetchError(f"Timed out waiting for {step}", transient=True) from e
+
+    def wait_ready(self, step):
+        self.until(step, lambda d: d.execute_script("return document.readyState") in self.ready_states)
+
+    def record_page(self):
+        if self.page_stats is not None:
+            self.page_stats.record(transferred_bytes(self.driver))
+
+    def on_error(self, mc_number, exc):
+        if self.captures is not None:
+            capture_failure(self.driver, self.captures, f"mc_{mc_number}", exc)
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
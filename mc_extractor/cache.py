@@ -0,0 +1,163 @@
+"""Persistent SQLite cache of SAFER snapshot and SMS registration lookups."""
+import json
+import sqlite3
+import threading
+import time
+
+from mc_extractor.backends import SnapshotBackend
+from mc_extractor.parsing import Snapshot, empty_registration
+
+DEFAULT_CACHE_PATH = "mc_lookup_cache.sqlite3"
+
+# Snapshot failures that reflect the carrier's actual record (rather than a
+# page that failed to render) and are therefore safe to cache.
+NEGATIVE_FAILURES = ("Not a CARRIER", "Not ACTIVE")
+
+
+class LookupCache:
+    """Snapshot results keyed by MC number, registration results keyed by DOT number.
+
+    Entries older than `ttl` seconds are treated as missing. Negative
+    snapshot results use `negative_ttl`, which defaults to `ttl`; a
+    registration with none of its fields found is not cached at all.
+    Every entry records the `site` (SAFER base URL) it was fetched from and
+    only counts as a hit for the same site, so a run against a mirror or
+    fixture server never feeds a run against the real site. One
+    connection is shared by all pool workers behind a lock.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=7 * 86400, negative_ttl=None, site=""):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.site = site.rstrip("/")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "mc_number INTEGER PRIMARY KEY, dot_number TEXT, failure TEXT, "
+            "sms_url TEXT, fetched_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS registrations ("
+            "dot_number TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        # Caches written before entries recorded their site get the column; their rows never match
+        for table in ("snapshots", "registrations"):
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if "site" not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN site TEXT")
+        self.conn.commit()
+
+    def count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_snapshot(self, mc_number):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT dot_number, failure, sms_url, fetched_at FROM snapshots WHERE mc_number = ? AND site = ?",
+                (int(mc_number), self.site)
+            ).fetchone()
+            if row is not None:
+                dot_number, failure, sms_url, fetched_at = row
+                ttl = self.negative_ttl if failure else self.ttl
+                if time.time() - fetched_at > ttl:
+                    row = None
+            self.count(row is not None)
+        if row is None:
+            return None
+        return Snapshot(mc_number, dot_number, failure, sms_url)
+
+    def put_snapshot(self, snapshot):
+        if snapshot.failure and snapshot.failure not in NEGATIVE_FAILURES:
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (mc_number, dot_number, failure, sms_url, fetched_at, site) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (int(snapshot.mc_number), snapshot.dot_number, snapshot.failure,
+                 snapshot.sms_url, time.time(), self.site)
+            )
+            self.conn.commit()
+
+    def get_registration(self, dot_number):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT payload, fetched_at FROM registrations WHERE dot_number = ? AND site = ?",
+                (dot_number, self.site)
+            ).fetchone()
+            if row is not None and time.time() - row[1] > self.ttl:
+                row = None
+            self.count(row is not None)
+        return json.loads(row[0]) if row else None
+
+    def put_registration(self, dot_number, result):
+        if empty_registration(result):
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO registrations (dot_number, payload, fetched_at, site) VALUES (?, ?, ?, ?)",
+                (dot_number, json.dumps(result), time.time(), self.site)
+            )
+            self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CachedBackend(SnapshotBackend):
+    """Serve lookups from a LookupCache, fetching through `backend` on a miss.
+
+    With `refresh` every lookup goes to `backend` and the cache only stores
+    what comes back, e.g. for a re-scan, which needs current data.
+    """
+
+    def __init__(self, backend, cache, refresh=False):
+        self.backend = backend
+        self.cache = cache
+        self.refresh = refresh
+        self.tracer = backend.tracer
+
+    @property
+    def name(self):
+        return f"{self.backend.name}+cache"
+
+    def fetch_snapshot(self, mc_number):
+        snapshot = None if self.refresh else self.cache.get_snapshot(mc_number)
+        if snapshot is None:
+            snapshot = self.backend.fetch_snapshot(mc_number)
+            self.cache.put_snapshot(snapshot)
+        return snapshot
+
+    def fetch_registration(self, snapshot):
+        if not snapshot.dot_number:
+            return self.backend.fetch_registration(snapshot)
+
+        result = None if self.refresh else self.cache.get_registration(snapshot.dot_number)
+        if result is None:
+            result = self.backend.fetch_registration(snapshot)
+            self.cache.put_registration(snapshot.dot_number, result)
+        return result
+
+    def on_error(self, mc_number, exc):
+        self.backend.on_error(mc_number, exc)
+
+    def close(self):
+        self.backend.close()
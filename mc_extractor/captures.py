@@ -0,0 +1,114 @@
+"""Failure captures: compressed page sources and sampled screenshots, written off the worker threads."""
+from collections import deque
+import gzip
+import html
+import os
+import re
+import threading
+import time
+
+DEFAULT_CAPTURE_DIR = "error_captures"
+
+CAPTURE_FILE = re.compile(r"^\d{8}-\d{6}-\d+-.+\.(html\.gz|png)$")
+
+
+class FailureCapture:
+    """Keep the last `ring_size` failure pages and write them from a background thread.
+
+    capture() only queues the page; the writer thread gzips it into
+    `directory`. When the writer falls behind, the oldest queued captures are
+    dropped rather than blocking the workers. Screenshots are taken for the
+    first failure and then every `screenshot_every`-th one. Files in the
+    directory are kept under `max_bytes` by deleting the oldest captures.
+    """
+
+    def __init__(self, directory=DEFAULT_CAPTURE_DIR, max_bytes=50 * 1024 * 1024, ring_size=50,
+                 screenshot_every=20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.screenshot_every = max(1, screenshot_every)
+        self.ring = deque(maxlen=ring_size)
+        self.condition = threading.Condition()
+        self.failures = 0
+        self.sequence = 0
+        self.dropped = 0
+        self.written = 0
+        self.closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self.files = deque(sorted(
+            (entry.stat().st_mtime, entry.path, entry.stat().st_size)
+            for entry in os.scandir(directory) if CAPTURE_FILE.match(entry.name)
+        ))
+        self.disk_bytes = sum(size for _, _, size in self.files)
+
+        self.thread = threading.Thread(target=self.writer, name="failure-capture", daemon=True)
+        self.thread.start()
+
+    def want_screenshot(self):
+        """Count a failure; True when this one should also get a screenshot."""
+        with self.condition:
+            self.failures += 1
+            return (self.failures - 1) % self.screenshot_every == 0
+
+    def capture(self, label, page_source, screenshot=None, url=None, error=None):
+        """Queue a page source (and optional PNG bytes) for writing; never blocks on disk."""
+        with self.condition:
+            if self.closed:
+                return
+            if len(self.ring) == self.ring.maxlen:
+                self.dropped += 1
+            self.sequence += 1
+            self.ring.append((time.time(), self.sequence, label, page_source, screenshot, url, error))
+            self.condition.notify()
+
+    def writer(self):
+        while True:
+            with self.condition:
+                while not self.ring and not self.closed:
+                    self.condition.wait()
+                if not self.ring:
+                    return
+                item = self.ring.popleft()
+            try:
+                self.write(*item)
+            except OSError:
+                pass
+
+    def write(self, timestamp, sequence, label, page_source, screenshot, url, error):
+        stem = time.strftime("%Y%m%d-%H%M%S", time.localtime(timestamp)) + f"-{sequence}-{label}"
+        header = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+        if url:
+            header += f" url={url}"
+        if error:
+            header += f" error={html.escape(str(error))[:500]}"
+        header = "<!-- " + header.replace("--", "- -") + " -->\n"
+
+        # Compress on this thread; page sources shrink ~10x
+        self.store(f"{stem}.html.gz", gzip.compress((header + (page_source or "")).encode("utf-8"), 6))
+        if screenshot:
+            self.store(f"{stem}.png", screenshot)
+
+    def store(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        self.written += 1
+        self.files.append((time.time(), path, len(data)))
+        self.disk_bytes += len(data)
+
+        # Stay under the disk cap by removing the oldest captures
+        while self.disk_bytes > self.max_bytes and len(self.files) > 1:
+            _, old_path, size = self.files.popleft()
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+            self.disk_bytes -= size
+
+    def close(self):
+        """Write what is queued and stop the writer thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
@@ -0,0 +1,323 @@
+"""Command-line entry point for running the extractors without a display.
+
+    python -m mc_extractor snapshot --range 1706527 1706530 -o mc_records.csv
+    python -m mc_extractor snapshot --bulk mc_numbers.txt --workers 8 --resume
+    python -m mc_extractor snapshot --rescan --status "Manual Check" --older-than-days 30
+    python -m mc_extractor register -o extracted_numbers.csv
+    python -m mc_extractor register --engine browser --date 02-JAN-25
+    python -m mc_extractor harvest --from 2025-01-01 --to 2025-01-31 -o new_numbers.csv
+    python -m mc_extractor export mc_records.sqlite3 -o manual.csv --status "Manual Check" --state TX
+"""
+import argparse
+from datetime import datetime
+import sys
+import threading
+
+from mc_extractor.backends import SAFER_URL
+from mc_extractor.cache import DEFAULT_CACHE_PATH
+from mc_extractor.captures import DEFAULT_CAPTURE_DIR
+from mc_extractor.database import ResultDatabase
+from mc_extractor.extractor import Extraction, STATUSES, read_mc_file
+from mc_extractor.harvest import DEFAULT_INDEX_PATH, RegisterHarvest
+from mc_extractor.register_http import HttpRegisterScraper, LI_URL
+from mc_extractor.rescan import load_previous, select_for_rescan
+
+
+class ConsoleReporter:
+    """Prints extractor events to stderr in place of a GUI."""
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+
+    def post(self, kind, *args):
+        if kind == "error":
+            print(f"ERROR: {args[0]}", file=sys.stderr)
+        elif self.quiet:
+            return
+        elif kind in ("status", "log"):
+            print(args[0], file=sys.stderr)
+        elif kind == "result":
+            mc, result, status = args
+            print(f"{mc}\t{status}\t{result['email']}", file=sys.stderr)
+
+
+def run_until_interrupted(extraction):
+    """Run `extraction` on a thread; on Ctrl-C stop it and wait for the lookups in flight to be written.
+
+    The main thread only waits, so Ctrl-C reaches it while the pipeline
+    keeps going; close() must not run before run() has returned. A second
+    Ctrl-C gives up waiting.
+    """
+    errors = []
+    # An event rather than Thread.join: a join cut short by Ctrl-C can take the thread for finished
+    finished = threading.Event()
+
+    def run():
+        try:
+            extraction.run()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            finished.set()
+
+    threading.Thread(target=run, name="extraction", daemon=True).start()
+    try:
+        # Short waits, as an untimed one cannot be interrupted on Windows
+        while not finished.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        extraction.stop()
+        print("Stopping; finishing the lookups in flight (Ctrl-C again to quit now)", file=sys.stderr)
+        finished.wait()
+        print("Stopped by user", file=sys.stderr)
+    if errors:
+        raise errors[0]
+
+
+def run_snapshot(args):
+    previous = None
+    if args.rescan:
+        if not args.status and args.older_than_days is None:
+            raise SystemExit("--rescan needs --status and/or --older-than-days")
+        previous = load_previous(args.output)
+        if not previous:
+            raise SystemExit(f"No previous results found in {args.output}")
+        older_than = None if args.older_than_days is None else args.older_than_days * 86400
+        mc_numbers = select_for_rescan(previous, args.status or (), older_than)
+        print(f"Re-scanning {len(mc_numbers)} of {len(previous)} records in {args.output}", file=sys.stderr)
+    elif args.range:
+        start, end = args.range
+        if start > end:
+            raise SystemExit("Start MC number must be less than or equal to End MC number")
+        mc_numbers = range(start, end + 1)
+    else:
+        mc_numbers = read_mc_file(args.bulk)
+        if not mc_numbers:
+            raise SystemExit("No valid MC numbers found in the file")
+
+    extraction = Extraction(
+        mc_numbers,
+        args.output,
+        engine=args.engine,
+        workers=args.workers,
+        timeout=args.timeout,
+        use_cache=not args.no_cache,
+        cache_ttl=args.cache_ttl_days * 86400,
+        cache_path=args.cache,
+        resume=args.resume,
+        safer_url=args.safer_url,
+        lean_browser=not args.full_browser,
+        adaptive_timeouts=not args.fixed_timeouts,
+        trace_path=args.trace,
+        metrics_path=args.metrics,
+        retries=args.retries,
+        capture_dir=args.capture_dir,
+        capture_max_bytes=int(args.capture_max_mb * 1024 * 1024),
+        previous=previous,
+        database_path=args.db,
+        classify_workers=args.classify_workers,
+        queue_size=args.queue_size,
+        events=ConsoleReporter(args.quiet)
+    )
+    try:
+        extraction.prepare()
+        run_until_interrupted(extraction)
+    except KeyboardInterrupt:
+        print("Stopped by user", file=sys.stderr)
+    finally:
+        extraction.close()
+
+    summary = ", ".join(f"{status}: {count}" for status, count in extraction.counts.items())
+    print(summary, file=sys.stderr)
+    pages = extraction.page_stats.summary()
+    if pages["pages"]:
+        print(f"Browser pages: {pages['pages']}, {pages['bytes_per_page']} bytes/page", file=sys.stderr)
+    if not args.quiet:
+        for step, stats in extraction.timeouts.summary().items():
+            if stats["samples"]:
+                print(f"{step}: p50 {stats['p50']:.3f}s, p95 {stats['p95']:.3f}s, "
+                      f"timeout {stats['timeout']:.1f}s ({stats['samples']} samples)", file=sys.stderr)
+        if extraction.pipeline:
+            for stage, stats in extraction.pipeline.summary().items():
+                print(f"{stage}: {stats['processed']} items on {stats['workers']} thread(s), "
+                      f"peak queue {stats['peak_queue']}, upstream blocked {stats['blocked_s']:.2f}s",
+                      file=sys.stderr)
+    return 0
+
+
+def run_register(args):
+    from mc_extractor.tracing import Tracer
+
+    tracer = Tracer(args.trace, args.metrics)
+    if args.engine == "http":
+        scraper = HttpRegisterScraper(args.output, timeout=args.timeout, events=ConsoleReporter(args.quiet),
+                                      base_url=args.li_url, date=args.date, tracer=tracer)
+    else:
+        if args.date:
+            raise SystemExit("--date needs the http engine")
+        # Selenium is only needed (and imported) for the browser engine
+        from mc_extractor.register import RegisterScraper
+        scraper = RegisterScraper(args.output, timeout=args.timeout, events=ConsoleReporter(args.quiet),
+                                  url=f"{args.li_url.rstrip('/')}/LIVIEW/pkg_html.prc_limain",
+                                  lean=not args.full_browser, tracer=tracer, capture_dir=args.capture_dir)
+    try:
+        numbers = scraper.run()
+    except KeyboardInterrupt:
+        scraper.stop()
+        return 1
+    finally:
+        tracer.close()
+    print(f"{len(numbers)} numbers extracted", file=sys.stderr)
+    return 0 if numbers else 1
+
+
+def run_harvest(args):
+    from mc_extractor.tracing import Tracer
+
+    if args.start > args.end:
+        raise SystemExit("--from is after --to")
+    tracer = Tracer(args.trace, args.metrics)
+    harvest = RegisterHarvest(args.start, args.end, args.output, index_path=args.index, workers=args.workers,
+                              timeout=args.timeout, events=ConsoleReporter(args.quiet), base_url=args.li_url,
+                              tracer=tracer)
+    try:
+        numbers = harvest.run()
+    except KeyboardInterrupt:
+        # run() has saved the publications it finished
+        print(f"Stopped by user; {len(harvest.numbers)} new numbers saved to {args.output}", file=sys.stderr)
+        return 1
+    finally:
+        tracer.close()
+    print(f"{len(numbers)} new numbers saved to {args.output}", file=sys.stderr)
+    return 0
+
+
+def iso_date(text):
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {text!r}")
+
+
+def run_export(args):
+    database = ResultDatabase(args.database)
+    try:
+        if args.import_csv:
+            count = database.import_csv(args.import_csv)
+            print(f"{count} rows imported from {args.import_csv}", file=sys.stderr)
+        if not args.output:
+            return 0
+        states = [state.upper() for state in args.state] if args.state else None
+        if args.output.endswith(".parquet"):
+            try:
+                count = database.export_parquet(args.output, args.status, states)
+            except ImportError:
+                raise SystemExit("Parquet export needs pyarrow (pip install pyarrow)")
+        else:
+            count = database.export_csv(args.output, args.status, states)
+    finally:
+        database.close()
+    print(f"{count} rows exported to {args.output}", file=sys.stderr)
+    return 0
+
+
+def add_capture_arguments(parser):
+    parser.add_argument("--capture-dir", default=DEFAULT_CAPTURE_DIR,
+                        help="where failed pages are saved (default: %(default)s)")
+    parser.add_argument("--capture-max-mb", type=float, default=50,
+                        help="disk cap for saved failure pages (default: %(default)s)")
+
+
+def add_trace_arguments(parser):
+    parser.add_argument("--trace", metavar="FILE", help="append a JSON line per timed step to FILE")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write step latency histograms to FILE in Prometheus text format")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="mc_extractor", description=__doc__.splitlines()[0])
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print errors and the summary")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="look up MC numbers on SAFER/SMS")
+    source = snapshot.add_mutually_exclusive_group(required=True)
+    source.add_argument("--range", nargs=2, type=int, metavar=("START", "END"),
+                        help="inclusive range of MC numbers")
+    source.add_argument("--bulk", metavar="FILE", help="text file with one MC number per line")
+    source.add_argument("--rescan", action="store_true",
+                        help="look up records of the output again (bypassing the lookup cache) "
+                             "and append the rows that changed")
+    snapshot.add_argument("-o", "--output", default="mc_records.csv", help="output CSV (default: %(default)s)")
+    snapshot.add_argument("--engine", choices=("http+browser", "http", "browser"), default="http+browser",
+                          help="fetch engine (default: %(default)s)")
+    snapshot.add_argument("--workers", type=int, default=4, help="parallel workers (default: %(default)s)")
+    snapshot.add_argument("--timeout", type=float, default=15,
+                          help="request timeout in seconds, also the ceiling for learned timeouts (default: %(default)s)")
+    snapshot.add_argument("--classify-workers", type=int, default=1,
+                          help="threads classifying fetched results (default: %(default)s)")
+    snapshot.add_argument("--queue-size", type=int, default=256,
+                          help="results buffered between pipeline stages before fetching waits (default: %(default)s)")
+    snapshot.add_argument("--retries", type=int, default=3,
+                          help="retries per step on timeouts and 5xx answers (default: %(default)s)")
+    snapshot.add_argument("--fixed-timeouts", action="store_true",
+                          help="always use the default timeouts instead of learning them from observed latencies")
+    snapshot.add_argument("--no-cache", action="store_true", help="do not use the local lookup cache")
+    snapshot.add_argument("--cache-ttl-days", type=float, default=7, help="lookup cache TTL (default: %(default)s)")
+    snapshot.add_argument("--cache", default=DEFAULT_CACHE_PATH, metavar="FILE",
+                          help="lookup cache file; entries are kept per --safer-url (default: %(default)s)")
+    snapshot.add_argument("--resume", action="store_true", help="continue an interrupted run into the same output")
+    snapshot.add_argument("--status", action="append", choices=[s for s in STATUSES if s != "Error"],
+                          help="with --rescan, re-queue records with this status (repeatable)")
+    snapshot.add_argument("--older-than-days", type=float, metavar="DAYS",
+                          help="with --rescan, re-queue records looked up more than DAYS ago")
+    snapshot.add_argument("--db", metavar="FILE", help="also upsert every classified row into a SQLite store")
+    snapshot.add_argument("--safer-url", default=SAFER_URL, help="SAFER base URL, e.g. a local recording server")
+    snapshot.add_argument("--full-browser", action="store_true",
+                          help="let Chrome load images, stylesheets and fonts (lean profile is the default)")
+    add_trace_arguments(snapshot)
+    add_capture_arguments(snapshot)
+    snapshot.set_defaults(func=run_snapshot)
+
+    register = commands.add_parser("register", help="extract MC numbers from the FMCSA Register")
+    register.add_argument("-o", "--output", default="extracted_numbers.csv", help="output CSV (default: %(default)s)")
+    register.add_argument("--engine", choices=("http", "browser"), default="http",
+                          help="submit the register forms over HTTP or drive Chrome (default: %(default)s)")
+    register.add_argument("--date", help="decision date as listed on the register page, e.g. 02-JAN-25 "
+                                         "(default: the latest; the http engine then skips the menu request)")
+    register.add_argument("--li-url", default=LI_URL, help="L&I base URL, e.g. a local recording server")
+    register.add_argument("--timeout", type=float, default=20, help="page wait timeout in seconds (default: %(default)s)")
+    register.add_argument("--full-browser", action="store_true",
+                          help="let Chrome load images, stylesheets and fonts (lean profile is the default)")
+    add_trace_arguments(register)
+    add_capture_arguments(register)
+    register.set_defaults(func=run_register)
+
+    harvest = commands.add_parser("harvest", help="extract only new MC numbers from a date range of the FMCSA Register")
+    harvest.add_argument("--from", dest="start", type=iso_date, required=True, metavar="YYYY-MM-DD",
+                         help="first decision date to harvest")
+    harvest.add_argument("--to", dest="end", type=iso_date, required=True, metavar="YYYY-MM-DD",
+                         help="last decision date to harvest")
+    harvest.add_argument("-o", "--output", default="new_numbers.csv",
+                         help="CSV of the numbers not seen before (default: %(default)s)")
+    harvest.add_argument("--index", default=DEFAULT_INDEX_PATH,
+                         help="index of numbers seen by earlier harvests, updated after the output is saved "
+                              "(default: %(default)s)")
+    harvest.add_argument("--workers", type=int, default=4, help="publications downloaded at once (default: %(default)s)")
+    harvest.add_argument("--li-url", default=LI_URL, help="L&I base URL, e.g. a local recording server")
+    harvest.add_argument("--timeout", type=float, default=20, help="request timeout in seconds (default: %(default)s)")
+    add_trace_arguments(harvest)
+    harvest.set_defaults(func=run_harvest)
+
+    export = commands.add_parser("export", help="import/export rows of a SQLite result store")
+    export.add_argument("database", help="SQLite result store (created if missing)")
+    export.add_argument("-o", "--output", help="CSV to write, or Parquet when it ends in .parquet")
+    export.add_argument("--import-csv", metavar="FILE", help="first upsert the rows of an output CSV")
+    export.add_argument("--status", action="append", choices=STATUSES, help="only rows with this status (repeatable)")
+    export.add_argument("--state", action="append", help="only rows in this two-letter state (repeatable)")
+    export.set_defaults(func=run_export)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
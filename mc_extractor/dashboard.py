@@ -0,0 +1,62 @@
+"""Running counters behind a live run dashboard: throughput, counts by status, step latency, first digits."""
+from collections import deque
+import time
+
+# Interval, in milliseconds, at which GUIs redraw the dashboard
+DASHBOARD_MS = 500
+
+# Seconds of samples the records/sec figure is averaged over
+RATE_WINDOW = 10.0
+
+
+class DashboardStats:
+    """Counters fed from scraper events, read by a GUI on a fixed refresh.
+
+    Give post() the ("stats", processed, found, elapsed) and ("numbers",
+    batch) events; each batch of numbers is counted into the first-digit
+    histogram once, so nothing is recounted at refresh time. tick() takes a
+    throughput sample and is meant to be called once per refresh, so the
+    rate also falls back to zero while no rows arrive. `labels` name the
+    found / not-found counts, e.g. ("New", "Already seen") for a harvest.
+    `tracer`, if given, supplies per-step latency through its summary().
+    """
+
+    def __init__(self, labels=("Numbers", "No number"), tracer=None, window=RATE_WINDOW, history=120):
+        self.labels = labels
+        self.tracer = tracer
+        self.window = window
+        self.samples = deque()
+        self.rates = deque(maxlen=history)
+        self.digits = [0] * 10
+        self.processed = 0
+        self.found = 0
+        self.elapsed = 0.0
+
+    def post(self, kind, *args):
+        if kind == "stats":
+            self.processed, self.found, self.elapsed = args
+        elif kind == "numbers":
+            digits = self.digits
+            for number in args[0]:
+                digits[int(str(number)[0])] += 1
+
+    def tick(self, now=None):
+        """Sample the processed count; returns records/sec over the last `window` seconds."""
+        now = time.monotonic() if now is None else now
+        samples = self.samples
+        samples.append((now, self.processed))
+        while len(samples) > 2 and now - samples[0][0] > self.window:
+            samples.popleft()
+        first_time, first_processed = samples[0]
+        rate = (self.processed - first_processed) / (now - first_time) if now > first_time else 0.0
+        self.rates.append(rate)
+        return rate
+
+    def statuses(self):
+        """{label: count} for the rows with and without a (new) number."""
+        found_label, other_label = self.labels
+        return {found_label: self.found, other_label: max(0, self.processed - self.found)}
+
+    def latencies(self):
+        """{step: {"count", "mean_ms", "p95_ms", ...}} from the tracer, empty without one."""
+        return self.tracer.summary() if self.tracer is not None else {}
@@ -0,0 +1,163 @@
+"""SQLite store of classified results keyed by MC number, with streaming CSV/Parquet export."""
+import csv
+from itertools import islice
+import re
+import sqlite3
+import threading
+import time
+
+from mc_extractor.sinks import CSV_HEADER
+
+# "DALLAS, TX 75001" -> "TX"; addresses are stored as shown on the SMS page
+STATE_PATTERN = re.compile(r"\b([A-Z]{2})\s+\d{5}(?:-\d{4})?\s*$")
+
+COLUMNS = ("mc_number", "company_name", "address", "email", "phone", "status")
+
+
+def address_state(address):
+    """Two-letter state of a US address, or None."""
+    match = STATE_PATTERN.search(address or "")
+    return match.group(1) if match else None
+
+
+class ResultDatabase:
+    """One row per MC number; writing an MC number again replaces its row.
+
+    upsert() only buffers; flush() writes the buffer in one transaction.
+    flush()/sync() match the follower protocol of sinks.CsvSink, so a run
+    commits on the CSV's flushes. The state parsed from the address is
+    stored in its own column, and status and state are indexed.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "mc_number INTEGER PRIMARY KEY, company_name TEXT, address TEXT, email TEXT, "
+            "phone TEXT, status TEXT NOT NULL, state TEXT, updated_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_status ON results (status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_state ON results (state)")
+        self.conn.commit()
+
+    def upsert(self, mc, company_name, address, email, phone, status):
+        with self.lock:
+            self.pending.append((int(mc), company_name, address, email, phone, status,
+                                 address_state(address), time.time()))
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            self.conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (mc_number) DO UPDATE SET company_name = excluded.company_name, "
+                "address = excluded.address, email = excluded.email, phone = excluded.phone, "
+                "status = excluded.status, state = excluded.state, updated_at = excluded.updated_at",
+                self.pending
+            )
+            self.conn.commit()
+            self.pending = []
+
+    def sync(self):
+        self.flush()
+
+    def import_csv(self, path):
+        """Upsert every row of an output CSV (later rows win); returns the number of rows read."""
+        count = 0
+        with open(path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                if len(row) == 6 and row[0].isdigit():
+                    self.upsert(*row)
+                    count += 1
+        self.flush()
+        return count
+
+    def query(self, statuses=None, states=None):
+        """SQL and parameters selecting the stored rows, filtered by status and/or state."""
+        clauses, params = [], []
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if states:
+            clauses.append(f"state IN ({', '.join('?' * len(states))})")
+            params.extend(states)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql + " ORDER BY mc_number", params
+
+    def rows(self, statuses=None, states=None, chunk_size=5000):
+        """Yield stored rows in COLUMNS order, `chunk_size` at a time from the cursor."""
+        self.flush()
+        sql, params = self.query(statuses=statuses, states=states)
+        # A separate read connection, so writers are not blocked while the rows stream out
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                yield from chunk
+        finally:
+            conn.close()
+
+    def get(self, mc):
+        self.flush()
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM results WHERE mc_number = ?", (int(mc),)
+            ).fetchone()
+
+    def count(self, status=None, state=None):
+        self.flush()
+        sql, params = self.query(statuses=[status] if status else None, states=[state] if state else None)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+    def export_csv(self, path, statuses=None, states=None):
+        """Write the selected rows to a CSV in the extractor's column layout; returns the row count."""
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            for row in self.rows(statuses, states):
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def export_parquet(self, path, statuses=None, states=None, chunk_size=50000):
+        """Write the selected rows to a Parquet file one row group per chunk (needs pyarrow)."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([("mc_number", pa.int64())] + [(name, pa.string()) for name in COLUMNS[1:]])
+        rows = self.rows(statuses, states)
+        count = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    return count
+                columns = [pa.array(values, field.type) for values, field in zip(zip(*chunk), schema)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                count += len(chunk)
+
+    def close(self):
+        if self.conn:
+            self.flush()
+            self.conn.close()
+            self.conn = None
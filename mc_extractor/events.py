@@ -0,0 +1,37 @@
+"""Thread-safe event bus between scraping threads and the GUI main loop."""
+import queue
+
+# Frame interval, in milliseconds, at which GUIs drain the bus
+FRAME_MS = 50
+
+
+class EventBus:
+    """Workers post (kind, args) events; the GUI thread drains them in batches.
+
+    Nothing here touches Tk, so worker threads never call into the GUI
+    toolkit. Kinds listed in `coalesce` only matter by their latest value
+    (status text, progress, counters), so each drain keeps just the last one.
+    """
+
+    def __init__(self, coalesce=()):
+        self.queue = queue.SimpleQueue()
+        self.coalesce = set(coalesce)
+
+    def post(self, kind, *args):
+        self.queue.put((kind, args))
+
+    def drain(self, limit=5000):
+        """Return up to `limit` pending events in order, with coalesced kinds deduplicated."""
+        events = []
+        latest = {}
+        for _ in range(limit):
+            try:
+                kind, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind in self.coalesce:
+                if kind in latest:
+                    events[latest[kind]] = None
+                latest[kind] = len(events)
+            events.append((kind, args))
+        return [event for event in events if event is not None]
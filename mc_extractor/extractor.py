@@ -0,0 +1,301 @@
+"""MC number extraction runs: lookup, classification and output.
+
+A run is a pipeline of stages joined by bounded queues: the fetch workers
+(pool.WorkerPool, one backend each) -> classify -> sink (CSV, journal,
+database and events). A slow disk or GUI fills the queues and holds the
+fetch workers back instead of buffering results without limit.
+
+Progress is reported by posting events to an EventBus-like object
+(anything with `post(kind, *args)`):
+
+    ("status", text)                   human readable progress line
+    ("result", mc, result, status)     one classified lookup
+    ("counters", counts, cache_stats)  running totals per status
+    ("progress", done, total)
+    ("breaker", state)                 circuit breaker "open", "half-open" or "closed"
+"""
+import os
+import re
+
+from mc_extractor.backends import make_backend, PageStats, SAFER_URL
+from mc_extractor.cache import LookupCache, CachedBackend, DEFAULT_CACHE_PATH
+from mc_extractor.captures import FailureCapture, DEFAULT_CAPTURE_DIR
+from mc_extractor.database import ResultDatabase
+from mc_extractor.journal import RunJournal, journal_path_for
+from mc_extractor.pipeline import Pipeline, Stage
+from mc_extractor.pool import WorkerPool
+from mc_extractor.retry import RetryPolicy, CircuitBreaker, RetryingBackend
+from mc_extractor.sinks import CsvSink
+from mc_extractor.sources import BulkFileSource, ExcludingSource, as_source
+from mc_extractor.timeouts import AdaptiveTimeouts
+from mc_extractor.tracing import Tracer
+
+# "Error" marks lookups that still failed after their retries; they are
+# neither written to the CSV nor journaled, so a resume picks them up again
+STATUSES = ("Success", "Partial Success", "Manual Check", "Failed", "Error")
+
+# Messages that mark a carrier as ineligible; such records are not saved to CSV
+FAILED_MARKERS = (
+    "Not a CARRIER",
+    "Not ACTIVE",
+    "Not AUTHORIZED FOR Property",
+    "Not General Freight",
+    "X Check Failed",
+    "No SMS Link Found",
+    "Address without Valid Postal Code",
+    "Canadian Address Not Allowed",
+)
+
+
+def classify(result):
+    """Status for a lookup result: Success, Partial Success, Manual Check, Failed or Error."""
+    email = result["email"]
+    phone = result["phone"]
+
+    if email.startswith("Error:"):
+        return "Error"
+    if any(marker in email for marker in FAILED_MARKERS):
+        return "Failed"
+
+    # Check contact info
+    has_email = "@" in email and "Email Not Found" not in email
+    has_phone = re.search(r'\d', phone) and "Phone Not Found" not in phone
+
+    if has_email and has_phone:
+        return "Success"
+    elif has_email or has_phone:
+        return "Partial Success"
+    return "Manual Check"
+
+
+def read_mc_file(path):
+    """Unique MC numbers from a text file with one number per line; other lines are skipped.
+
+    Returns a streaming source: the file is memory-mapped and read as the
+    run goes, and len() counts it without building a list.
+    """
+    return BulkFileSource(path)
+
+
+class Extraction:
+    """One extraction run over a source of MC numbers into an output CSV."""
+
+    def __init__(self, mc_numbers, output_path, engine="http+browser", workers=4, timeout=15,
+                 use_cache=True, cache_ttl=7 * 86400, cache_path=DEFAULT_CACHE_PATH, resume=False,
+                 safer_url=SAFER_URL, lean_browser=True, adaptive_timeouts=True, trace_path=None,
+                 metrics_path=None, retries=3,
+                 capture_dir=DEFAULT_CAPTURE_DIR, capture_max_bytes=50 * 1024 * 1024, previous=None,
+                 database_path=None, classify_workers=1, queue_size=256, events=None):
+        # A work source (range, bulk file, list); it is only read as workers free up
+        self.mc_numbers = as_source(mc_numbers)
+        self.output_path = output_path
+        self.engine = engine
+        self.lean_browser = lean_browser
+        self.safer_url = safer_url
+        self.workers = workers
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.cache_ttl = cache_ttl
+        self.cache_path = cache_path
+        self.resume = resume
+        self.trace_path = trace_path
+        self.metrics_path = metrics_path
+        self.capture_dir = capture_dir
+        self.capture_max_bytes = capture_max_bytes
+        # {mc: rescan.PreviousRecord} of the output being re-scanned, or None
+        self.previous = previous
+        self.database_path = database_path
+        self.classify_workers = classify_workers
+        self.queue_size = queue_size
+        self.events = events
+
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.page_stats = PageStats()
+        # Step latencies are pooled across workers so every backend learns from all of them
+        self.timeouts = AdaptiveTimeouts(adaptive=adaptive_timeouts)
+        self.tracer = None
+        self.captures = None
+        # Transient failures are retried with backoff; a burst of them pauses every worker
+        self.retry_policy = RetryPolicy(attempts=retries + 1)
+        self.breaker = CircuitBreaker(on_change=self.on_breaker_change)
+        self.stop_requested = False
+        self.rows_changed = 0
+        self.processed = 0
+        self.total = 0
+        self.pipeline = None
+        self.cache = None
+        self.journal = None
+        self.sink = None
+        self.database = None
+        self.pool = None
+
+    def post(self, kind, *args):
+        if self.events is not None:
+            self.events.post(kind, *args)
+
+    def prepare(self):
+        """Open the output, journal and worker pool; return the number of MC numbers left to do."""
+        # Skip numbers the journal already has when resuming an interrupted run
+        self.journal = RunJournal(journal_path_for(self.output_path))
+        resume = self.resume and self.previous is None and os.path.exists(self.output_path)
+        if resume:
+            completed = self.journal.load()
+            # Only the entries this run's source covers count; the journal may be of a wider run
+            for mc, (status, _) in completed.items():
+                if status in self.counts and mc in self.mc_numbers:
+                    self.counts[status] += 1
+            self.mc_numbers = ExcludingSource(self.mc_numbers, completed)
+
+        # A re-scan appends to the output it re-scans; records it does not
+        # re-queue keep their status in the totals
+        if self.previous is not None:
+            for mc, record in self.previous.items():
+                if mc not in self.mc_numbers and record.status in self.counts:
+                    self.counts[record.status] += 1
+        append = resume or self.previous is not None
+
+        # The CSV stays open for the whole run and the journal is flushed behind it
+        self.sink = CsvSink(self.output_path, append=append)
+        self.journal.open(resume=append)
+        self.sink.add_follower(self.journal)
+
+        # The SQLite store gets every classified row (Failed included) and
+        # commits on the CSV's flushes
+        if self.database_path:
+            self.database = ResultDatabase(self.database_path)
+            self.sink.add_follower(self.database)
+
+        # Span histograms are always kept; the JSONL trace and Prometheus file
+        # are written on the sink's flushes and checkpoints when requested
+        self.tracer = Tracer(self.trace_path, self.metrics_path)
+        self.sink.add_follower(self.tracer)
+
+        # Pages of failed browser lookups are written in the background under a disk cap
+        if self.engine != "http" and self.capture_dir:
+            self.captures = FailureCapture(self.capture_dir, max_bytes=self.capture_max_bytes)
+
+        # Each worker builds its own backend (Chrome is only started for the browser engine)
+        if self.use_cache:
+            self.cache = LookupCache(self.cache_path, ttl=self.cache_ttl, site=self.safer_url)
+        self.pool = WorkerPool(self.make_backend, self.workers, capacity=self.queue_size)
+        if self.stop_requested:
+            # Stopped while preparing (prepare runs on the caller's run thread)
+            self.pool.stop()
+        return len(self.mc_numbers)
+
+    def make_backend(self):
+        backend = make_backend(self.engine, self.safer_url, timeout=self.timeout,
+                               lean_browser=self.lean_browser, page_stats=self.page_stats,
+                               timeouts=self.timeouts, tracer=self.tracer, captures=self.captures)
+        backend = RetryingBackend(backend, self.retry_policy, self.breaker)
+        if self.cache:
+            # A re-scan looks everything up again; the cache only takes the fresh results
+            backend = CachedBackend(backend, self.cache, refresh=self.previous is not None)
+        return backend
+
+    def run(self):
+        """Process every pending MC number; returns how many were processed."""
+        self.total = len(self.mc_numbers)
+        self.processed = 0
+        self.post("status", f"Processing {self.total} MC numbers with {self.pool.workers} worker(s)...")
+
+        # Results arrive from the worker pool in completion order. The sink
+        # stage keeps one thread: it owns the counters, CSV, journal and database.
+        self.pipeline = Pipeline([
+            Stage("classify", self.classify_stage, self.classify_workers, self.queue_size),
+            # While no results arrive the sink still flushes on its interval
+            Stage("sink", self.sink_stage, 1, self.queue_size, idle=self.sink.maybe_flush),
+        ])
+        self.pipeline.run(self.pool.run(self.mc_numbers), on_error=self.pool.stop)
+
+        # Bandwidth of the browser page loads, if any were needed
+        pages = self.page_stats.summary()
+        note = f" (browser: {pages['bytes_per_page'] / 1024:.1f} KB/page)" if pages["pages"] else ""
+        if self.previous is not None:
+            note = f", {self.rows_changed} changed" + note
+        if self.stop_requested:
+            self.post("status", "Stopped by user" + note)
+        else:
+            self.post("status", f"Extraction completed! Processed {self.processed} MC numbers" + note)
+        return self.processed
+
+    def classify_stage(self, item):
+        mc, result = item
+        return mc, result, classify(result)
+
+    def sink_stage(self, item):
+        mc, result, status = item
+        self.counts[status] += 1
+        self.record(mc, result, status)
+
+        self.processed += 1
+        self.post("result", mc, result, status)
+        self.post("counters", dict(self.counts), self.cache.stats() if self.cache else None)
+        self.post("progress", self.processed, self.total)
+        self.post("status", f"Processed MC Number: {mc} ({self.processed}/{self.total})")
+
+    def on_breaker_change(self, state):
+        self.post("breaker", state)
+        if state == "open":
+            self.post("status", f"SAFER is failing; pausing all workers for {self.breaker.cooldown:.0f}s...")
+        elif state == "closed":
+            self.post("status", "SAFER is responding again; resuming")
+
+    def record(self, mc, result, status):
+        # Lookups that errored out are left out of the CSV and the journal,
+        # so a resume retries them
+        if status == "Error":
+            self.sink.maybe_flush()
+            return
+        self.journal.record(mc, status)
+
+        # Replace newlines with spaces for CSV to keep address in one line
+        csv_address = result["address"].replace('\n', ' ')
+        row = [mc, result["company_name"], csv_address, result["email"], result["phone"], status]
+        if self.database:
+            self.database.upsert(*row)
+
+        if self.previous is not None:
+            # A re-scan appends only rows that changed; the later row wins.
+            # "Failed" is written only to supersede a row saved earlier.
+            record = self.previous.get(mc)
+            saved = record is not None and record.row is not None
+            if (saved and record.row == tuple(map(str, row))) or (status == "Failed" and not saved):
+                self.sink.maybe_flush()
+                return
+            self.rows_changed += 1
+            self.sink.write(row)
+        elif status != "Failed":
+            # Save all records except "Failed" to CSV
+            self.sink.write(row)
+        else:
+            self.sink.maybe_flush()
+
+    def stop(self):
+        """Finish the lookups in flight and end the run."""
+        self.stop_requested = True
+        self.breaker.stop()
+        if self.pool:
+            self.pool.stop()
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+        if self.sink:
+            self.sink.close()
+            self.sink = None
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.database:
+            self.database.close()
+            self.database = None
+        if self.tracer:
+            self.tracer.close()
+        if self.captures:
+            self.captures.close()
+            self.captures = None
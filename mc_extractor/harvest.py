@@ -0,0 +1,207 @@
+"""Harvest a range of FMCSA Register publications and keep only MC numbers not seen before.
+
+Progress is posted to an EventBus-like `events` object:
+
+    ("log", message)
+    ("status", text)
+    ("progress", dates_done, dates_total)
+    ("stats", rows_processed, new_found, elapsed_seconds)
+    ("numbers", new_numbers_of_a_publication)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
+import time
+
+from mc_extractor.backends import FetchError
+from mc_extractor.register_http import HttpRegisterFetcher, LI_URL, save_numbers
+from mc_extractor.sources import Bitmap
+from mc_extractor.tracing import NULL_TRACER
+
+DEFAULT_INDEX_PATH = "seen_numbers.idx"
+
+# Decision dates as the register page lists them, e.g. "02-JAN-25"
+REGISTER_DATE_FORMAT = "%d-%b-%y"
+
+INDEX_MAGIC = b"MCSEEN1"
+
+
+def register_date(text):
+    """The date of a register option, or None if it is not in REGISTER_DATE_FORMAT."""
+    try:
+        return datetime.strptime(text.strip(), REGISTER_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+class SeenIndex:
+    """MC numbers seen by earlier harvests, kept as a Bitmap in one file.
+
+    The file is a header line, the bitmap's bytes, then any numbers past the
+    bitmap's limit one per line. save() replaces the file atomically, so an
+    interrupted run leaves the previous index intact.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.numbers = Bitmap()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            header = file.readline().split()
+            if len(header) != 2 or header[0] != INDEX_MAGIC or not header[1].isdigit():
+                raise ValueError(f"{self.path} is not a seen-number index")
+            self.numbers.bits = bytearray(file.read(int(header[1])))
+            self.numbers.overflow = {int(line) for line in file if line.strip().isdigit()}
+
+    def add(self, number):
+        """Record a number; True if no earlier harvest (or this one) had it."""
+        return self.numbers.add(int(number))
+
+    def __contains__(self, number):
+        return int(number) in self.numbers
+
+    def save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(INDEX_MAGIC + b" %d\n" % len(self.numbers.bits))
+            file.write(self.numbers.bits)
+            file.writelines(b"%d\n" % number for number in sorted(self.numbers.overflow))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+
+class RegisterHarvest:
+    """Fetch every register publication between two dates over HTTP and save the new numbers.
+
+    Publications are downloaded `workers` at a time, each on its own session,
+    and checked against the SeenIndex in date order, so a number is credited
+    to the first publication that lists it. Only numbers the index did not
+    have are written to `output_path`; the index is saved after the output.
+    A run that is stopped, interrupted (Ctrl-C) or fails part way still saves
+    the publications it finished, so the next run picks up the rest.
+    """
+
+    def __init__(self, start_date, end_date, output_path="extracted_numbers.csv", index_path=DEFAULT_INDEX_PATH,
+                 workers=4, timeout=20, events=None, base_url=LI_URL, tracer=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.output_path = output_path
+        self.index_path = index_path
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.events = events
+        self.base_url = base_url
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.stop_requested = False
+        self.numbers = []
+
+    def post(self, kind, *args):
+        if self.events is not None:
+            self.events.post(kind, *args)
+
+    def log(self, message):
+        self.post("log", message)
+
+    def stop(self):
+        self.stop_requested = True
+
+    def fetch(self, form, date):
+        """All numbers of one publication; None once a stop was requested."""
+        if self.stop_requested:
+            return None
+        fetcher = HttpRegisterFetcher(self.base_url, timeout=self.timeout, tracer=self.tracer)
+        try:
+            numbers = []
+            with self.tracer.context(date=date):
+                for _, number in fetcher.iter_rows(date, form=form):
+                    if self.stop_requested:
+                        return None
+                    if number:
+                        numbers.append(number)
+            return numbers
+        except FetchError as e:
+            # Its numbers stay out of the index, so a later harvest picks them up
+            self.log(f"{date}: request error: {str(e)}")
+            return []
+        finally:
+            fetcher.close()
+
+    def run(self):
+        """Harvest the date range; returns the new numbers (also saved to output_path)."""
+        start_time = time.time()
+        processed_count = 0
+        self.numbers = numbers = []
+        harvested = 0
+        saved = False
+
+        try:
+            index = SeenIndex(self.index_path)
+            self.log("Requesting the list of register publications...")
+            self.post("status", "Requesting register dates...")
+            fetcher = HttpRegisterFetcher(self.base_url, timeout=self.timeout, tracer=self.tracer)
+            try:
+                form = fetcher.register_form()
+            finally:
+                fetcher.close()
+
+            dates = sorted((day, text) for text in form.dates
+                           if (day := register_date(text)) and self.start_date <= day <= self.end_date)
+            if not dates:
+                self.log(f"No register publications between {self.start_date} and {self.end_date}")
+                self.post("status", "Completed! No publications in range")
+                return numbers
+            self.log(f"Harvesting {len(dates)} publications with {self.workers} worker(s)...")
+            self.post("progress", 0, len(dates))
+
+            # Downloads overlap; results are taken in date order
+            pool = ThreadPoolExecutor(self.workers, thread_name_prefix="harvest")
+            try:
+                results = pool.map(lambda date: self.fetch(form, date), [text for _, text in dates])
+                for done, ((_, text), found) in enumerate(zip(dates, results), 1):
+                    if found is None:
+                        self.log("Process stopped by user")
+                        break
+                    new = [number for number in found if index.add(number)]
+                    numbers.extend(new)
+                    harvested = done
+                    processed_count += len(found)
+                    self.log(f"{text}: {len(found)} numbers, {len(new)} new")
+                    self.post("numbers", new)
+                    self.post("progress", done, len(dates))
+                    self.post("stats", processed_count, len(numbers), time.time() - start_time)
+                    self.post("status", f"Harvested {done}/{len(dates)} publications")
+            except BaseException:
+                # Ctrl-C or an error: downloads in flight give up at their next chunk
+                self.stop_requested = True
+                raise
+            finally:
+                # Queued downloads are dropped, and those in flight are not waited for
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            # Not tried a second time below if it fails
+            saved = True
+            self.save(index, numbers)
+            self.post("status", f"Completed! {len(numbers)} new numbers saved")
+
+        except Exception as e:
+            self.log(f"An error occurred: {str(e)}")
+            self.post("status", "Error occurred - check logs")
+        finally:
+            # Publications finished before an error or Ctrl-C are kept too
+            if harvested and not saved:
+                self.save(index, numbers)
+            self.post("stats", processed_count, len(numbers), time.time() - start_time)
+
+        return numbers
+
+    def save(self, index, numbers):
+        # The index only claims numbers once they are in the output
+        self.log(f"Saving {len(numbers)} new numbers to CSV...")
+        save_numbers(self.output_path, numbers)
+        index.save()
+        self.log(f"Saved results to {self.output_path}")
@@ -0,0 +1,70 @@
+"""Append-only journal of completed MC numbers, used to resume interrupted runs."""
+import os
+import time
+
+
+def journal_path_for(output_path):
+    """Journal file kept next to an output CSV."""
+    return f"{output_path}.journal"
+
+
+class RunJournal:
+    """One tab-separated line per completed MC number: mc, status, unix time.
+
+    Records are held in memory until flush(); the output sink flushes the
+    journal right after its own rows reach the file, so the journal never
+    runs ahead of the CSV. A torn last line is ignored on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.pending = []
+
+    def load(self):
+        """Return {mc_number: (status, timestamp)} for every journaled record."""
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    break
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 3 or not parts[0].isdigit():
+                    continue
+                try:
+                    completed[int(parts[0])] = (parts[1], float(parts[2]))
+                except ValueError:
+                    continue
+        return completed
+
+    def open(self, resume=False):
+        """Open for appending; without `resume` any previous journal is discarded."""
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        # Drop a torn line left behind by a crash so new records start cleanly
+        if resume and self.file.tell() > 0:
+            with open(self.path, 'rb') as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    self.file.write("\n")
+
+    def record(self, mc_number, status):
+        self.pending.append(f"{mc_number}\t{status}\t{time.time():.0f}\n")
+
+    def flush(self):
+        if self.file and self.pending:
+            self.file.writelines(self.pending)
+            self.file.flush()
+            self.pending = []
+
+    def sync(self):
+        if self.file:
+            self.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file:
+            self.sync()
+            self.file.close()
+            self.file = None
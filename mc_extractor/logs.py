@@ -0,0 +1,95 @@
+"""Run logs on the standard logging module: a rotating log file plus a bounded buffer a GUI drains per frame."""
+from collections import deque
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+
+LOGGER_NAME = "mc_extractor"
+
+FILE_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+
+# As the log panes have always shown it: "12:34:56 - message"
+CONSOLE_FORMAT = "%(asctime)s - %(message)s"
+CONSOLE_DATE_FORMAT = "%H:%M:%S"
+
+# Lines a log pane keeps; older ones are dropped
+LOG_LINES = 1000
+
+
+def add_file_handler(path, max_bytes=5 << 20, backup_count=3, logger=None):
+    """Log to `path`, rolled over at `max_bytes` with `backup_count` old files kept.
+
+    Adding the same path twice returns the handler already attached.
+    """
+    logger = logger if logger is not None else logging.getLogger(LOGGER_NAME)
+    path = os.path.abspath(path)
+    for handler in logger.handlers:
+        if isinstance(handler, RotatingFileHandler) and handler.baseFilename == path:
+            return handler
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    logger.addHandler(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    return handler
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps formatted lines until drained, at most `capacity` of them.
+
+    emit() only appends to a deque, so logging threads never touch the GUI
+    toolkit; the GUI thread calls drain() once per frame and inserts the
+    batch in one go. If the GUI falls behind, the oldest lines are dropped
+    and counted in the next drain().
+    """
+
+    def __init__(self, capacity=LOG_LINES, level=logging.NOTSET):
+        super().__init__(level)
+        self.capacity = capacity
+        self.lines = deque(maxlen=capacity)
+        self.dropped = 0
+        self.setFormatter(logging.Formatter(CONSOLE_FORMAT, CONSOLE_DATE_FORMAT))
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        # handle() holds self.lock around emit()
+        if len(self.lines) == self.capacity:
+            self.dropped += 1
+        self.lines.append(line)
+
+    def drain(self):
+        """Return (lines logged since the last drain, lines dropped before they were drained)."""
+        self.acquire()
+        try:
+            lines, dropped = list(self.lines), self.dropped
+            self.lines.clear()
+            self.dropped = 0
+        finally:
+            self.release()
+        return lines, dropped
+
+
+class LogEvents:
+    """Events adapter that sends ("log", message) events to a logger and passes the rest on.
+
+    Give it to a scraper in place of the EventBus: log lines then reach the
+    log file and the ring buffer from the scraper's own thread, and only
+    status/progress/stats events go through the bus. ("error", message)
+    events are logged at ERROR level and passed on as well.
+    """
+
+    def __init__(self, events, logger=None):
+        self.events = events
+        self.logger = logger if logger is not None else logging.getLogger(LOGGER_NAME)
+
+    def post(self, kind, *args):
+        if kind == "log":
+            self.logger.info(args[0])
+            return
+        if kind == "error":
+            self.logger.error(args[0])
+        self.events.post(kind, *args)
@@ -0,0 +1,316 @@
+"""HTML parsing for SAFER snapshot, SMS registration and FMCSA Register pages."""
+from collections import namedtuple
+import re
+from urllib.parse import urlsplit
+
+import lxml.html
+from lxml import etree
+
+# Result of the SAFER snapshot step. `failure` holds the message written into
+# the email/phone fields when the carrier is not eligible, otherwise None.
+Snapshot = namedtuple("Snapshot", ["mc_number", "dot_number", "failure", "sms_url"])
+
+# US ZIP pattern (5 digits or 5-4 format)
+US_ZIP_PATTERN = re.compile(r'\d{5}(-\d{4})?$')
+# Canadian postal code pattern (A1A 1A1 or A1A1A1) - case insensitive
+CANADA_PATTERN = re.compile(r'[A-Za-z]\d[A-Za-z][\s-]?\d[A-Za-z]\d$', re.IGNORECASE)
+
+# Carrier snapshot table (center[1] of the result page); positions match the
+# original browser XPaths with the tbody steps removed.
+SNAPSHOT_TABLE = "(//tr[2]/td/center[1]/table)[1]"
+
+# Eligibility checks, evaluated in order: (selector, required text,
+# message when the cell is missing, message when the text is absent).
+SNAPSHOT_CHECKS = [
+    # STEP 2: CARRIER status
+    (etree.XPath(f"{SNAPSHOT_TABLE}/tr[3]/td"), "CARRIER",
+     "No SMS Link Found", "Not a CARRIER"),
+    # STEP 3: ACTIVE status
+    (etree.XPath(f"{SNAPSHOT_TABLE}/tr[4]/td[1]"), "ACTIVE",
+     "Status Check Failed", "Not ACTIVE"),
+    # STEP 4: AUTHORIZED FOR Property status
+    (etree.XPath(f"{SNAPSHOT_TABLE}/tr[8]/td"), "AUTHORIZED FOR Property",
+     "Authorization Check Failed", "Not AUTHORIZED FOR Property"),
+    # STEP 5: "X" in the General Freight cargo cell
+    (etree.XPath(f"{SNAPSHOT_TABLE}/tr[24]/td/table/tr[2]/td[1]/table/tr[2]/td[1]"), "X",
+     "X Check Failed", "Not General Freight"),
+]
+
+DOT_NUMBER = etree.XPath("//th[contains(., 'USDOT Number')]/following-sibling::td[1]")
+PHYSICAL_ADDRESS = etree.XPath("//*[@id='physicaladdressvalue']")
+SMS_LINK = etree.XPath("//a[contains(@href, 'safer_xfr')]/@href")
+REGISTRATION_LINK = etree.XPath("//article/div[2]/div[2]/section/a[1]/@href")
+
+# Registration details of a carrier on the SMS site, addressed by USDOT number
+SMS_REGISTRATION_PATH = "/SMS/Carrier/{dot}/CarrierRegistration.aspx"
+
+COMPANY_NAME = etree.XPath("//*[@id='regBox']/ul[1]/li[1]/span")
+ADDRESS = etree.XPath("//*[@id='regBox']/ul[1]/li[4]")
+PHONE = etree.XPath("//*[@id='regBox']/ul[1]/li[5]/span")
+EMAIL_CANDIDATES = [etree.XPath(xpath) for xpath in [
+    "//a[contains(@href, 'mailto:')]",
+    "//div[contains(@class, 'email')]",
+    "//span[contains(@class, 'email')]",
+    "//td[contains(., '@')]",
+    "//*[contains(., '@') and string-length(.) < 50]"
+]]
+
+# FMCSA Register HTML Detail: the decisions table and the docket number in
+# the header cell of each of its rows, e.g. "MC-1234567"
+REGISTER_TABLE_XPATH = "/html/body/font/table[8]"
+REGISTER_ROWS = etree.XPath("./tr[position()>1]")
+REGISTER_NUMBER = re.compile(r'\d{5,}')
+
+# Register page form: where it posts, the decision date <select> and its
+# options (`selected` is the one the page preselects), the hidden fields and
+# the (name, value) of the "HTML Detail" button
+RegisterForm = namedtuple("RegisterForm", ["action", "date_field", "dates", "selected", "fields", "submit"])
+REGISTER_FORM = etree.XPath("//form[.//select]")
+
+
+def parse_html(html):
+    """Parse a page and drop the <tbody> wrappers browsers insert.
+
+    The XPaths below are written against the browser DOM minus tbody, so the
+    same expressions work for page_source and for raw HTTP responses.
+    """
+    doc = lxml.html.fromstring(html)
+    for tbody in list(doc.iter("tbody")):
+        tbody.drop_tag()
+    return doc
+
+
+def element_text(element):
+    """Return the visible text of an element, keeping <br> as line breaks."""
+    parts = []
+
+    def collect(node):
+        if node.tag == "br":
+            parts.append("\n")
+        elif isinstance(node.tag, str) and node.text:
+            parts.append(node.text)
+        for child in node:
+            collect(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    collect(element)
+    lines = [" ".join(line.split()) for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def first_text(doc, selector):
+    """Text of the first node matching a compiled selector, or None if nothing matches."""
+    found = selector(doc)
+    if not found:
+        return None
+    return element_text(found[0])
+
+
+def failure_result(message):
+    return {
+        "company_name": "Not Available",
+        "address": "Not Available",
+        "email": message,
+        "phone": message
+    }
+
+
+def error_result(exc):
+    error_msg = f"Error: {str(exc)}"
+    return {
+        "company_name": error_msg,
+        "address": error_msg,
+        "email": error_msg,
+        "phone": error_msg
+    }
+
+
+def check_address(address_text):
+    """Return the failure message for an ineligible physical address, or None."""
+    # Normalize address - replace non-breaking spaces and trim
+    address_text = address_text.replace(u'\xa0', ' ').strip()
+
+    # Extract last part (postal code area)
+    last_part = address_text.split(',')[-1].strip()
+
+    # Fail if Canadian pattern is detected
+    if CANADA_PATTERN.search(last_part):
+        return "Canadian Address Not Allowed"
+
+    if not US_ZIP_PATTERN.search(last_part) and not re.search(r'\d', last_part):
+        return "Address without Valid Postal Code"
+    return None
+
+
+def evaluate_snapshot(mc_number, doc):
+    """Run the eligibility checks (steps 2-5.5) against a parsed snapshot page."""
+    dot_match = re.search(r'\d+', first_text(doc, DOT_NUMBER) or "")
+    dot_number = dot_match.group(0) if dot_match else None
+
+    def fail(message):
+        return Snapshot(mc_number, dot_number, message, None)
+
+    for selector, required, missing_message, failed_message in SNAPSHOT_CHECKS:
+        text = first_text(doc, selector)
+        if text is None:
+            return fail(missing_message)
+        if required not in text:
+            return fail(failed_message)
+
+    # STEP 5.5: Check for valid postal code pattern in address
+    address_text = first_text(doc, PHYSICAL_ADDRESS)
+    if address_text is None:
+        return fail("Address Not Found")
+    message = check_address(address_text)
+    if message:
+        return fail(message)
+
+    # STEP 6: Locate the SMS Results link
+    links = SMS_LINK(doc)
+    if not links:
+        return fail("No SMS Link Found")
+    return Snapshot(mc_number, dot_number, None, links[0])
+
+
+def find_registration_link(doc):
+    """The "additional link" on the SMS overview page, if present."""
+    links = REGISTRATION_LINK(doc)
+    return links[0] if links else None
+
+
+def registration_url(snapshot):
+    """Direct URL of the SMS registration page for an eligible snapshot.
+
+    Built from the DOT number on the host the snapshot's (absolute) SMS link
+    points at, so the overview page and its "additional link" are skipped.
+    None when the snapshot has no DOT number.
+    """
+    if not snapshot.dot_number or not snapshot.sms_url:
+        return None
+    parts = urlsplit(snapshot.sms_url)
+    return f"{parts.scheme}://{parts.netloc}" + SMS_REGISTRATION_PATH.format(dot=snapshot.dot_number)
+
+
+def extract_registration(doc):
+    """Company name, address, email and phone from an SMS registration page."""
+    company_name = first_text(doc, COMPANY_NAME)
+
+    address = first_text(doc, ADDRESS)
+    # Remove "Address:" prefix if it exists
+    if address and address.startswith("Address:"):
+        address = address[8:].strip()
+
+    email = None
+    for selector in EMAIL_CANDIDATES:
+        text = first_text(doc, selector)
+        if text and "@" in text:
+            email = text
+            break
+
+    phone = first_text(doc, PHONE) or ""
+    phone = re.sub(r'[^\d()\- ]', '', phone).strip()
+
+    return {
+        "company_name": company_name or "Company Name Not Found",
+        "address": address or "Address Not Found",
+        "email": email or "Email Not Found",
+        "phone": phone or "Phone Not Found"
+    }
+
+
+def empty_registration(result):
+    """True when none of the fields was found, i.e. the page was not a registration page or did not render."""
+    return all(value.endswith("Not Found") for value in result.values())
+
+
+def parse_register_table(table_html):
+    """(header text, number or None) for each data row of the register table's HTML.
+
+    `table_html` is the table's outerHTML (or the table cut from the page
+    source); the whole table is parsed at once instead of row by row
+    through the driver. Rows without a header cell give (None, None).
+    """
+    return [register_row(row) for row in REGISTER_ROWS(parse_html(table_html))]
+
+
+def parse_register_form(doc):
+    """RegisterForm of the register page's decision date form, or None if the page has none."""
+    forms = REGISTER_FORM(doc)
+    if not forms:
+        return None
+    form = forms[0]
+    select = form.find(".//select")
+    options = select.findall(".//option")
+    dates = tuple(option.get("value") or option.text_content().strip() for option in options)
+    selected = next((date for option, date in zip(options, dates) if option.get("selected") is not None),
+                    dates[0] if dates else None)
+    inputs = [(field, (field.get("type") or "").lower()) for field in form.findall(".//input")]
+    fields = {field.get("name"): field.get("value", "")
+              for field, kind in inputs if kind == "hidden" and field.get("name")}
+    submit = next(((field.get("name"), field.get("value")) for field, kind in inputs
+                   if kind == "submit" and "Detail" in (field.get("value") or "")),
+                  ("pv_choice", "HTML Detail"))
+    return RegisterForm(form.get("action"), select.get("name"), dates, selected, fields, submit)
+
+
+def register_row(row):
+    th = row.find("th")
+    if th is None:
+        return None, None
+    text = "".join(th.itertext()).strip()
+    match = REGISTER_NUMBER.search(text)
+    return text, match.group(0) if match else None
+
+
+class RegisterDetailParser:
+    """Incremental parser for the register's HTML Detail page.
+
+    feed() takes the response a chunk at a time and returns the rows of the
+    register table (REGISTER_TABLE_XPATH) completed so far, as
+    parse_register_table() would. Finished rows are dropped from the tree,
+    so memory stays flat however long the register is.
+    """
+
+    def __init__(self):
+        self.parser = etree.HTMLPullParser(events=("start", "end"), tag=("table", "tr"))
+        self.table = None
+        self.tables = 0
+        self.header_skipped = False
+
+    def feed(self, data):
+        self.parser.feed(data)
+        return self.collect()
+
+    def close(self):
+        self.parser.close()
+        return self.collect()
+
+    def collect(self):
+        rows = []
+        for event, element in self.parser.read_events():
+            if event == "start":
+                # The register table is the 8th table directly under <body><font>
+                if element.tag == "table" and self.table is None:
+                    parent = element.getparent()
+                    if (parent is not None and parent.tag == "font"
+                            and parent.getparent() is not None and parent.getparent().tag == "body"):
+                        self.tables += 1
+                        if self.tables == 8:
+                            self.table = element
+                continue
+            if element.tag != "tr" or self.table is None:
+                continue
+            parent = element.getparent()
+            if parent is not self.table and (parent is None or parent.getparent() is not self.table):
+                continue
+
+            if not self.header_skipped:
+                self.header_skipped = True
+            else:
+                rows.append(register_row(element))
+            # Free the finished row and the ones before it
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+        return rows
@@ -0,0 +1,147 @@
+"""Stages connected by bounded queues, so a slow step holds back the ones before it instead of piling up."""
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class Stage:
+    """One step of a Pipeline: `handler(item)` run on `workers` threads.
+
+    The handler returns the item for the next stage, or None to drop it.
+    The stage reads from a queue of at most `capacity` items; when that is
+    full the step before it waits (backpressure). `blocked` sums the seconds
+    spent waiting for room, so a summary shows which stage holds the run back.
+    `idle()`, if given, is called whenever the queue stays empty for
+    `idle_interval` seconds, e.g. to flush buffered output while lookups stall.
+    """
+
+    def __init__(self, name, handler, workers=1, capacity=256, idle=None, idle_interval=1.0):
+        self.name = name
+        self.handler = handler
+        self.idle = idle
+        self.idle_interval = idle_interval
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=max(1, capacity))
+        self.processed = 0
+        self.blocked = 0.0
+        self.peak = 0
+        self.running = 0
+        self.lock = threading.Lock()
+
+
+class Pipeline:
+    """Feed items through `stages` in order, each stage on its own threads.
+
+    run() pulls `items` on a feeder thread (for an extraction that is the
+    fetch workers' output) and returns once every stage has drained. If a
+    handler raises, `on_error` is called once, the remaining items are
+    drained without being handled, and run() re-raises the error.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.error = None
+        self.on_error = None
+        self.lock = threading.Lock()
+
+    def run(self, items, on_error=None):
+        self.error = None
+        self.on_error = on_error
+        threads = [threading.Thread(target=self.feed, args=(items,), name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            stage.running = stage.workers
+            threads.extend(
+                threading.Thread(target=self.work, args=(index,), name=f"pipeline-{stage.name}", daemon=True)
+                for _ in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def fail(self, exc):
+        with self.lock:
+            if self.error is not None:
+                return
+            self.error = exc
+        if self.on_error is not None:
+            self.on_error()
+
+    def put(self, stage, item):
+        try:
+            stage.queue.put_nowait(item)
+        except queue.Full:
+            start = time.monotonic()
+            stage.queue.put(item)
+            with stage.lock:
+                stage.blocked += time.monotonic() - start
+        depth = stage.queue.qsize()
+        if depth > stage.peak:
+            stage.peak = depth
+
+    def finish(self, index):
+        """Tell the stage after `index` (-1 for the feeder) that no more items are coming."""
+        if index + 1 < len(self.stages):
+            following = self.stages[index + 1]
+            for _ in range(following.workers):
+                self.put(following, _DONE)
+
+    def feed(self, items):
+        first = self.stages[0]
+        try:
+            for item in items:
+                self.put(first, item)
+        except Exception as e:
+            self.fail(e)
+        finally:
+            self.finish(-1)
+
+    def work(self, index):
+        stage = self.stages[index]
+        following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            try:
+                item = stage.queue.get(timeout=stage.idle_interval if stage.idle else None)
+            except queue.Empty:
+                if self.error is None:
+                    try:
+                        stage.idle()
+                    except Exception as e:
+                        self.fail(e)
+                continue
+            if item is _DONE:
+                break
+            # After a failure items are only drained, so nothing upstream stays blocked
+            if self.error is not None:
+                continue
+            try:
+                item = stage.handler(item)
+            except Exception as e:
+                self.fail(e)
+                continue
+            with stage.lock:
+                stage.processed += 1
+            if item is not None and following is not None:
+                self.put(following, item)
+
+        with stage.lock:
+            stage.running -= 1
+            last = stage.running == 0
+        if last:
+            self.finish(index)
+
+    def summary(self):
+        """{stage: {"workers", "processed", "peak_queue", "blocked_s"}}."""
+        return {
+            stage.name: {
+                "workers": stage.workers,
+                "processed": stage.processed,
+                "peak_queue": stage.peak,
+                "blocked_s": round(stage.blocked, 3),
+            }
+            for stage in self.stages
+        }
@@ -0,0 +1,105 @@
+"""Pool of independent backend workers fed from a shared work source."""
+import queue
+import threading
+
+_DONE = object()
+
+
+class WorkerPool:
+    """Run backend lookups on `workers` threads, each with its own backend.
+
+    Every worker creates its backend through `backend_factory` (so with the
+    browser engine each worker owns a separate Chrome session), takes the
+    next MC number from a shared iterator and posts (mc_number, result)
+    pairs back. Numbers are only drawn as workers free up, so a streaming
+    source is never read ahead. At most `capacity` results wait for the
+    consumer; beyond that the workers block until it catches up.
+    `run()` yields those pairs on the calling thread, which keeps the CSV
+    writer and GUI updates on a single consumer.
+    """
+
+    def __init__(self, backend_factory, workers=1, capacity=256):
+        self.backend_factory = backend_factory
+        self.workers = max(1, int(workers))
+        self.capacity = capacity
+        self.stop_event = threading.Event()
+        self.backends = []
+        self.errors = []
+        self.lock = threading.Lock()
+        self.work_lock = threading.Lock()
+        self.exhausted = False
+
+    def run(self, mc_numbers):
+        work = iter(mc_numbers)
+        self.exhausted = False
+        results = queue.Queue(maxsize=max(self.workers, self.capacity))
+
+        count = len(mc_numbers) if hasattr(mc_numbers, "__len__") else self.workers
+        # Nothing pending (e.g. resuming a finished run): no backend, so no Chrome, is started
+        if count == 0:
+            self.exhausted = True
+            return
+        threads = [
+            threading.Thread(target=self.worker, args=(work, results), daemon=True)
+            for _ in range(min(self.workers, count))
+        ]
+        for thread in threads:
+            thread.start()
+
+        running = len(threads)
+        while running:
+            item = results.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            yield item
+
+        # Surface start-up failures only if no worker could make progress
+        if self.errors and not self.exhausted and not self.stop_event.is_set():
+            raise self.errors[0]
+
+    def take(self, work):
+        """Next MC number from the shared iterator, or None once it is exhausted."""
+        with self.work_lock:
+            if self.exhausted:
+                return None
+            mc = next(work, None)
+            if mc is None:
+                self.exhausted = True
+            return mc
+
+    def worker(self, work, results):
+        backend = None
+        try:
+            backend = self.backend_factory()
+            with self.lock:
+                self.backends.append(backend)
+
+            while not self.stop_event.is_set():
+                mc = self.take(work)
+                if mc is None:
+                    break
+                results.put((mc, backend.lookup(mc)))
+        except Exception as e:
+            with self.lock:
+                self.errors.append(e)
+        finally:
+            if backend is not None:
+                with self.lock:
+                    if backend in self.backends:
+                        self.backends.remove(backend)
+                backend.close()
+            results.put(_DONE)
+
+    def stop(self):
+        """Let workers finish their current lookup and exit."""
+        self.stop_event.set()
+
+    def close(self):
+        """Stop the pool and shut down any backend still alive."""
+        self.stop()
+        with self.lock:
+            backends = list(self.backends)
+            self.backends.clear()
+        for backend in backends:
+            backend.close()
@@ -0,0 +1,219 @@
+"""FMCSA Register scraping: MC numbers from the register's HTML Detail table.
+
+Progress is posted to an EventBus-like `events` object:
+
+    ("log", message)
+    ("status", text)
+    ("progress", value, maximum)
+    ("stats", processed, found, elapsed_seconds)
+    ("numbers", batch_of_found_numbers)
+"""
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+from mc_extractor.browser import lean_profile, block_resources, capture_failure
+from mc_extractor.captures import FailureCapture, DEFAULT_CAPTURE_DIR
+from mc_extractor.parsing import parse_register_table, REGISTER_TABLE_XPATH
+from mc_extractor.register_http import LI_URL, ROW_BATCH, save_numbers
+from mc_extractor.tracing import NULL_TRACER
+
+LI_MAIN_URL = f"{LI_URL}/LIVIEW/pkg_html.prc_limain"
+
+
+class RegisterScraper:
+    """Pull the current FMCSA Register through headless Chrome and save its MC numbers.
+
+    register_http.HttpRegisterScraper does the same without a browser.
+    """
+
+    def __init__(self, output_path="extracted_numbers.csv", timeout=20, events=None, url=LI_MAIN_URL,
+                 lean=True, tracer=None, capture_dir=DEFAULT_CAPTURE_DIR, capture_max_bytes=50 * 1024 * 1024):
+        self.output_path = output_path
+        self.capture_dir = capture_dir
+        self.capture_max_bytes = capture_max_bytes
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.url = url
+        self.lean = lean
+        self.timeout = timeout
+        self.events = events
+        self.driver = None
+        self.stop_requested = False
+        self.numbers = []
+
+    def post(self, kind, *args):
+        if self.events is not None:
+            self.events.post(kind, *args)
+
+    def log(self, message):
+        self.post("log", message)
+
+    def stop(self):
+        self.stop_requested = True
+
+    def run(self):
+        """Scrape the register; returns the extracted numbers (also saved to output_path)."""
+        start_time = time.time()
+        processed_count = 0
+        found_count = 0
+        self.numbers = numbers = []
+
+        try:
+            # Configure headless browser
+            self.log("Starting headless browser...")
+            self.post("status", "Initializing browser...")
+
+            chrome_options = Options()
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--no-sandbox")
+            if self.lean:
+                lean_profile(chrome_options)
+
+            with self.tracer.span("register.browser_start"):
+                self.driver = webdriver.Chrome(options=chrome_options)
+                if self.lean:
+                    block_resources(self.driver)
+
+            self.log("Navigating to FMCSA website...")
+            self.post("status", "Loading page...")
+            with self.tracer.span("register.main_page"):
+                self.driver.get(self.url)
+            self.log("Page loaded successfully")
+
+            # Wait for and select dropdown
+            self.log("Selecting 'FMCSA Register' option...")
+            self.post("status", "Selecting option...")
+            with self.tracer.span("register.menu"):
+                dropdown = WebDriverWait(self.driver, 15).until(
+                    EC.presence_of_element_located((By.ID, "menu"))
+                )
+            Select(dropdown).select_by_value("FED_REG")
+            self.log('Selected "FMCSA Register" option')
+
+            # Click first submit button
+            self.log("Clicking first submit button...")
+            self.post("status", "Processing step 1/3...")
+            button1_xpath = "/html/body/font/table[1]/tbody/tr/td/div/div/table/tbody/tr/td/form/input[1]"
+            with self.tracer.span("register.submit"):
+                submit_button = WebDriverWait(self.driver, 15).until(
+                    EC.element_to_be_clickable((By.XPATH, button1_xpath))
+                )
+            submit_button.click()
+            self.log("Clicked the first submit button")
+
+            # Wait for page load
+            time.sleep(2)
+
+            # Click HTML Detail button
+            self.log('Clicking "HTML Detail" button...')
+            self.post("status", "Processing step 2/3...")
+            html_detail_xpath = "/html/body/font/font/table/tbody/tr[2]/td[2]/form/input[3]"
+            with self.tracer.span("register.register_page"):
+                html_detail_button = WebDriverWait(self.driver, self.timeout).until(
+                    EC.element_to_be_clickable((By.XPATH, html_detail_xpath))
+                )
+            html_detail_button.click()
+            self.log('Clicked "HTML Detail" button')
+
+            # Wait for table to load
+            self.log("Waiting for data table to load...")
+            self.post("status", "Processing step 3/3...")
+            with self.tracer.span("register.detail_page"):
+                table = WebDriverWait(self.driver, self.timeout).until(
+                    EC.presence_of_element_located((By.XPATH, REGISTER_TABLE_XPATH))
+                )
+            self.log("Target table loaded")
+
+            # Pull the whole table in one call and parse it here rather than
+            # asking the driver for each row's header cell
+            with self.tracer.span("register.table_html"):
+                table_html = table.get_attribute("outerHTML")
+            with self.tracer.span("register.parse_table"):
+                rows = parse_register_table(table_html)
+            row_count = len(rows)
+            self.log(f"Found {row_count} rows in the table")
+            self.post("status", f"Processing {row_count} rows...")
+
+            # Extract numbers, reporting progress once per batch of rows
+            self.post("progress", 0, row_count)
+            self.log("Extracting numbers from table...")
+
+            for batch_start in range(0, row_count, ROW_BATCH):
+                if self.stop_requested:
+                    self.log("Process stopped by user")
+                    break
+
+                batch_end = min(batch_start + ROW_BATCH, row_count)
+                batch_found = 0
+                reported = len(numbers)
+                with self.tracer.span("register.rows", rows=batch_end - batch_start):
+                    for i in range(batch_start + 1, batch_end + 1):
+                        raw_text, extracted_number = rows[i - 1]
+                        if extracted_number:
+                            numbers.append(extracted_number)
+                            batch_found += 1
+                        elif raw_text is None:
+                            self.log(f"Error processing row {i}: no header cell")
+                        else:
+                            self.log(f"Row {i}: No number found in '{raw_text}'")
+
+                found_count += batch_found
+                processed_count = batch_end
+                self.log(f"Rows {batch_start + 1}-{batch_end}: extracted {batch_found} numbers")
+                self.post("numbers", numbers[reported:])
+                self.post("progress", batch_end, row_count)
+                self.post("stats", processed_count, found_count, time.time() - start_time)
+                self.post("status", f"Processed {batch_end}/{row_count} rows")
+
+            # Save to CSV
+            if numbers:
+                self.log(f"Saving {len(numbers)} numbers to CSV...")
+                self.post("status", "Saving results...")
+
+                save_numbers(self.output_path, numbers)
+
+                self.log(f"Saved results to {self.output_path}")
+                self.post("status", f"Completed! {len(numbers)} numbers saved")
+            else:
+                self.log("No numbers extracted - CSV file not created")
+                self.post("status", "Completed! No numbers found")
+
+        except WebDriverException as e:
+            self.log(f"Browser error: {str(e)}")
+            self.post("status", "Error occurred - check logs")
+            if "This site can't be reached" in str(e):
+                self.log("Possible network error or site unavailable")
+        except Exception as e:
+            self.log(f"An error occurred: {str(e)}")
+            self.post("status", "Error occurred - check logs")
+            # Save the page (and a screenshot) in the background
+            if self.driver and self.capture_dir:
+                captures = FailureCapture(self.capture_dir, max_bytes=self.capture_max_bytes, ring_size=1)
+                if capture_failure(self.driver, captures, "register", e):
+                    self.log(f"Page captured in {self.capture_dir}")
+                else:
+                    self.log("Could not capture the page")
+                captures.close()
+        finally:
+            # Clean up
+            self.log("Cleaning up...")
+            self.post("status", "Closing browser...")
+            try:
+                if self.driver:
+                    self.driver.quit()
+            except:
+                pass
+            self.driver = None
+            self.log("Browser closed")
+            self.post("stats", processed_count, found_count, time.time() - start_time)
+
+        return numbers
@@ -0,0 +1,229 @@
+"""FMCSA Register over plain HTTP: the browser's form posts sent directly, the detail page parsed as it streams in.
+
+Progress is posted like register.RegisterScraper does:
+
+    ("log", message)
+    ("status", text)
+    ("progress", bytes_received, content_length)
+    ("stats", processed, found, elapsed_seconds)
+    ("numbers", batch_of_found_numbers)
+"""
+import csv
+import time
+from urllib.parse import urljoin
+
+import requests
+
+from mc_extractor.backends import FetchError, USER_AGENT
+from mc_extractor.parsing import parse_html, parse_register_form, RegisterForm, RegisterDetailParser
+from mc_extractor.tracing import NULL_TRACER
+
+LI_URL = "https://li-public.fmcsa.dot.gov"
+
+# The main page's menu form, submitted with "FMCSA Register" selected
+MENU_PATH = "/LIVIEW/pkg_menu.prc_menu"
+
+# The register page's form as published; with a known date the detail page
+# is requested straight away, without loading the menu first. If that
+# answers with an error or a page without rows, the form is read from the menu.
+DETAIL_FORM = RegisterForm("/LIVIEW/pkg_html.prc_regdetail", "pd_date", (), None,
+                           {"pv_vpath": "LIVIEW"}, ("pv_choice", "HTML Detail"))
+
+# Rows handled between progress events
+ROW_BATCH = 500
+
+
+def save_numbers(path, numbers):
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['MC-Number'])
+        for number in numbers:
+            writer.writerow([number])
+
+
+class HttpRegisterFetcher:
+    """Submit the register forms over one keep-alive session.
+
+    register_form() posts the menu choice and returns the register page's
+    form (dates on offer, hidden fields). iter_rows() posts the HTML Detail
+    choice for a date and yields the table rows while the response is still
+    downloading; `form_discovered` tells whether it had to read the form
+    from the menu.
+    """
+
+    def __init__(self, base_url=LI_URL, timeout=20, tracer=None, chunk_size=1 << 16):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.chunk_size = chunk_size
+        self.received = 0
+        self.content_length = None
+        self.form_discovered = False
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    def post(self, url, data, stream=False):
+        try:
+            response = self.session.post(url, data=data, timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise FetchError(str(e), transient=True) from e
+        if response.status_code >= 400:
+            response.close()
+            raise FetchError(f"HTTP {response.status_code} for {url}", status=response.status_code,
+                             transient=response.status_code >= 500 or response.status_code == 429)
+        return response
+
+    def register_form(self):
+        with self.tracer.span("register.menu"):
+            response = self.post(f"{self.base_url}{MENU_PATH}", {"menu": "FED_REG"})
+        form = parse_register_form(parse_html(response.content))
+        if form is None or not form.dates:
+            raise FetchError(f"No register date form at {response.url}")
+        return form._replace(action=urljoin(response.url, form.action))
+
+    def iter_rows(self, date=None, form=None):
+        """Yield (header text, number or None) per register row for `date` (default: the latest)."""
+        self.form_discovered = False
+        if form is None and date is not None:
+            published = DETAIL_FORM._replace(action=f"{self.base_url}{DETAIL_FORM.action}")
+            rows = 0
+            try:
+                for row in self.detail_rows(published, date):
+                    rows += 1
+                    yield row
+            except FetchError as e:
+                # An error answer before any row: the published form may have moved
+                if rows or e.status is None:
+                    raise
+            if rows:
+                return
+        if form is None:
+            form = self.register_form()
+            self.form_discovered = True
+        yield from self.detail_rows(form, date or form.selected)
+
+    def detail_rows(self, form, date):
+        data = {**form.fields, form.date_field: date, form.submit[0]: form.submit[1]}
+
+        # The page is parsed while it downloads, so the span runs from the
+        # request to the last row. Rows are handed out as they are parsed; the
+        # caller's handling of them (a list append for the scrapers) is inside it too.
+        with self.tracer.span("register.detail_page"):
+            response = self.post(form.action, data, stream=True)
+            length = response.headers.get("Content-Length")
+            self.content_length = int(length) if length and length.isdigit() else None
+            self.received = 0
+
+            parser = RegisterDetailParser()
+            with response:
+                try:
+                    for chunk in response.iter_content(self.chunk_size):
+                        self.received += len(chunk)
+                        yield from parser.feed(chunk)
+                except requests.RequestException as e:
+                    raise FetchError(str(e), transient=True) from e
+            yield from parser.close()
+
+    def close(self):
+        self.session.close()
+
+
+class HttpRegisterScraper:
+    """Pull one FMCSA Register publication over HTTP and save its MC numbers.
+
+    Same interface and events as register.RegisterScraper, without Chrome.
+    """
+
+    def __init__(self, output_path="extracted_numbers.csv", timeout=20, events=None, base_url=LI_URL,
+                 date=None, tracer=None):
+        self.output_path = output_path
+        self.timeout = timeout
+        self.events = events
+        self.base_url = base_url
+        self.date = date
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.stop_requested = False
+        self.numbers = []
+
+    def post(self, kind, *args):
+        if self.events is not None:
+            self.events.post(kind, *args)
+
+    def log(self, message):
+        self.post("log", message)
+
+    def stop(self):
+        self.stop_requested = True
+
+    def run(self):
+        """Fetch the register; returns the extracted numbers (also saved to output_path)."""
+        start_time = time.time()
+        processed_count = 0
+        found_count = 0
+        self.numbers = numbers = []
+        fetcher = HttpRegisterFetcher(self.base_url, timeout=self.timeout, tracer=self.tracer)
+
+        try:
+            self.log("Requesting the FMCSA Register...")
+            self.post("status", "Requesting register...")
+            self.post("progress", 0, None)
+
+            batch_found = 0
+            reported = 0
+            for raw_text, extracted_number in fetcher.iter_rows(self.date):
+                if self.stop_requested:
+                    self.log("Process stopped by user")
+                    break
+
+                processed_count += 1
+                if extracted_number:
+                    numbers.append(extracted_number)
+                    batch_found += 1
+                elif raw_text is None:
+                    self.log(f"Error processing row {processed_count}: no header cell")
+                else:
+                    self.log(f"Row {processed_count}: No number found in '{raw_text}'")
+
+                if processed_count == 1 and fetcher.form_discovered:
+                    self.log("The published register form did not answer; used the form from the menu")
+
+                if processed_count % ROW_BATCH == 0:
+                    found_count += batch_found
+                    self.log(f"Rows {processed_count - ROW_BATCH + 1}-{processed_count}: "
+                             f"extracted {batch_found} numbers")
+                    batch_found = 0
+                    self.post("numbers", numbers[reported:])
+                    reported = len(numbers)
+                    if fetcher.content_length:
+                        self.post("progress", fetcher.received, fetcher.content_length)
+                    self.post("stats", processed_count, found_count, time.time() - start_time)
+                    self.post("status", f"Processed {processed_count} rows")
+            found_count += batch_found
+            self.post("numbers", numbers[reported:])
+            self.log(f"Received {processed_count} rows")
+            self.post("progress", processed_count, processed_count or None)
+
+            # Save to CSV
+            if numbers:
+                self.log(f"Saving {len(numbers)} numbers to CSV...")
+                self.post("status", "Saving results...")
+
+                save_numbers(self.output_path, numbers)
+
+                self.log(f"Saved results to {self.output_path}")
+                self.post("status", f"Completed! {len(numbers)} numbers saved")
+            else:
+                self.log("No numbers extracted - CSV file not created")
+                self.post("status", "Completed! No numbers found")
+
+        except FetchError as e:
+            self.log(f"Request error: {str(e)}")
+            self.post("status", "Error occurred - check logs")
+        except Exception as e:
+            self.log(f"An error occurred: {str(e)}")
+            self.post("status", "Error occurred - check logs")
+        finally:
+            fetcher.close()
+            self.post("stats", processed_count, found_count, time.time() - start_time)
+
+        return numbers
@@ -0,0 +1,56 @@
+"""Delta re-scans: re-queue part of a previous run and merge the new results into its output."""
+from collections import namedtuple
+import csv
+import os
+import time
+
+from mc_extractor.journal import RunJournal, journal_path_for
+
+# `row` is the record's CSV row as written (None for records only the journal
+# knows, i.e. "Failed"); `recorded_at` is the journal's unix time, if any
+PreviousRecord = namedtuple("PreviousRecord", ["status", "row", "recorded_at"])
+
+
+def load_previous(output_path):
+    """{mc_number: PreviousRecord} for a previous output CSV and its journal.
+
+    A re-scan appends the rows that changed, so a later row for an MC number
+    supersedes an earlier one. The journal supplies when each record was
+    looked up and the records that never reached the CSV.
+    """
+    records = {}
+    if os.path.exists(output_path):
+        with open(output_path, 'r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            for row in reader:
+                if len(row) != 6 or not row[0].isdigit():
+                    continue
+                records[int(row[0])] = PreviousRecord(row[5], tuple(row), None)
+
+    for mc, (status, recorded_at) in RunJournal(journal_path_for(output_path)).load().items():
+        record = records.get(mc)
+        if record is None:
+            records[mc] = PreviousRecord(status, None, recorded_at)
+        else:
+            records[mc] = record._replace(recorded_at=recorded_at)
+    return records
+
+
+def select_for_rescan(previous, statuses=(), older_than=None, now=None):
+    """MC numbers whose status is in `statuses` or that were looked up more than `older_than` seconds ago.
+
+    Records without a journal time count as old.
+    """
+    statuses = set(statuses)
+    cutoff = None if older_than is None else (now or time.time()) - older_than
+    return [
+        mc for mc, record in sorted(previous.items())
+        if record.status in statuses
+        or (cutoff is not None and (record.recorded_at is None or record.recorded_at < cutoff))
+    ]
+
+
+def result_from_row(row):
+    """Lookup-result dict for a saved CSV row, e.g. to show it next to re-scanned ones."""
+    return {"company_name": row[1], "address": row[2], "email": row[3], "phone": row[4]}
@@ -0,0 +1,70 @@
+"""Result rows of a run, kept outside the GUI toolkit and read back a page at a time."""
+from bisect import bisect_left, insort
+import threading
+
+RESULT_COLUMNS = ("MC Number", "Company Name", "Address", "Email", "Phone", "Status")
+
+
+def result_row(mc, result, status):
+    """Row tuple in RESULT_COLUMNS order (the address keeps its newlines)."""
+    return (mc, result["company_name"], result["address"], result["email"], result["phone"], status)
+
+
+class ResultStore:
+    """Rows keyed by MC number in arrival order, with a position index per status.
+
+    A view asks for `page(offset, limit, status)` and so only ever copies the
+    rows it shows; `count(status)` sizes its scrollbar. Adding an MC number
+    that is already stored replaces its row in place.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.positions = {}
+        self.by_status = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, mc, result, status):
+        row = result_row(mc, result, status)
+        with self.lock:
+            index = self.positions.get(mc)
+            if index is None:
+                self.positions[mc] = len(self.rows)
+                self.by_status.setdefault(status, []).append(len(self.rows))
+                self.rows.append(row)
+                return
+
+            old_status = self.rows[index][5]
+            if old_status != status:
+                old = self.by_status[old_status]
+                del old[bisect_left(old, index)]
+                insort(self.by_status.setdefault(status, []), index)
+            self.rows[index] = row
+
+    def get(self, mc):
+        with self.lock:
+            index = self.positions.get(mc)
+            return None if index is None else self.rows[index]
+
+    def count(self, status=None):
+        with self.lock:
+            if status is None:
+                return len(self.rows)
+            return len(self.by_status.get(status, ()))
+
+    def page(self, offset, limit, status=None):
+        """Up to `limit` rows starting at `offset`, optionally only those with `status`."""
+        with self.lock:
+            if status is None:
+                return self.rows[offset:offset + limit]
+            indexes = self.by_status.get(status, [])[offset:offset + limit]
+            return [self.rows[index] for index in indexes]
+
+    def clear(self):
+        with self.lock:
+            self.rows = []
+            self.positions = {}
+            self.by_status = {}
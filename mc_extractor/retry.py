@@ -0,0 +1,166 @@
+"""Retries with backoff and a shared circuit breaker for transient site failures."""
+from collections import deque
+import random
+import threading
+import time
+
+from mc_extractor.backends import SnapshotBackend
+
+
+def is_transient(exc):
+    """Whether an error is worth retrying: timeouts, dropped connections and 5xx/429 answers."""
+    return getattr(exc, "transient", False) or isinstance(exc, (TimeoutError, ConnectionError))
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base_delay * 2**n))."""
+
+    def __init__(self, attempts=3, base_delay=1.0, max_delay=30.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Pauses every worker while the site is failing.
+
+    Outcomes of site calls are kept for the last `window` calls. Once at
+    least `min_calls` are recorded and the share of transient failures
+    reaches `threshold`, the breaker opens: callers block in before_call()
+    for `cooldown` seconds. Then a single probe call goes through; if it
+    succeeds the breaker closes, otherwise it opens for another cooldown.
+
+    before_call() returns a ticket to hand back to record(). Tickets carry
+    the trip count they were issued under, so the outcome of a call admitted
+    before a trip is ignored: only the probe decides a half-open breaker,
+    and stale results never count towards the next window.
+
+    `on_change(state)` is called with "open", "half-open" or "closed" on
+    each transition. stop() releases every waiting worker.
+    """
+
+    def __init__(self, window=20, min_calls=10, threshold=0.5, cooldown=30.0, on_change=None):
+        self.window = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self.state = "closed"
+        self.reopen_at = 0.0
+        self.trips = 0
+        self.stopped = threading.Event()
+        self.condition = threading.Condition()
+
+    def set_state(self, state):
+        # Called with the condition held
+        self.state = state
+        self.condition.notify_all()
+        if self.on_change is not None:
+            self.on_change(state)
+
+    def before_call(self):
+        """Block while the breaker is open; let one probe through when the cooldown ends.
+
+        Returns the ticket for record().
+        """
+        with self.condition:
+            while not self.stopped.is_set():
+                if self.state == "closed":
+                    return self.trips
+                if self.state == "open":
+                    remaining = self.reopen_at - time.monotonic()
+                    if remaining <= 0:
+                        # Calls admitted since the trip are the probe alone
+                        self.set_state("half-open")
+                        return self.trips
+                    self.condition.wait(remaining)
+                else:
+                    # Another worker is probing
+                    self.condition.wait(1.0)
+            return self.trips
+
+    def record(self, ok, ticket=None):
+        """Record a call's outcome; `ticket` is what before_call() returned for it."""
+        with self.condition:
+            if ticket is not None and ticket != self.trips:
+                # Admitted before the last trip; the site has been re-tested since
+                return
+            if self.state == "open":
+                return
+            if self.state == "half-open":
+                if ok:
+                    self.window.clear()
+                    self.set_state("closed")
+                else:
+                    self.trip()
+                return
+            self.window.append(ok)
+            failures = self.window.count(False)
+            if (self.state == "closed" and len(self.window) >= self.min_calls
+                    and failures / len(self.window) >= self.threshold):
+                self.trip()
+
+    def trip(self):
+        self.trips += 1
+        self.reopen_at = time.monotonic() + self.cooldown
+        self.set_state("open")
+
+    def pause(self, seconds):
+        """Sleep for a backoff delay, returning early once stopped."""
+        self.stopped.wait(seconds)
+
+    def stop(self):
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+
+
+class RetryingBackend(SnapshotBackend):
+    """Retry each fetch stage of `backend` on transient errors, gated by a shared breaker.
+
+    Only transient failures count against the breaker; an ineligible carrier
+    or a parse problem is a successful call as far as the site is concerned.
+    """
+
+    def __init__(self, backend, policy, breaker):
+        self.backend = backend
+        self.policy = policy
+        self.breaker = breaker
+        self.tracer = backend.tracer
+        self.retries = 0
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    def call(self, fetch, *args):
+        for attempt in range(self.policy.attempts):
+            ticket = self.breaker.before_call()
+            try:
+                result = fetch(*args)
+            except Exception as e:
+                transient = is_transient(e)
+                self.breaker.record(not transient, ticket)
+                if not transient or attempt + 1 == self.policy.attempts or self.breaker.stopped.is_set():
+                    raise
+                self.retries += 1
+                with self.tracer.span("retry.backoff"):
+                    self.breaker.pause(self.policy.delay(attempt))
+            else:
+                self.breaker.record(True, ticket)
+                return result
+
+    def fetch_snapshot(self, mc_number):
+        return self.call(self.backend.fetch_snapshot, mc_number)
+
+    def fetch_registration(self, snapshot):
+        return self.call(self.backend.fetch_registration, snapshot)
+
+    def on_error(self, mc_number, exc):
+        self.backend.on_error(mc_number, exc)
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,77 @@
+"""Long-lived, buffered result sinks."""
+import csv
+import os
+import time
+
+CSV_HEADER = ["MC Number", "Company Name", "Address", "Email", "Phone", "Status"]
+
+
+class CsvSink:
+    """Keeps the output CSV open and writes rows in batches.
+
+    Rows are buffered and written once `batch_size` rows are pending or
+    `flush_interval` seconds have passed since the last flush. The time
+    check runs on each write() or maybe_flush() call, so a writer that can
+    go quiet should also call maybe_flush() while idle. Every
+    `checkpoint_interval` seconds (and on close) the file is fsync'd.
+    Followers (e.g. the run journal) are flushed/synced right after the
+    CSV, so they never claim a row the CSV does not have yet.
+    """
+
+    def __init__(self, path, header=CSV_HEADER, append=False, batch_size=200,
+                 flush_interval=2.0, checkpoint_interval=30.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.followers = []
+        self.buffer = []
+        self.rows_written = 0
+
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.file = open(path, mode='a' if append else 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        if write_header:
+            self.writer.writerow(header)
+
+        self.last_flush = self.last_checkpoint = time.monotonic()
+
+    def add_follower(self, follower):
+        """Register an object with flush() and sync() to run after each flush/checkpoint."""
+        self.followers.append(follower)
+
+    def write(self, row):
+        self.buffer.append(row)
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        """Apply the size/time flush policy; cheap to call after every record."""
+        now = time.monotonic()
+        if len(self.buffer) >= self.batch_size or now - self.last_flush >= self.flush_interval:
+            self.flush()
+            if now - self.last_checkpoint >= self.checkpoint_interval:
+                self.checkpoint()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+        self.file.flush()
+        for follower in self.followers:
+            follower.flush()
+        self.last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Flush and fsync the CSV, then the followers."""
+        self.flush()
+        os.fsync(self.file.fileno())
+        for follower in self.followers:
+            follower.sync()
+        self.last_checkpoint = time.monotonic()
+
+    def close(self):
+        if self.file:
+            self.checkpoint()
+            self.file.close()
+            self.file = None
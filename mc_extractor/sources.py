@@ -0,0 +1,158 @@
+"""Streaming sources of MC numbers: a run starts on the first number instead of after loading them all."""
+import mmap
+import os
+import re
+
+# One MC number per line, surrounded by optional blanks; other lines are skipped
+MC_LINE = re.compile(rb"^[ \t\f\v]*(\d+)[ \t\f\v\r]*$", re.MULTILINE)
+
+# Bytes of the mapping matched per findall() call, cut at a line break
+CHUNK_SIZE = 1 << 22
+
+
+class Bitmap:
+    """Set of non-negative integers stored one bit each.
+
+    MC numbers are dense below ~2 million, so this is a few hundred KB where
+    a set of ints would take tens of MB. Numbers at or past `limit` go to an
+    ordinary set instead of growing the bitmap.
+    """
+
+    def __init__(self, limit=1 << 27):
+        self.limit = limit
+        self.bits = bytearray()
+        self.overflow = set()
+
+    def add(self, number):
+        """Add a number; True if it was not in the set yet."""
+        if number >= self.limit:
+            if number in self.overflow:
+                return False
+            self.overflow.add(number)
+            return True
+        index, bit = number >> 3, 1 << (number & 7)
+        if index >= len(self.bits):
+            self.bits.extend(bytes(max(index + 1 - len(self.bits), len(self.bits))))
+        if self.bits[index] & bit:
+            return False
+        self.bits[index] |= bit
+        return True
+
+    def __contains__(self, number):
+        if number >= self.limit:
+            return number in self.overflow
+        index = number >> 3
+        return index < len(self.bits) and bool(self.bits[index] & (1 << (number & 7)))
+
+
+class RangeSource:
+    """The MC numbers start..end, inclusive."""
+
+    def __init__(self, start, end):
+        self.numbers = range(start, end + 1)
+
+    def __iter__(self):
+        return iter(self.numbers)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, mc):
+        return mc in self.numbers
+
+
+class ListSource:
+    """An in-memory sequence of MC numbers, e.g. the records picked for a re-scan."""
+
+    def __init__(self, numbers):
+        self.numbers = list(numbers)
+        self.members = None
+
+    def __iter__(self):
+        return iter(self.numbers)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, mc):
+        if self.members is None:
+            self.members = set(self.numbers)
+        return mc in self.members
+
+
+class BulkFileSource:
+    """Unique MC numbers of a text file with one number per line, read through mmap.
+
+    The file is never loaded as a whole: iteration scans the mapping and
+    yields each number the first time it appears. len() and `in` use one
+    counting pass that keeps a bitmap of the numbers, so the total is exact
+    without holding a list.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.total = None
+        self.members = None
+
+    def scan(self):
+        if os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start, size = 0, len(data)
+            while start < size:
+                end = data.find(b"\n", min(start + CHUNK_SIZE, size))
+                end = size if end == -1 else end + 1
+                yield from map(int, MC_LINE.findall(data, start, end))
+                start = end
+
+    def count(self):
+        if self.total is None:
+            members = Bitmap()
+            self.total = sum(map(members.add, self.scan()))
+            self.members = members
+        return self.total
+
+    def __iter__(self):
+        seen = Bitmap()
+        for mc in self.scan():
+            if seen.add(mc):
+                yield mc
+
+    def __len__(self):
+        return self.count()
+
+    def __contains__(self, mc):
+        self.count()
+        return mc in self.members
+
+
+class ExcludingSource:
+    """A source without the MC numbers in `excluded` (e.g. those a resumed run already did)."""
+
+    def __init__(self, source, excluded):
+        self.source = source
+        self.excluded = excluded
+        self.total = None
+
+    def __iter__(self):
+        return (mc for mc in self.source if mc not in self.excluded)
+
+    def __len__(self):
+        if self.total is None:
+            self.total = len(self.source) - sum(1 for mc in self.excluded if mc in self.source)
+        return self.total
+
+    def __contains__(self, mc):
+        return mc not in self.excluded and mc in self.source
+
+
+SOURCE_TYPES = (RangeSource, ListSource, BulkFileSource, ExcludingSource)
+
+
+def as_source(mc_numbers):
+    """Wrap MC numbers in a source; ranges stay lazy, other iterables are listed."""
+    if isinstance(mc_numbers, SOURCE_TYPES):
+        return mc_numbers
+    if isinstance(mc_numbers, range) and mc_numbers.step == 1:
+        return RangeSource(mc_numbers.start, mc_numbers.stop - 1)
+    return ListSource(mc_numbers)
@@ -0,0 +1,103 @@
+"""Per-step timeouts learned from the latencies observed during a run."""
+from collections import deque
+import threading
+import time
+
+# A failed wait that lasted at least this share of its timeout counts as timed out
+TIMED_OUT_SHARE = 0.9
+
+
+class AdaptiveTimeouts:
+    """Timeouts per named step, derived from a window of recent latencies.
+
+    Backends register their steps with `define({step: (default, floor, ceiling)})`.
+    Until a step has `min_samples` observations its default applies; after that
+    the timeout is `multiplier` times the `percentile` latency of the window,
+    clamped to [floor, ceiling]. Successful waits are observed, so a step
+    that usually answers in 300 ms gives up after about a second instead of
+    the fixed default. A wait cut off by its timeout is observed as taking
+    at least that timeout, so when latency rises above the learned value the
+    timeout grows back towards the ceiling instead of failing every call.
+    With `adaptive=False` the defaults are always used.
+
+    One instance is shared by all workers of a run.
+    """
+
+    def __init__(self, percentile=95, multiplier=3.0, window=256, min_samples=20, adaptive=True):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.window = window
+        self.min_samples = min_samples
+        self.adaptive = adaptive
+        self.limits = {}
+        self.samples = {}
+        self.cached = {}
+        self.lock = threading.Lock()
+
+    def define(self, limits):
+        with self.lock:
+            for step, limit in limits.items():
+                self.limits.setdefault(step, limit)
+                self.samples.setdefault(step, deque(maxlen=self.window))
+
+    def observe(self, step, seconds):
+        with self.lock:
+            self.samples[step].append(seconds)
+            self.cached.pop(step, None)
+
+    def latency(self, step, percentile):
+        """The `percentile` latency of the step's window, or None without samples."""
+        with self.lock:
+            return self.quantile(self.samples[step], percentile)
+
+    @staticmethod
+    def quantile(samples, percentile):
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def timeout(self, step):
+        with self.lock:
+            default, floor, ceiling = self.limits[step]
+            samples = self.samples[step]
+            if not self.adaptive or len(samples) < self.min_samples:
+                return default
+            value = self.cached.get(step)
+            if value is None:
+                learned = self.quantile(samples, self.percentile) * self.multiplier
+                value = self.cached[step] = max(floor, min(ceiling, learned))
+            return value
+
+    def timed(self, step, call, *args, **kwargs):
+        """Run call(timeout, *args, **kwargs) with the step's timeout and observe how long it took.
+
+        A call that fails after (about) the whole timeout is observed as
+        max(elapsed, timeout); failures that come back sooner, such as a
+        refused connection, say nothing about latency and are not observed.
+        """
+        timeout = self.timeout(step)
+        start = time.monotonic()
+        try:
+            result = call(timeout, *args, **kwargs)
+        except Exception:
+            elapsed = time.monotonic() - start
+            if elapsed >= timeout * TIMED_OUT_SHARE:
+                self.observe(step, max(elapsed, timeout))
+            raise
+        self.observe(step, time.monotonic() - start)
+        return result
+
+    def summary(self):
+        """{step: {"samples", "p50", "p95", "timeout"}} in seconds."""
+        steps = list(self.limits)
+        return {
+            step: {
+                "samples": len(self.samples[step]),
+                "p50": self.latency(step, 50),
+                "p95": self.latency(step, 95),
+                "timeout": self.timeout(step),
+            }
+            for step in steps
+        }
@@ -0,0 +1,177 @@
+"""Span timing for lookup and scraping steps, exported as JSON lines and Prometheus text."""
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC = "mc_extractor_span_seconds"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+
+    def observe(self, seconds, error=False):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if error:
+            self.errors += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (the last finite bound for the overflow)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class NullTracer:
+    """Tracer stand-in for backends used without instrumentation."""
+
+    def span(self, name, **attrs):
+        return nullcontext()
+
+    def context(self, **attrs):
+        return nullcontext()
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Times named spans into per-span histograms, optionally logging each span.
+
+    `span(name)` is a context manager; a span that raises is counted as an
+    error. Attributes set with `context(mc=...)` on a thread are attached to
+    every span that thread records inside it. With `jsonl_path` each span is
+    appended as one JSON object per line:
+
+        {"ts": 1718040000.12, "span": "http.snapshot", "ms": 84.2, "mc": 1706527}
+
+    With `metrics_path`, sync() and close() rewrite that file with the
+    histograms in Prometheus text format. flush()/sync() match the follower
+    protocol of sinks.CsvSink, so a run can export on its checkpoints.
+    """
+
+    def __init__(self, jsonl_path=None, metrics_path=None, buckets=DEFAULT_BUCKETS):
+        self.metrics_path = metrics_path
+        self.buckets = buckets
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.file = open(jsonl_path, "a", encoding="utf-8", buffering=1 << 16) if jsonl_path else None
+
+    @contextmanager
+    def context(self, **attrs):
+        previous = getattr(self.local, "attrs", {})
+        self.local.attrs = {**previous, **attrs}
+        try:
+            yield
+        finally:
+            self.local.attrs = previous
+
+    @contextmanager
+    def span(self, name, **attrs):
+        started = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, started, error, attrs)
+
+    def record(self, name, seconds, started, error=None, attrs=None):
+        line = None
+        if self.file is not None:
+            entry = {"ts": round(started, 3), "span": name, "ms": round(seconds * 1000, 2)}
+            entry.update(getattr(self.local, "attrs", {}))
+            if attrs:
+                entry.update(attrs)
+            if error:
+                entry["error"] = error
+            line = json.dumps(entry) + "\n"
+
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds, error is not None)
+            if line is not None:
+                self.file.write(line)
+
+    def summary(self):
+        """{span: {"count", "errors", "mean_ms", "p50_ms", "p95_ms"}}; percentiles are bucket bounds."""
+        with self.lock:
+            return {
+                name: {
+                    "count": h.count,
+                    "errors": h.errors,
+                    "mean_ms": round(h.sum / h.count * 1000, 2) if h.count else None,
+                    "p50_ms": h.quantile(0.5) * 1000 if h.count else None,
+                    "p95_ms": h.quantile(0.95) * 1000 if h.count else None,
+                }
+                for name, h in sorted(self.histograms.items())
+            }
+
+    def prometheus(self):
+        """The histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC} Duration of traced extractor steps.",
+            f"# TYPE {METRIC} histogram",
+        ]
+        errors = []
+        with self.lock:
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{METRIC}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC}_bucket{{span="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{METRIC}_sum{{span="{name}"}} {h.sum:.6f}')
+                lines.append(f'{METRIC}_count{{span="{name}"}} {h.count}')
+                errors.append(f'mc_extractor_span_errors_total{{span="{name}"}} {h.errors}')
+        lines.append("# HELP mc_extractor_span_errors_total Traced steps that raised.")
+        lines.append("# TYPE mc_extractor_span_errors_total counter")
+        return "\n".join(lines + errors) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the Prometheus text file atomically, as the node_exporter textfile collector expects."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus())
+        os.replace(temp_path, path)
+
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+
+    def sync(self):
+        self.flush()
+        if self.metrics_path:
+            self.write_prometheus(self.metrics_path)
+
+    def close(self):
+        self.sync()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    """The recorded SAFER/SMS/Register pages, served locally without the slow variant's delay."""
+    with FixtureServer(slow_delay=0, register_rows=50) as fixtures:
+        yield fixtures
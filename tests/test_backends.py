@@ -0,0 +1,97 @@
+import pytest
+
+from benchmarks.fixture_server import DOT_OFFSET, FixtureServer
+from mc_extractor.backends import FallbackBackend, FetchError, HttpSnapshotBackend, SnapshotBackend
+from mc_extractor.extractor import classify
+from mc_extractor.parsing import evaluate_snapshot, parse_html
+
+
+@pytest.fixture
+def backend(server):
+    backend = HttpSnapshotBackend(server.url, timeout=5)
+    yield backend
+    backend.close()
+
+
+def test_snapshot_checks_pass_for_an_eligible_carrier(server):
+    snapshot = evaluate_snapshot(1706521, parse_html(server.snapshot_page(1706521)))
+    assert snapshot.failure is None
+    assert snapshot.dot_number == str(1706521 + DOT_OFFSET)
+    assert "safer_xfr" in snapshot.sms_url
+
+
+@pytest.mark.parametrize("mc, failure", [
+    (1706525, "Not a CARRIER"),
+    (1706526, "Not ACTIVE"),
+    (1706527, "X Check Failed"),
+    (1706528, "Canadian Address Not Allowed"),
+])
+def test_snapshot_checks_reject_ineligible_carriers(server, mc, failure):
+    assert evaluate_snapshot(mc, parse_html(server.snapshot_page(mc))).failure == failure
+
+
+def test_lookup_reads_the_registration_page(backend):
+    result = backend.lookup(1706521)
+    assert result["company_name"] == "FIXTURE FREIGHT 1706521 LLC"
+    assert result["email"] == "dispatch1706521@example.com"
+    assert "DALLAS, TX" in result["address"]
+    assert classify(result) == "Success"
+
+
+def test_lookup_without_listed_email_is_partial(backend):
+    # Every fourth MC number has no email on its registration page
+    assert classify(backend.lookup(1706520)) == "Partial Success"
+
+
+def test_lookup_of_an_ineligible_carrier_fails(backend):
+    result = backend.lookup(1706525)
+    assert result["email"] == "Not a CARRIER"
+    assert classify(result) == "Failed"
+
+
+def test_registration_falls_back_to_the_overview_link():
+    # The direct CarrierRegistration.aspx URL answers 404; the overview links elsewhere
+    with FixtureServer(slow_delay=0, registration_page_name="CarrierRegistrationDetails.aspx") as moved:
+        backend = HttpSnapshotBackend(moved.url, timeout=5)
+        try:
+            result = backend.lookup(1706521)
+        finally:
+            backend.close()
+    assert result["company_name"] == "FIXTURE FREIGHT 1706521 LLC"
+    assert result["email"] == "dispatch1706521@example.com"
+    assert classify(result) == "Success"
+
+
+class FailingBackend(SnapshotBackend):
+    name = "failing"
+    tracer = None
+
+    def __init__(self, error):
+        self.error = error
+
+    def fetch_snapshot(self, mc_number):
+        raise self.error
+
+
+class RecordingBackend(SnapshotBackend):
+    name = "recording"
+
+    def __init__(self):
+        self.snapshots = []
+
+    def fetch_snapshot(self, mc_number):
+        self.snapshots.append(mc_number)
+        return "fallback snapshot"
+
+
+def test_fallback_takes_permanent_failures_only():
+    fallback = RecordingBackend()
+    backend = FallbackBackend(FailingBackend(FetchError("HTTP 404", status=404)), lambda: fallback)
+    assert backend.fetch_snapshot(1706521) == "fallback snapshot"
+    assert fallback.snapshots == [1706521]
+
+    for error in (FetchError("HTTP 503", status=503, transient=True), FetchError("timed out", transient=True)):
+        backend = FallbackBackend(FailingBackend(error), RecordingBackend)
+        with pytest.raises(FetchError):
+            backend.fetch_snapshot(1706521)
+        assert backend.fallback is None
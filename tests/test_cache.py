@@ -0,0 +1,116 @@
+from mc_extractor.cache import CachedBackend, LookupCache
+from mc_extractor.backends import SnapshotBackend
+from mc_extractor.parsing import Snapshot
+
+EMPTY = {"company_name": "Company Name Not Found", "address": "Address Not Found",
+         "email": "Email Not Found", "phone": "Phone Not Found"}
+FOUND = {"company_name": "FIXTURE FREIGHT LLC", "address": "100 MAIN ST DALLAS, TX 75001",
+         "email": "Email Not Found", "phone": "(214) 555-0100"}
+
+
+class StubBackend(SnapshotBackend):
+    name = "stub"
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def fetch_registration(self, snapshot):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def test_empty_registration_is_fetched_again(tmp_path):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"))
+    backend = StubBackend([EMPTY, FOUND])
+    cached = CachedBackend(backend, cache)
+    snapshot = Snapshot(1706521, "4706521", None, "http://sms/SMS/safer_xfr.aspx?DOT=4706521")
+
+    assert cached.fetch_registration(snapshot) == EMPTY
+    assert cached.fetch_registration(snapshot) == FOUND
+    assert cached.fetch_registration(snapshot) == FOUND
+    assert backend.calls == 2
+    cache.close()
+
+
+class CountingBackend(SnapshotBackend):
+    name = "counting"
+
+    def __init__(self):
+        self.snapshots = 0
+        self.registrations = 0
+
+    def fetch_snapshot(self, mc_number):
+        self.snapshots += 1
+        return Snapshot(mc_number, str(mc_number + 3000000), None, "http://sms/SMS/safer_xfr.aspx")
+
+    def fetch_registration(self, snapshot):
+        self.registrations += 1
+        return FOUND
+
+
+def test_refresh_bypasses_cached_lookups(tmp_path):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"))
+    CachedBackend(CountingBackend(), cache).process(1706521)
+
+    backend = CountingBackend()
+    cached = CachedBackend(backend, cache)
+    cached.process(1706521)
+    assert (backend.snapshots, backend.registrations) == (0, 0)
+
+    refreshing = CachedBackend(backend, cache, refresh=True)
+    refreshing.process(1706521)
+    refreshing.process(1706521)
+    assert (backend.snapshots, backend.registrations) == (2, 2)
+    cache.close()
+
+
+def test_rescan_lookups_refresh_the_cache(tmp_path, monkeypatch):
+    from mc_extractor.extractor import Extraction
+    from mc_extractor.rescan import PreviousRecord
+
+    monkeypatch.chdir(tmp_path)
+    previous = {1706521: PreviousRecord("Partial Success", None, None)}
+    extraction = Extraction([1706521], "mc_records.csv", engine="http", previous=previous, capture_dir=None)
+    try:
+        extraction.prepare()
+        backend = extraction.make_backend()
+        assert backend.refresh
+        backend.close()
+    finally:
+        extraction.close()
+
+
+def test_entries_only_hit_for_the_site_they_came_from(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    mirror = LookupCache(path, site="http://127.0.0.1:8000/")
+    CachedBackend(CountingBackend(), mirror).process(1706521)
+    mirror.close()
+
+    production = LookupCache(path, site="https://safer.fmcsa.dot.gov")
+    backend = CountingBackend()
+    CachedBackend(backend, production).process(1706521)
+    assert (backend.snapshots, backend.registrations) == (1, 1)
+    production.close()
+
+    production = LookupCache(path, site="https://safer.fmcsa.dot.gov/")
+    backend = CountingBackend()
+    CachedBackend(backend, production).process(1706521)
+    assert (backend.snapshots, backend.registrations) == (0, 0)
+    production.close()
+
+
+def test_cache_without_site_column_is_migrated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE snapshots (mc_number INTEGER PRIMARY KEY, dot_number TEXT, "
+                 "failure TEXT, sms_url TEXT, fetched_at REAL NOT NULL)")
+    conn.execute("INSERT INTO snapshots VALUES (1706521, '4706521', NULL, 'http://sms/', 9e12)")
+    conn.commit()
+    conn.close()
+
+    cache = LookupCache(path, site="https://safer.fmcsa.dot.gov")
+    assert cache.get_snapshot(1706521) is None
+    cache.close()
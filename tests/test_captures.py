@@ -0,0 +1,62 @@
+import gzip
+import os
+
+from mc_extractor.captures import FailureCapture
+
+
+def capture_files(directory):
+    return sorted(name for name in os.listdir(directory) if name != "notes.txt")
+
+
+def test_pages_are_written_gzipped_with_a_header(tmp_path):
+    captures = FailureCapture(str(tmp_path))
+    captures.capture("snapshot", "<html>page</html>", url="http://safer/query.asp", error="no table -- here")
+    captures.close()
+
+    [name] = capture_files(tmp_path)
+    assert name.endswith("-1-snapshot.html.gz")
+    text = gzip.decompress((tmp_path / name).read_bytes()).decode("utf-8")
+    header, page = text.split("\n", 1)
+    assert "url=http://safer/query.asp" in header and "error=no table - - here" in header
+    assert page == "<html>page</html>"
+
+
+def test_ring_drops_the_oldest_when_the_writer_falls_behind(tmp_path):
+    captures = FailureCapture(str(tmp_path), ring_size=3)
+    # Holding the condition keeps the writer from taking anything off the ring
+    with captures.condition:
+        for n in range(5):
+            captures.capture(f"page{n}", "<html></html>")
+    captures.close()
+
+    assert captures.dropped == 2
+    assert [name.split("-")[-1] for name in capture_files(tmp_path)] == \
+        ["page2.html.gz", "page3.html.gz", "page4.html.gz"]
+    captures.capture("late", "<html></html>")
+    assert len(capture_files(tmp_path)) == 3
+
+
+def test_disk_cap_removes_the_oldest_captures(tmp_path):
+    (tmp_path / "notes.txt").write_text("not a capture", encoding="utf-8")
+    old = tmp_path / "20240101-000000-1-old.png"
+    old.write_bytes(os.urandom(1000))
+    os.utime(old, (0, 0))
+
+    captures = FailureCapture(str(tmp_path), max_bytes=2500)
+    assert captures.disk_bytes == 1000
+    for n in range(4):
+        captures.capture(f"page{n}", "", screenshot=os.urandom(1000))
+    captures.close()
+
+    names = capture_files(tmp_path)
+    assert old.name not in names
+    assert (tmp_path / "notes.txt").exists()
+    assert sum((tmp_path / name).stat().st_size for name in names) <= 2500
+    assert any(name.endswith("-page3.png") for name in names)
+    assert captures.disk_bytes == sum((tmp_path / name).stat().st_size for name in names)
+
+
+def test_screenshots_are_sampled(tmp_path):
+    captures = FailureCapture(str(tmp_path), screenshot_every=3)
+    assert [captures.want_screenshot() for _ in range(7)] == [True, False, False, True, False, False, True]
+    captures.close()
@@ -0,0 +1,36 @@
+import pytest
+
+from mc_extractor.extractor import classify, STATUSES
+from mc_extractor.parsing import error_result, failure_result
+
+
+def result(email, phone):
+    return {"company_name": "FIXTURE FREIGHT LLC", "address": "100 MAIN ST", "email": email, "phone": phone}
+
+
+@pytest.mark.parametrize("email, phone, status", [
+    ("dispatch@example.com", "(214) 555-0100", "Success"),
+    ("dispatch@example.com", "Phone Not Found", "Partial Success"),
+    ("Email Not Found", "(214) 555-0100", "Partial Success"),
+    ("Email Not Found", "Phone Not Found", "Manual Check"),
+])
+def test_contact_info_decides_status(email, phone, status):
+    assert classify(result(email, phone)) == status
+
+
+@pytest.mark.parametrize("message", [
+    "Not a CARRIER", "Not ACTIVE", "Not AUTHORIZED FOR Property", "Not General Freight",
+    "X Check Failed", "No SMS Link Found", "Address without Valid Postal Code", "Canadian Address Not Allowed",
+])
+def test_ineligible_carriers_fail(message):
+    assert classify(failure_result(message)) == "Failed"
+
+
+def test_lookup_errors_are_errors():
+    assert classify(error_result(TimeoutError("timed out"))) == "Error"
+
+
+def test_every_status_is_known():
+    samples = [result("a@b.c", "1"), result("a@b.c", "Phone Not Found"), result("Email Not Found", "Phone Not Found"),
+               failure_result("Not ACTIVE"), error_result(ValueError("x"))]
+    assert {classify(sample) for sample in samples} == set(STATUSES)
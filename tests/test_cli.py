@@ -0,0 +1,23 @@
+import _thread
+import csv
+import threading
+
+from benchmarks.fixture_server import FixtureServer
+from mc_extractor import cli
+from mc_extractor.journal import RunJournal, journal_path_for
+
+
+def test_ctrl_c_lets_the_lookups_in_flight_finish(tmp_path):
+    output = tmp_path / "mc_records.csv"
+    with FixtureServer(slow_delay=0, latency=0.02) as server:
+        threading.Timer(0.5, _thread.interrupt_main).start()
+        assert cli.main(["-q", "snapshot", "--range", "1706520", "1706919", "--engine", "http",
+                         "--workers", "2", "--no-cache", "--safer-url", server.url,
+                         "-o", str(output), "--capture-dir", str(tmp_path / "captures")]) == 0
+
+    # Stopped part way, with the CSV and the journal closed in step
+    journaled = RunJournal(journal_path_for(str(output))).load()
+    assert 0 < len(journaled) < 400
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))[1:]
+    assert {int(row[0]) for row in rows} == {mc for mc, (status, _) in journaled.items() if status != "Failed"}
@@ -0,0 +1,34 @@
+from mc_extractor.dashboard import DashboardStats
+from mc_extractor.tracing import Tracer
+
+
+def test_counts_and_first_digits():
+    dashboard = DashboardStats(labels=("New", "Already seen"))
+    dashboard.post("numbers", ["1500000", "1500001", "2100000"])
+    dashboard.post("numbers", [])
+    dashboard.post("numbers", ["999999"])
+    dashboard.post("stats", 10, 4, 2.5)
+    dashboard.post("status", "ignored")
+
+    assert dashboard.digits == [0, 2, 1, 0, 0, 0, 0, 0, 0, 1]
+    assert dashboard.statuses() == {"New": 4, "Already seen": 6}
+    assert (dashboard.processed, dashboard.elapsed) == (10, 2.5)
+
+
+def test_rate_over_the_window_falls_to_zero_when_idle():
+    dashboard = DashboardStats(window=10.0, history=3)
+    assert dashboard.tick(now=100.0) == 0.0
+    dashboard.post("stats", 500, 400, 5.0)
+    assert dashboard.tick(now=105.0) == 100.0
+    dashboard.post("stats", 1500, 1200, 10.0)
+    assert dashboard.tick(now=110.0) == 150.0
+    # Samples older than the window drop out; with no new rows the rate falls
+    assert dashboard.tick(now=120.0) == 0.0
+    assert len(dashboard.rates) == 3
+
+
+def test_latencies_come_from_the_tracer():
+    assert DashboardStats().latencies() == {}
+    tracer = Tracer()
+    tracer.record("register.menu", 0.2, 0)
+    assert DashboardStats(tracer=tracer).latencies()["register.menu"]["count"] == 1
@@ -0,0 +1,77 @@
+import csv
+
+import pytest
+
+from mc_extractor.database import ResultDatabase, address_state
+from mc_extractor.sinks import CSV_HEADER
+
+ROWS = [
+    (1706520, "ALPHA LLC", "1 MAIN ST DALLAS, TX 75001", "a@example.com", "(214) 555-0100", "Success"),
+    (1706521, "BRAVO INC", "2 ELM ST RENO, NV 89501-1234", "Email Not Found", "(775) 555-0101", "Partial Success"),
+    (1706522, "CHARLIE CO", "Address Not Found", "Email Not Found", "Phone Not Found", "Manual Check"),
+    (1706523, "DELTA LLC", "4 OAK ST AUSTIN, TX 73301", "d@example.com", "(512) 555-0103", "Success"),
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = ResultDatabase(str(tmp_path / "results.sqlite3"), batch_size=3)
+    for row in ROWS:
+        database.upsert(*row)
+    yield database
+    database.close()
+
+
+def test_address_state():
+    assert address_state("1 MAIN ST DALLAS, TX 75001") == "TX"
+    assert address_state("2 ELM ST RENO, NV 89501-1234") == "NV"
+    assert address_state("Address Not Found") is None
+    assert address_state(None) is None
+
+
+def test_upsert_buffers_until_the_batch_is_full(database):
+    # Three rows went out with the full batch; the fourth is still pending
+    assert len(database.pending) == 1
+    assert database.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 3
+    database.flush()
+    assert database.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 4
+
+
+def test_upsert_replaces_the_row(database):
+    database.upsert(1706522, "CHARLIE CO", "3 PINE ST OMAHA, NE 68102", "c@example.com", "(402) 555-0102", "Success")
+    assert database.get(1706522) == (1706522, "CHARLIE CO", "3 PINE ST OMAHA, NE 68102", "c@example.com",
+                                     "(402) 555-0102", "Success")
+    assert database.count() == 4
+    assert database.count(status="Success") == 3
+    assert database.count(state="NE") == 1
+    assert database.count(status="Manual Check") == 0
+
+
+def test_export_csv_filters_by_status_and_state(database, tmp_path):
+    path = tmp_path / "texas.csv"
+    assert database.export_csv(str(path), statuses=["Success", "Manual Check"], states=["TX"]) == 2
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == CSV_HEADER
+    assert [row[0] for row in rows[1:]] == ["1706520", "1706523"]
+
+    assert [row[0] for row in database.rows(chunk_size=1)] == [1706520, 1706521, 1706522, 1706523]
+
+
+def test_import_csv_keeps_the_last_row(tmp_path):
+    path = tmp_path / "mc_records.csv"
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(ROWS)
+        writer.writerow(["1706520", "ALPHA LLC", "1 MAIN ST DALLAS, TX 75001", "a@example.com", "(214) 555-0100",
+                         "Partial Success"])
+        writer.writerow(["not a number", "", "", "", "", ""])
+
+    database = ResultDatabase(str(tmp_path / "results.sqlite3"))
+    try:
+        assert database.import_csv(str(path)) == 5
+        assert database.count() == 4
+        assert database.get(1706520)[5] == "Partial Success"
+    finally:
+        database.close()
@@ -0,0 +1,52 @@
+import threading
+
+from mc_extractor.events import EventBus
+
+
+def test_drain_keeps_order_and_the_last_coalesced_event():
+    bus = EventBus(coalesce=("status", "progress"))
+    bus.post("status", "starting")
+    bus.post("result", 1)
+    bus.post("progress", 1, 3)
+    bus.post("result", 2)
+    bus.post("status", "halfway")
+    bus.post("progress", 2, 3)
+    bus.post("log", "line")
+
+    assert bus.drain() == [
+        ("result", (1,)),
+        ("result", (2,)),
+        ("status", ("halfway",)),
+        ("progress", (2, 3)),
+        ("log", ("line",)),
+    ]
+    assert bus.drain() == []
+
+
+def test_drain_limit_leaves_the_rest_for_the_next_frame():
+    bus = EventBus()
+    for n in range(10):
+        bus.post("result", n)
+    assert [args[0] for _, args in bus.drain(limit=4)] == [0, 1, 2, 3]
+    assert [args[0] for _, args in bus.drain()] == list(range(4, 10))
+
+
+def test_posts_from_many_threads_are_all_drained():
+    bus = EventBus(coalesce=("progress",))
+
+    def post(worker):
+        for n in range(500):
+            bus.post("result", worker, n)
+            bus.post("progress", n)
+
+    threads = [threading.Thread(target=post, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    results = []
+    while len(results) < 2000:
+        events = bus.drain()
+        results.extend(args for kind, args in events if kind == "result")
+        assert sum(kind == "progress" for kind, _ in events) <= 1
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [(worker, n) for worker in range(4) for n in range(500)]
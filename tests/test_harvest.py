@@ -0,0 +1,86 @@
+import csv
+from datetime import date
+
+import pytest
+
+from mc_extractor.harvest import RegisterHarvest, SeenIndex, register_date
+
+
+def saved_numbers(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        return [int(row[0]) for row in list(csv.reader(file))[1:]]
+
+
+def test_register_date():
+    assert register_date(" 02-JAN-25 ") == date(2025, 1, 2)
+    assert register_date("latest") is None
+
+
+def test_seen_index_round_trip(tmp_path):
+    path = str(tmp_path / "seen.idx")
+    index = SeenIndex(path)
+    assert index.add(1500000) and index.add(7) and index.add(1 << 30)
+    assert not index.add("1500000")
+    index.save()
+
+    reloaded = SeenIndex(path)
+    assert 1500000 in reloaded and 7 in reloaded and (1 << 30) in reloaded
+    assert 1500001 not in reloaded
+    assert not reloaded.add(1 << 30)
+
+
+def test_seen_index_rejects_other_files(tmp_path):
+    path = tmp_path / "seen.idx"
+    path.write_bytes(b"MC-Number\n1500000\n")
+    with pytest.raises(ValueError):
+        SeenIndex(str(path))
+
+
+def test_numbers_seen_before_are_left_out(server, tmp_path):
+    index = str(tmp_path / "seen.idx")
+    output = str(tmp_path / "new_numbers.csv")
+    start, end = date(2025, 1, 2), date(2025, 1, 3)
+
+    numbers = RegisterHarvest(start, end, output, index_path=index, base_url=server.url).run()
+    # The second publication overlaps the first by half; each number is listed once
+    expected = sorted(set(server.register_numbers("02-JAN-25")) | set(server.register_numbers("03-JAN-25")))
+    assert sorted(map(int, numbers)) == expected
+    assert saved_numbers(output) == [int(number) for number in numbers]
+
+    assert RegisterHarvest(start, end, output, index_path=index, base_url=server.url).run() == []
+    numbers = RegisterHarvest(start, date(2025, 1, 6), output, index_path=index, base_url=server.url).run()
+    assert sorted(map(int, numbers)) == sorted(set(server.register_numbers("06-JAN-25")) - set(expected))
+
+
+class InterruptAfter:
+    """Events that raise KeyboardInterrupt, as Ctrl-C would, once `count` publications are in."""
+
+    def __init__(self, count):
+        self.count = count
+
+    def post(self, kind, *args):
+        if kind == "numbers":
+            self.count -= 1
+            if self.count < 0:
+                raise KeyboardInterrupt
+
+
+def test_ctrl_c_keeps_the_publications_already_harvested(server, tmp_path):
+    index = str(tmp_path / "seen.idx")
+    output = str(tmp_path / "new_numbers.csv")
+    harvest = RegisterHarvest(date(2025, 1, 1), date(2025, 1, 31), output, index_path=index, workers=1,
+                              events=InterruptAfter(1), base_url=server.url)
+    with pytest.raises(KeyboardInterrupt):
+        harvest.run()
+    assert harvest.stop_requested
+    saved = saved_numbers(output)
+    seen = SeenIndex(index)
+    assert set(server.register_numbers("02-JAN-25")) <= set(saved)
+    assert all(number in seen for number in saved)
+    assert max(server.register_numbers("06-JAN-25")) not in seen
+
+    # The next run picks up the rest
+    numbers = RegisterHarvest(date(2025, 1, 1), date(2025, 1, 31), output, index_path=index,
+                              base_url=server.url).run()
+    listed = set().union(*(server.register_numbers(day) for day in server.register_dates))
+    assert sorted(saved + list(map(int, numbers))) == sorted(listed)
@@ -0,0 +1,87 @@
+import csv
+
+from mc_extractor.extractor import Extraction
+from mc_extractor.journal import RunJournal, journal_path_for
+
+
+def run_extraction(server, output, numbers, resume=False):
+    extraction = Extraction(numbers, str(output), engine="http", workers=2, use_cache=False,
+                            resume=resume, safer_url=server.url, capture_dir=None)
+    try:
+        extraction.prepare()
+        extraction.run()
+    finally:
+        extraction.close()
+    return extraction
+
+
+def csv_numbers(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        return [int(row[0]) for row in list(csv.reader(file))[1:]]
+
+
+def test_load_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "run.csv.journal"
+    path.write_text("1706520\tSuccess\t1700000000\n1706521\tFailed\t1700000001\n17065", encoding="utf-8")
+    assert RunJournal(str(path)).load() == {1706520: ("Success", 1700000000.0), 1706521: ("Failed", 1700000001.0)}
+
+
+def test_open_for_resume_starts_a_clean_line(tmp_path):
+    path = tmp_path / "run.csv.journal"
+    path.write_text("1706520\tSuccess\t1700000000\n17065", encoding="utf-8")
+    journal = RunJournal(str(path))
+    journal.open(resume=True)
+    journal.record(1706521, "Success")
+    journal.close()
+    assert set(RunJournal(str(path)).load()) == {1706520, 1706521}
+
+
+def test_resume_skips_journaled_numbers(server, tmp_path):
+    output = tmp_path / "mc_records.csv"
+    run_extraction(server, output, range(1706520, 1706530))
+    journaled = RunJournal(journal_path_for(str(output))).load()
+    assert set(journaled) == set(range(1706520, 1706530))
+
+    # Forget the second half, as if the run had been interrupted there
+    with open(journal_path_for(str(output)), "w", encoding="utf-8") as file:
+        file.writelines(f"{mc}\t{status}\t{time:.0f}\n" for mc, (status, time) in journaled.items() if mc < 1706525)
+    rows_before = csv_numbers(output)
+
+    extraction = run_extraction(server, output, range(1706520, 1706530), resume=True)
+    assert extraction.processed == 5
+    assert set(RunJournal(journal_path_for(str(output))).load()) == set(range(1706520, 1706530))
+    # Only the eligible carriers of the second half are appended
+    assert csv_numbers(output)[:len(rows_before)] == rows_before
+    assert sorted(csv_numbers(output)[len(rows_before):]) == [1706529]
+
+
+def test_resume_of_a_finished_run_does_nothing(server, tmp_path):
+    output = tmp_path / "mc_records.csv"
+    run_extraction(server, output, range(1706520, 1706524))
+    rows_before = csv_numbers(output)
+    assert run_extraction(server, output, range(1706520, 1706524), resume=True).processed == 0
+    assert csv_numbers(output) == rows_before
+
+
+def test_resume_counts_only_numbers_of_this_run(server, tmp_path):
+    output = tmp_path / "mc_records.csv"
+    run_extraction(server, output, range(1706520, 1706530))
+
+    extraction = Extraction(range(1706520, 1706523), str(output), engine="http", use_cache=False,
+                            resume=True, safer_url=server.url, capture_dir=None)
+    try:
+        assert extraction.prepare() == 0
+        assert sum(extraction.counts.values()) == 3
+    finally:
+        extraction.close()
+
+
+def test_stop_before_run_processes_nothing(server, tmp_path):
+    extraction = Extraction(range(1706520, 1706530), str(tmp_path / "mc_records.csv"), engine="http",
+                            use_cache=False, safer_url=server.url, capture_dir=None)
+    try:
+        extraction.stop()
+        extraction.prepare()
+        assert extraction.run() == 0
+    finally:
+        extraction.close()
@@ -0,0 +1,68 @@
+import logging
+
+from mc_extractor.logs import LogEvents, RingBufferHandler, add_file_handler
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(f"mc_extractor.test.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    return logger
+
+
+def test_drain_returns_the_lines_since_the_last_drain():
+    buffer = RingBufferHandler(capacity=10)
+    logger = make_logger("drain", buffer)
+    logger.info("first")
+    logger.info("second")
+
+    lines, dropped = buffer.drain()
+    assert [line.split(" - ", 1)[1] for line in lines] == ["first", "second"]
+    assert dropped == 0
+    assert buffer.drain() == ([], 0)
+
+
+def test_oldest_lines_are_dropped_and_counted():
+    buffer = RingBufferHandler(capacity=3)
+    logger = make_logger("dropped", buffer)
+    for n in range(8):
+        logger.info("line %d", n)
+
+    lines, dropped = buffer.drain()
+    assert [line.split(" - ", 1)[1] for line in lines] == ["line 5", "line 6", "line 7"]
+    assert dropped == 5
+    logger.info("after")
+    assert buffer.drain()[1] == 0
+
+
+def test_log_events_route_log_lines_to_the_logger():
+    buffer = RingBufferHandler()
+    logger = make_logger("events", buffer)
+    passed = []
+
+    class Bus:
+        def post(self, kind, *args):
+            passed.append((kind, args))
+
+    events = LogEvents(Bus(), logger)
+    events.post("log", "Fetching page 1")
+    events.post("status", "Processing...")
+    events.post("error", "Browser crashed")
+
+    assert passed == [("status", ("Processing...",)), ("error", ("Browser crashed",))]
+    assert [line.split(" - ", 1)[1] for line in buffer.drain()[0]] == ["Fetching page 1", "Browser crashed"]
+
+
+def test_file_handler_is_added_once_and_rotates(tmp_path):
+    logger = make_logger("file", logging.NullHandler())
+    path = tmp_path / "run.log"
+    handler = add_file_handler(str(path), max_bytes=200, backup_count=2, logger=logger)
+    assert add_file_handler(str(path), logger=logger) is handler
+    for n in range(20):
+        logger.info("message number %d", n)
+    handler.close()
+
+    assert (tmp_path / "run.log.1").exists()
+    assert not (tmp_path / "run.log.3").exists()
+    assert "message number 19" in path.read_text(encoding="utf-8")
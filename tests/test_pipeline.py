@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from mc_extractor.pipeline import Pipeline, Stage
+
+
+def test_items_pass_through_every_stage():
+    seen = []
+    lock = threading.Lock()
+
+    def record(item):
+        with lock:
+            seen.append(item)
+
+    pipeline = Pipeline([
+        Stage("double", lambda n: n * 2, workers=3, capacity=4),
+        Stage("odd", lambda n: None if n % 4 else n, workers=2, capacity=4),
+        Stage("record", record, capacity=4),
+    ])
+    pipeline.run(range(100))
+
+    assert sorted(seen) == list(range(0, 200, 4))
+    summary = pipeline.summary()
+    assert [stats["processed"] for stats in summary.values()] == [100, 100, 50]
+    assert summary["double"]["workers"] == 3
+
+
+def test_a_slow_stage_holds_back_the_ones_before_it():
+    gate = threading.Event()
+    fed = []
+
+    def items():
+        for n in range(50):
+            fed.append(n)
+            yield n
+
+    def slow(item):
+        gate.wait()
+
+    pipeline = Pipeline([Stage("fast", lambda n: n, capacity=2), Stage("slow", slow, capacity=2)])
+    runner = threading.Thread(target=pipeline.run, args=(items(),))
+    runner.start()
+    try:
+        # Bounded queues: the feeder stops after a handful of items, not all 50
+        threading.Event().wait(0.2)
+        assert len(fed) < 10
+    finally:
+        gate.set()
+        runner.join(5)
+    assert len(fed) == 50
+    summary = pipeline.summary()
+    assert summary["slow"]["processed"] == 50
+    assert summary["slow"]["peak_queue"] <= 2
+    assert summary["fast"]["blocked_s"] + summary["slow"]["blocked_s"] > 0
+
+
+def test_a_handler_error_stops_the_run_and_is_raised():
+    stops = []
+    handled = []
+
+    def handle(n):
+        if n == 10:
+            raise ValueError("bad item")
+        handled.append(n)
+
+    pipeline = Pipeline([Stage("first", lambda n: n), Stage("second", handle)])
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(range(1000), on_error=lambda: stops.append(True))
+    assert stops == [True]
+    # Items after the failure are drained, not handled
+    assert handled == list(range(10))
+
+
+def test_a_feeder_error_is_raised():
+    def items():
+        yield 1
+        raise OSError("source gone")
+
+    pipeline = Pipeline([Stage("only", lambda n: n)])
+    with pytest.raises(OSError, match="source gone"):
+        pipeline.run(items())
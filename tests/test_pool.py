@@ -0,0 +1,29 @@
+from mc_extractor.pool import WorkerPool
+from mc_extractor.sources import ExcludingSource, RangeSource
+
+
+class CountingBackend:
+    created = 0
+
+    def __init__(self):
+        CountingBackend.created += 1
+
+    def lookup(self, mc):
+        return {"mc": mc}
+
+    def close(self):
+        pass
+
+
+def test_no_backend_is_started_without_pending_work():
+    CountingBackend.created = 0
+    pool = WorkerPool(CountingBackend, workers=4)
+    assert list(pool.run(ExcludingSource(RangeSource(1, 3), {1, 2, 3}))) == []
+    assert CountingBackend.created == 0
+
+
+def test_workers_are_capped_at_the_pending_count():
+    CountingBackend.created = 0
+    pool = WorkerPool(CountingBackend, workers=4)
+    assert sorted(mc for mc, _ in pool.run(RangeSource(1, 2))) == [1, 2]
+    assert CountingBackend.created == 2
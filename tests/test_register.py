@@ -0,0 +1,85 @@
+from mc_extractor.parsing import RegisterDetailParser, parse_register_table, parse_html, parse_register_form
+from mc_extractor.register_http import HttpRegisterFetcher
+
+
+TABLE = ('<table><tr><th>Number</th><th>Title</th></tr>'
+         '<tr><th>MC-1500000</th><td>FIXTURE FREIGHT</td></tr>'
+         '<tr><th>FF-<b>123456</b></th><td>FORWARDER</td></tr>'
+         '<tr><th>PENDING</th><td>NO DOCKET</td></tr>'
+         '<tr><td>no header cell</td></tr></table>')
+
+
+def test_parse_register_table():
+    assert parse_register_table(TABLE) == [
+        ("MC-1500000", "1500000"),
+        ("FF-123456", "123456"),
+        ("PENDING", None),
+        (None, None),
+    ]
+
+
+def test_streaming_parser_matches_whole_page(server):
+    page = server.register_detail_page("02-JAN-25").encode("utf-8")
+    expected = [(f"MC-{number}", str(number)) for number in server.register_numbers("02-JAN-25")]
+
+    parser = RegisterDetailParser()
+    rows = []
+    for start in range(0, len(page), 97):
+        rows.extend(parser.feed(page[start:start + 97]))
+    rows.extend(parser.close())
+    assert rows == expected
+
+
+def test_register_form_lists_the_dates(server):
+    form = parse_register_form(parse_html(server.register_menu_page()))
+    assert form.dates == server.register_dates
+    assert form.date_field == "pd_date"
+
+
+def test_fetcher_reads_a_publication(server):
+    fetcher = HttpRegisterFetcher(server.url, timeout=5)
+    try:
+        numbers = [number for _, number in fetcher.iter_rows("03-JAN-25")]
+    finally:
+        fetcher.close()
+    assert numbers == [str(number) for number in server.register_numbers("03-JAN-25")]
+
+
+def test_detail_page_span_covers_the_streaming_parse(server):
+    from mc_extractor.tracing import Tracer
+
+    tracer = Tracer()
+    fetcher = HttpRegisterFetcher(server.url, timeout=5, tracer=tracer, chunk_size=256)
+    try:
+        rows = fetcher.iter_rows("03-JAN-25")
+        next(rows)
+        # Headers are in and parsing has begun, but the span is still open
+        assert "register.detail_page" not in tracer.summary()
+        rest = list(rows)
+    finally:
+        fetcher.close()
+    assert len(rest) == len(server.register_numbers("03-JAN-25")) - 1
+    assert tracer.summary()["register.detail_page"]["count"] == 1
+    assert tracer.summary()["register.detail_page"]["errors"] == 0
+
+
+def test_fetcher_reads_the_form_when_the_published_one_moved():
+    from benchmarks.fixture_server import FixtureServer
+
+    with FixtureServer(slow_delay=0, register_rows=50, register_detail_name="pkg_html.prc_regdetail2") as moved:
+        fetcher = HttpRegisterFetcher(moved.url, timeout=5)
+        try:
+            numbers = [number for _, number in fetcher.iter_rows("03-JAN-25")]
+        finally:
+            fetcher.close()
+        assert fetcher.form_discovered
+        assert numbers == [str(number) for number in moved.register_numbers("03-JAN-25")]
+
+
+def test_fetcher_uses_the_published_form_for_a_known_date(server):
+    fetcher = HttpRegisterFetcher(server.url, timeout=5)
+    try:
+        assert len(list(fetcher.iter_rows("02-JAN-25"))) == 50
+    finally:
+        fetcher.close()
+    assert not fetcher.form_discovered
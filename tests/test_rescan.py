@@ -0,0 +1,13 @@
+from mc_extractor.rescan import PreviousRecord, select_for_rescan
+
+
+def test_select_for_rescan():
+    previous = {
+        1: PreviousRecord("Success", ("1",), 1000.0),
+        2: PreviousRecord("Manual Check", ("2",), 1000.0),
+        3: PreviousRecord("Success", ("3",), 100.0),
+        4: PreviousRecord("Failed", None, None),
+    }
+    assert select_for_rescan(previous, statuses=["Manual Check"]) == [2]
+    assert select_for_rescan(previous, older_than=500, now=1200.0) == [3, 4]
+    assert select_for_rescan(previous, statuses=["Manual Check"], older_than=500, now=1200.0) == [2, 3, 4]
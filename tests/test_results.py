@@ -0,0 +1,49 @@
+from mc_extractor.results import ResultStore, result_row
+
+
+def result(name):
+    return {"company_name": name, "address": "100 MAIN ST\nDALLAS, TX 75001",
+            "email": "Email Not Found", "phone": "(214) 555-0100"}
+
+
+def filled_store():
+    store = ResultStore()
+    for mc in range(1706520, 1706530):
+        store.add(mc, result(f"CARRIER {mc}"), "Success" if mc % 2 else "Partial Success")
+    return store
+
+
+def test_pages_in_arrival_order_by_status():
+    store = filled_store()
+    assert len(store) == 10
+    assert (store.count(), store.count("Success"), store.count("Partial Success"), store.count("Failed")) == (10, 5, 5, 0)
+    assert [row[0] for row in store.page(2, 3)] == [1706522, 1706523, 1706524]
+    assert [row[0] for row in store.page(1, 2, "Success")] == [1706523, 1706525]
+    assert [row[0] for row in store.page(4, 10, "Success")] == [1706529]
+    assert store.page(0, 10, "Failed") == []
+    assert store.get(1706521) == result_row(1706521, result("CARRIER 1706521"), "Success")
+    assert store.get(1) is None
+
+
+def test_adding_a_stored_number_replaces_its_row_in_place():
+    store = filled_store()
+    store.add(1706520, result("RENAMED"), "Success")
+
+    assert len(store) == 10
+    assert store.page(0, 1)[0] == result_row(1706520, result("RENAMED"), "Success")
+    # It moves to the Success index at its original position, not the end
+    assert [row[0] for row in store.page(0, 2, "Success")] == [1706520, 1706521]
+    assert store.count("Success") == 6
+    assert 1706520 not in [row[0] for row in store.page(0, 10, "Partial Success")]
+
+    store.add(1706521, result("SAME STATUS"), "Success")
+    assert store.count("Success") == 6
+    assert store.get(1706521)[1] == "SAME STATUS"
+
+
+def test_clear():
+    store = filled_store()
+    store.clear()
+    assert (len(store), store.count("Success"), store.get(1706520)) == (0, 0, None)
+    store.add(1706520, result("AGAIN"), "Failed")
+    assert store.page(0, 10) == [result_row(1706520, result("AGAIN"), "Failed")]
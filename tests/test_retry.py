@@ -0,0 +1,47 @@
+from mc_extractor.retry import CircuitBreaker
+
+
+def tripped_breaker():
+    """A breaker just tripped, plus the ticket of a call admitted before the trip."""
+    breaker = CircuitBreaker(window=10, min_calls=10, threshold=0.5, cooldown=0.0)
+    stale = breaker.before_call()
+    for _ in range(10):
+        breaker.record(False, breaker.before_call())
+    assert breaker.state == "open"
+    return breaker, stale
+
+
+def test_probe_success_closes_the_breaker():
+    breaker, _ = tripped_breaker()
+    probe = breaker.before_call()
+    assert breaker.state == "half-open"
+    breaker.record(True, probe)
+    assert breaker.state == "closed"
+
+
+def test_probe_failure_reopens_the_breaker():
+    breaker, _ = tripped_breaker()
+    probe = breaker.before_call()
+    breaker.record(False, probe)
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+
+
+def test_late_results_do_not_decide_a_half_open_breaker():
+    breaker, stale = tripped_breaker()
+    probe = breaker.before_call()
+    breaker.record(False, stale)
+    assert breaker.state == "half-open" and breaker.trips == 1
+    breaker.record(True, stale)
+    assert breaker.state == "half-open"
+    breaker.record(True, probe)
+    assert breaker.state == "closed"
+
+
+def test_late_failures_do_not_count_after_closing():
+    breaker, stale = tripped_breaker()
+    breaker.record(True, breaker.before_call())
+    for _ in range(10):
+        breaker.record(False, stale)
+    assert breaker.state == "closed"
+    assert len(breaker.window) == 0
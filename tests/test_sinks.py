@@ -0,0 +1,108 @@
+import queue
+import threading
+
+from mc_extractor import sinks
+from mc_extractor.pipeline import Pipeline, Stage
+from mc_extractor.sinks import CsvSink, CSV_HEADER
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Follower:
+    def __init__(self, sink):
+        self.sink = sink
+        self.calls = []
+
+    def flush(self):
+        # A follower runs after the CSV, so it sees every row the CSV has
+        self.calls.append(("flush", self.sink.rows_written))
+
+    def sync(self):
+        self.calls.append(("sync", self.sink.rows_written))
+
+
+def lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_rows_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(sinks.time, "monotonic", FakeClock())
+    path = tmp_path / "out.csv"
+    sink = CsvSink(str(path), batch_size=3)
+    follower = Follower(sink)
+    sink.add_follower(follower)
+
+    sink.write([1, "a"])
+    sink.write([2, "b"])
+    assert sink.rows_written == 0
+    sink.write([3, "c"])
+    assert sink.rows_written == 3
+    assert lines(path) == [",".join(CSV_HEADER), "1,a", "2,b", "3,c"]
+    assert follower.calls == [("flush", 3)]
+    sink.close()
+
+
+def test_time_flush_and_checkpoint(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sinks.time, "monotonic", clock)
+    sink = CsvSink(str(tmp_path / "out.csv"), batch_size=100, flush_interval=2.0, checkpoint_interval=5.0)
+    follower = Follower(sink)
+    sink.add_follower(follower)
+
+    sink.write([1, "a"])
+    assert sink.rows_written == 0
+    clock.now += 2.0
+    sink.maybe_flush()
+    assert follower.calls == [("flush", 1)]
+
+    clock.now += 3.0
+    sink.write([2, "b"])
+    assert follower.calls == [("flush", 1), ("flush", 2), ("flush", 2), ("sync", 2)]
+    sink.close()
+
+
+def test_append_keeps_the_header_once(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvSink(str(path))
+    sink.write([1, "a"])
+    sink.close()
+    sink = CsvSink(str(path), append=True)
+    sink.write([2, "b"])
+    sink.close()
+    assert lines(path) == [",".join(CSV_HEADER), "1,a", "2,b"]
+
+
+def test_sink_stage_flushes_while_idle(tmp_path):
+    sink = CsvSink(str(tmp_path / "out.csv"), flush_interval=0.05)
+    items = queue.Queue()
+    flushed = threading.Event()
+
+    def produce():
+        yield [1, "a"]
+        # No more results for a while, as when every worker waits on SAFER
+        items.get()
+
+    class Signal:
+        def flush(self):
+            if sink.rows_written:
+                flushed.set()
+
+        def sync(self):
+            pass
+
+    sink.add_follower(Signal())
+    pipeline = Pipeline([Stage("sink", sink.write, idle=sink.maybe_flush, idle_interval=0.01)])
+    runner = threading.Thread(target=pipeline.run, args=(produce(),))
+    runner.start()
+    try:
+        assert flushed.wait(5)
+    finally:
+        items.put(None)
+        runner.join(5)
+        sink.close()
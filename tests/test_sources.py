@@ -0,0 +1,44 @@
+from mc_extractor.sources import Bitmap, BulkFileSource, ExcludingSource, ListSource, RangeSource, as_source
+
+
+def test_range_source_is_inclusive():
+    source = RangeSource(10, 14)
+    assert list(source) == [10, 11, 12, 13, 14]
+    assert len(source) == 5
+    assert 14 in source and 15 not in source
+
+
+def test_bulk_file_source_dedups_and_skips_other_lines(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(b"1706527\r\n  1706528 \nMC-1706529\n\n1706527\n1706530")
+    source = BulkFileSource(str(path))
+    assert list(source) == [1706527, 1706528, 1706530]
+    assert len(source) == 3
+    assert 1706528 in source and 1706529 not in source
+
+
+def test_bulk_file_source_of_an_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(BulkFileSource(str(path))) == [] and len(BulkFileSource(str(path))) == 0
+
+
+def test_excluding_source():
+    source = ExcludingSource(RangeSource(1, 10), {2, 4, 99})
+    assert list(source) == [1, 3, 5, 6, 7, 8, 9, 10]
+    assert len(source) == 8
+    assert 4 not in source and 5 in source
+
+
+def test_as_source():
+    assert isinstance(as_source(range(5, 9)), RangeSource)
+    assert isinstance(as_source([3, 1]), ListSource)
+    assert list(as_source([3, 1])) == [3, 1]
+
+
+def test_bitmap_overflow():
+    bitmap = Bitmap(limit=64)
+    assert bitmap.add(5) and not bitmap.add(5)
+    assert bitmap.add(1000) and not bitmap.add(1000)
+    assert 5 in bitmap and 1000 in bitmap and 6 not in bitmap
+
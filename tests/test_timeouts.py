@@ -0,0 +1,72 @@
+import pytest
+
+from mc_extractor import timeouts as timeouts_module
+from mc_extractor.timeouts import AdaptiveTimeouts
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(timeouts_module.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def make_step(clock, latency):
+    """A step taking `latency` seconds that gives up (raising TimeoutError) at its timeout."""
+    def call(timeout):
+        if latency > timeout:
+            clock.now += timeout
+            raise TimeoutError(f"no answer within {timeout}s")
+        clock.now += latency
+        return "ok"
+    return call
+
+
+def run_calls(timeouts, call, count):
+    succeeded = 0
+    for _ in range(count):
+        try:
+            timeouts.timed("snapshot", call)
+            succeeded += 1
+        except TimeoutError:
+            pass
+    return succeeded
+
+
+def test_timeout_is_learned_from_fast_answers(clock):
+    timeouts = AdaptiveTimeouts()
+    timeouts.define({"snapshot": (15, 2, 15)})
+    run_calls(timeouts, make_step(clock, 0.3), 30)
+    assert timeouts.timeout("snapshot") == 2
+
+
+def test_timeout_grows_back_when_latency_rises(clock):
+    timeouts = AdaptiveTimeouts()
+    timeouts.define({"snapshot": (15, 2, 15)})
+    run_calls(timeouts, make_step(clock, 0.3), 30)
+    assert timeouts.timeout("snapshot") == 2
+
+    succeeded = run_calls(timeouts, make_step(clock, 3.0), 100)
+    assert timeouts.timeout("snapshot") >= 9
+    assert succeeded >= 90
+
+
+def test_fast_failures_are_not_observed(clock):
+    timeouts = AdaptiveTimeouts()
+    timeouts.define({"snapshot": (15, 2, 15)})
+
+    def refused(timeout):
+        clock.now += 0.01
+        raise ConnectionError("refused")
+
+    with pytest.raises(ConnectionError):
+        timeouts.timed("snapshot", refused)
+    assert len(timeouts.samples["snapshot"]) == 0
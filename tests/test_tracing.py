@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from mc_extractor.tracing import METRIC, Histogram, Tracer
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram(buckets=(0.1, 1, 10))
+    for seconds in (0.05, 0.05, 0.5, 5, 50):
+        histogram.observe(seconds)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.quantile(0.4) == 0.1
+    assert histogram.quantile(0.6) == 1
+    assert histogram.quantile(1.0) == 10
+    assert Histogram().quantile(0.5) is None
+
+
+def test_spans_are_logged_as_json_lines(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path))
+    with tracer.context(mc=1706527):
+        with tracer.span("http.snapshot", attempt=2):
+            pass
+        with pytest.raises(ValueError):
+            with tracer.span("http.registration"):
+                raise ValueError("no table")
+    with tracer.span("register.menu"):
+        pass
+    tracer.close()
+
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [entry["span"] for entry in entries] == ["http.snapshot", "http.registration", "register.menu"]
+    assert entries[0]["mc"] == 1706527 and entries[0]["attempt"] == 2 and "error" not in entries[0]
+    assert entries[1]["mc"] == 1706527 and entries[1]["error"] == "ValueError"
+    assert "mc" not in entries[2]
+    assert all(entry["ms"] >= 0 and entry["ts"] > 0 for entry in entries)
+
+    summary = tracer.summary()
+    assert summary["http.registration"]["errors"] == 1
+    assert summary["http.snapshot"]["count"] == 1
+
+
+def test_prometheus_export(tmp_path):
+    path = tmp_path / "metrics.prom"
+    tracer = Tracer(metrics_path=str(path), buckets=(0.1, 1))
+    tracer.record("http.snapshot", 0.05, 0)
+    tracer.record("http.snapshot", 0.5, 0)
+    tracer.record("http.snapshot", 5, 0, error="Timeout")
+    tracer.sync()
+
+    text = path.read_text(encoding="utf-8")
+    assert f'{METRIC}_bucket{{span="http.snapshot",le="0.1"}} 1' in text
+    assert f'{METRIC}_bucket{{span="http.snapshot",le="1"}} 2' in text
+    assert f'{METRIC}_bucket{{span="http.snapshot",le="+Inf"}} 3' in text
+    assert f'{METRIC}_sum{{span="http.snapshot"}} 5.550000' in text
+    assert f'{METRIC}_count{{span="http.snapshot"}} 3' in text
+    assert 'mc_extractor_span_errors_total{span="http.snapshot"} 1' in text
+    assert not (tmp_path / "metrics.prom.tmp").exists()
+    tracer.close()